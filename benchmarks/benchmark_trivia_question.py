@@ -0,0 +1,91 @@
+"""Benchmark of drawing questions with GameEngine.get_next_question().
+
+Reports the latency and the memory retained by the drawn questions, per question. For comparison,
+the same is measured for one-row dataframe slices, which TriviaQuestion formerly wrapped.
+
+    python benchmarks/benchmark_trivia_question.py --questions 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_question_bank import create_synthetic_question_categories  # noqa: E402
+from trivia_game.game_engine import GameEngine  # noqa: E402
+
+
+def _draw_questions(game_engine, n_questions):
+    """Draw n_questions questions as TriviaQuestions."""
+    return [game_engine.get_next_question() for _ in range(n_questions)]
+
+
+def _slice_questions(question_category, n_questions):
+    """Retrieve n_questions questions as one-row dataframe slices of their columns."""
+    columns = [
+        question_category.question_column_title,
+        question_category.answer_column_title,
+    ] + question_category.question_option_columns_list
+    return [
+        question_category.get_question_by_draw_index(draw_idx).loc[:, columns]
+        for draw_idx in range(n_questions)
+    ]
+
+
+def _measure(function, n_questions, setup):
+    """Return the latency and the retained memory per question retrieved by the function."""
+    setup()
+    start_time = time.perf_counter()
+    function(n_questions)
+    elapsed_seconds = time.perf_counter() - start_time
+    setup()
+    tracemalloc.start()
+    questions = function(n_questions)
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del questions
+    return {
+        "latency_per_question_us": round(elapsed_seconds / n_questions * 1e6, 3),
+        "retained_bytes_per_question": round(retained_bytes / n_questions, 1),
+    }
+
+
+def run_benchmark(n_questions, n_categories, n_slices):
+    question_categories = create_synthetic_question_categories(n_questions, n_categories)
+    game_engine = GameEngine(logging_level_str='none')
+    game_engine.set_question_categories(question_categories)
+    return {
+        "benchmark": "trivia_question_draw",
+        "questions": n_questions,
+        "trivia_question": _measure(
+            lambda n: _draw_questions(game_engine, n),
+            n_questions,
+            lambda: game_engine.initialize_game(seed=1),
+        ),
+        "dataframe_slice": _measure(
+            lambda n: _slice_questions(question_categories[0], n),
+            min(n_slices, question_categories[0].num_questions),
+            lambda: None,
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of drawing questions')
+    parser.add_argument('--questions', type=int, default=100000, help='Size of the question bank')
+    parser.add_argument('--categories', type=int, default=8, help='Number of question categories')
+    parser.add_argument(
+        '--slices',
+        type=int,
+        default=5000,
+        help='Number of questions retrieved as dataframe slices for comparison'
+    )
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.questions, args.categories, args.slices), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Report of the import times of the start-up of the game, to track the cold-start latency.
+
+Each start-up command is run in a new Python process with -X importtime, and the report gives the
+median wall time of the process, the total import time and the slowest imported packages, and
+whether the heavy modules (pandas, NumPy, openpyxl and PyQt) are imported. The results are written
+as JSON, and compared to the results of a baseline run if given, in which case the exit status is
+1 if any command is slower than the baseline by more than the tolerance:
+
+    python benchmarks/import_time_report.py --output baseline.json
+    python benchmarks/import_time_report.py --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Start-up commands, given as the arguments of the Python interpreter run in the repository
+STARTUP_COMMANDS = {
+    "main_help": ["main.py", "-h"],
+    "game_engine": ["-c", "import trivia_game.game_engine"],
+    "terminal_game": ["-c", "import trivia_game.terminal_game"],
+    "gui_game": ["-c", "import trivia_game.trivia_game"],
+}
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl", "colorlog", "PyQt6"]
+# e.g. "import time:       394 |     334773 |   openpyxl.cell"
+_IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+def parse_import_times(importtime_text: str) -> List[Tuple[str, int, int, int]]:
+    """Parse the -X importtime output into (module, self µs, cumulative µs, depth) tuples.
+
+    The depth is 0 for the modules imported by the command itself, 1 for the modules imported by
+    them etc. The lines other than the import times (e.g. the header) are skipped.
+    """
+    import_times = []
+    for line in importtime_text.splitlines():
+        match = _IMPORT_TIME_PATTERN.match(line)
+        if match is not None:
+            self_us, cumulative_us, indentation, module = match.groups()
+            import_times.append(
+                (module, int(self_us), int(cumulative_us), (len(indentation) - 1) // 2)
+            )
+    return import_times
+
+
+def measure_startup(arguments: List[str], repeats: int, n_top_packages: int = 10) -> dict:
+    """Run the Python interpreter with the arguments repeats times, return the import report.
+
+    The import times are the ones of the run with the median wall time, where the import time of
+    a package is the sum of the import times of its modules (excluding the other packages).
+    """
+    runs = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime"] + arguments,
+            cwd=REPOSITORY_PATH,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+        runs.append((time.perf_counter() - start_time, parse_import_times(process.stderr)))
+    runs.sort(key=lambda run: run[0])
+    wall_seconds, import_times = runs[len(runs) // 2]
+    package_import_us = dict()
+    for module, self_us, _, _ in import_times:
+        package = module.partition(".")[0]
+        package_import_us[package] = package_import_us.get(package, 0) + self_us
+    top_packages = sorted(package_import_us, key=package_import_us.get, reverse=True)
+    imported_modules = {import_time[0] for import_time in import_times}
+    return {
+        "median_seconds": wall_seconds,
+        "wall_seconds": [run[0] for run in runs],
+        "import_seconds": sum(import_time[1] for import_time in import_times) * 1e-6,
+        "n_imported_modules": len(import_times),
+        "heavy_modules": [module for module in HEAVY_MODULES if module in imported_modules],
+        "package_import_seconds": {
+            package: package_import_us[package] * 1e-6 for package in top_packages[:n_top_packages]
+        },
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Compare the median wall times of the commands with the baseline results.
+
+    Returns a line describing each command found in both results, and whether any command is
+    slower than the baseline by more than the tolerance (e.g. 0.2 for 20% slower).
+    """
+    lines = []
+    has_regression = False
+    for command_name, command_result in results["commands"].items():
+        if command_name not in baseline["commands"]:
+            continue
+        baseline_seconds = baseline["commands"][command_name]["median_seconds"]
+        ratio = command_result["median_seconds"] / baseline_seconds
+        is_regression = ratio > 1 + tolerance
+        has_regression |= is_regression
+        lines.append(
+            f"{command_name:<14} {command_result['median_seconds']:.3e} s "
+            f"({ratio:.2f}x baseline){' REGRESSION' if is_regression else ''}"
+        )
+    return lines, has_regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import time report of the game start-up')
+    parser.add_argument(
+        '--commands',
+        default=",".join(STARTUP_COMMANDS),
+        help=f'Comma separated start-up commands to measure, of {list(STARTUP_COMMANDS)}'
+    )
+    parser.add_argument('--repeats', type=int, default=5, help='Number of runs of each command')
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        help='Number of the slowest imported packages to report'
+    )
+    parser.add_argument(
+        '--output',
+        help='Path of the JSON results, the standard output if not given'
+    )
+    parser.add_argument('--baseline', help='Path of the JSON results of a baseline run')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help='Fraction by which a command may be slower than the baseline'
+    )
+    args = parser.parse_args()
+    command_names = [command_name.strip() for command_name in args.commands.split(',')]
+    for command_name in command_names:
+        if command_name not in STARTUP_COMMANDS:
+            parser.error(
+                f"Unknown command '{command_name}', one of {list(STARTUP_COMMANDS)}."
+            )
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commands": {
+            command_name: measure_startup(STARTUP_COMMANDS[command_name], args.repeats, args.top)
+            for command_name in command_names
+        },
+    }
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        lines, has_regression = compare_with_baseline(results, baseline, args.tolerance)
+        print("\n".join(lines), file=sys.stderr)
+        sys.exit(1 if has_regression else 0)
+
+
+if __name__ == '__main__':
+    main()
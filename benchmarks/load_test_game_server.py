@@ -0,0 +1,121 @@
+"""Load test of the headless game server, running the server and the clients on one event loop.
+
+Creates thousands of concurrent game sessions over keep-alive connections and plays them through
+the HTTP API, then prints the request throughput and the latency percentiles. Since the server
+and the clients share a single thread, the results are a lower bound of a single core's capacity.
+
+    python benchmarks/load_test_game_server.py --sessions 5000 --connections 250
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_question_bank import create_synthetic_question_categories  # noqa: E402
+from trivia_game.game_server import GameServer, GameSessionManager  # noqa: E402
+
+
+class _HttpClient:
+    """Minimal keep-alive HTTP/1.1 JSON client, recording the latency of each request."""
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    async def request(self, method, path, body=None):
+        body_bytes = json.dumps(body).encode() if body is not None else b''
+        start_time = time.perf_counter()
+        request_head = f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body_bytes)}\r\n\r\n"
+        self.writer.write(request_head.encode() + body_bytes)
+        status_line = await self.reader.readline()
+        content_length = 0
+        while (line := await self.reader.readline()) != b'\r\n':
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                content_length = int(value)
+        response = json.loads(await self.reader.readexactly(content_length))
+        self.latencies.append(time.perf_counter() - start_time)
+        status = int(status_line.split()[1])
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} failed with {status}: {response}")
+        return response
+
+
+async def _play_sessions(port, n_sessions, n_questions_per_session, first_seed, latencies):
+    """Create n_sessions sessions on one connection, then play them in turns."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    client = _HttpClient(reader, writer, latencies)
+    session_paths = []
+    for seed in range(first_seed, first_seed + n_sessions):
+        session = await client.request("POST", "/sessions", {"seed": seed})
+        session_paths.append(f"/sessions/{session['session_id']}")
+    for _ in range(n_questions_per_session):
+        for session_path in session_paths:
+            await client.request("POST", session_path + "/next")
+            await client.request("GET", session_path + "/answer")
+    for session_path in session_paths:
+        await client.request("POST", session_path + "/goto", {"question_number": 1})
+    writer.close()
+
+
+async def run_load_test(args):
+    question_categories = create_synthetic_question_categories(args.questions, args.categories)
+    game_server = GameServer(
+        GameSessionManager(question_categories, max_sessions=args.sessions),
+    )
+    port = await game_server.start("127.0.0.1", 0)
+    latencies = []
+    sessions_per_connection = -(-args.sessions // args.connections)
+    start_time = time.perf_counter()
+    await asyncio.gather(*[
+        _play_sessions(
+            port,
+            min(sessions_per_connection, args.sessions - first_seed),
+            args.questions_per_session,
+            first_seed,
+            latencies,
+        )
+        for first_seed in range(0, args.sessions, sessions_per_connection)
+    ])
+    elapsed_seconds = time.perf_counter() - start_time
+    n_concurrent_sessions = len(game_server.session_manager)
+    await game_server.close()
+
+    latencies_ms = np.array(latencies) * 1e3
+    return {
+        "benchmark": "game_server_load_test",
+        "sessions": n_concurrent_sessions,
+        "connections": args.connections,
+        "questions": args.questions,
+        "requests": len(latencies),
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "requests_per_second": round(len(latencies) / elapsed_seconds, 1),
+        "latency_p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "latency_p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test of the headless game server')
+    parser.add_argument('--sessions', type=int, default=2000, help='Number of game sessions')
+    parser.add_argument('--connections', type=int, default=100, help='Number of connections')
+    parser.add_argument(
+        '--questions-per-session',
+        type=int,
+        default=10,
+        help='Number of questions played in each session'
+    )
+    parser.add_argument('--questions', type=int, default=10000, help='Size of the question bank')
+    parser.add_argument('--categories', type=int, default=8, help='Number of question categories')
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run_load_test(args)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
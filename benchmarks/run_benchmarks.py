@@ -0,0 +1,215 @@
+"""Benchmark suite of loading the question bank and playing games, on synthetic question banks.
+
+For each question bank, times DataLoader.parse_excel_data(), GameEngine.initialize_game(),
+GameEngine.get_next_question(), playing a full game and going to a question with
+GameEngine.seek(). The results are written as JSON, and compared to the results of a baseline run
+if given, in which case the exit status is 1 if any benchmark is slower than the baseline by more
+than the tolerance:
+
+    python benchmarks/run_benchmarks.py --banks 1k,100k --output baseline.json
+    python benchmarks/run_benchmarks.py --banks 1k,100k --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_question_bank import (  # noqa: E402
+    QUESTION_CATEGORY_COLUMN_NAME,
+    create_synthetic_question_bank,
+    write_excel_question_bank,
+)
+from trivia_game.data_processing import DataLoader  # noqa: E402
+from trivia_game.game_engine import DRAW_MODES, GameEngine  # noqa: E402
+from trivia_game.game_random import RNG_BACKENDS  # noqa: E402
+
+# Synthetic question banks: number of questions, number of categories and number of option
+# columns, where the categories use between 0 and this number of option columns
+QUESTION_BANKS = {
+    "1k": (1000, 2, 4),
+    "100k": (100000, 100, 4),
+    "1m": (1000000, 5000, 6),
+}
+N_DRAWN_QUESTIONS = 10000
+N_SEEKS = 20
+
+
+def run_benchmarks(bank_name, repeats, rng_backend, draw_mode, skip_excel=False):
+    """Run the benchmarks on the synthetic question bank, return their results."""
+    n_questions, n_categories, n_option_columns = QUESTION_BANKS[bank_name]
+    df, data_info = create_synthetic_question_bank(
+        n_questions,
+        n_categories,
+        n_option_columns,
+        vary_option_columns=True,
+    )
+    data_loader = DataLoader(
+        question_category_column_name=QUESTION_CATEGORY_COLUMN_NAME,
+        data_info=data_info,
+        logging_level_str='none'
+    )
+    results = dict()
+    if skip_excel:
+        question_categories = data_loader.parse_dataframe(df)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            database_path = os.path.join(temp_dir, f"{bank_name}.xlsx")
+            write_excel_question_bank(df, database_path)
+            # Parsing the large banks takes minutes, so it is timed once
+            results["parse_excel_data"] = _time_repeats(
+                lambda: data_loader.parse_excel_data(database_path),
+                repeats if n_questions <= 100000 else 1,
+            )
+            question_categories = data_loader.parse_excel_data(database_path)
+    del df
+
+    game_engine = GameEngine(logging_level_str='none', rng_backend=rng_backend, draw_mode=draw_mode)
+    game_engine.set_question_categories(question_categories)
+    seeds = iter(range(1, 3 * repeats + 2))
+    results["initialize_game"] = _time_repeats(
+        lambda: game_engine.initialize_game(seed=next(seeds)),
+        repeats,
+    )
+
+    n_drawn_questions = min(N_DRAWN_QUESTIONS, n_questions)
+    results["get_next_question"] = _time_repeats(
+        lambda: [game_engine.get_next_question() for _ in range(n_drawn_questions)],
+        repeats,
+        setup=lambda: game_engine.initialize_game(seed=next(seeds)),
+        n_operations=n_drawn_questions,
+    )
+
+    def play_full_game():
+        game_engine.initialize_game(seed=1)
+        while game_engine.get_next_question().is_question_valid():
+            pass
+    results["full_game"] = _time_repeats(play_full_game, repeats if n_questions <= 100000 else 1)
+
+    # Go back and forth to questions of the whole game, starting from a new game
+    question_numbers = random.Random(0).choices(range(1, n_questions + 1), k=N_SEEKS)
+    results["seek"] = _time_repeats(
+        lambda: [game_engine.seek(question_number) for question_number in question_numbers],
+        repeats,
+        setup=lambda: game_engine.initialize_game(seed=2),
+        n_operations=N_SEEKS,
+    )
+    return {
+        "questions": n_questions,
+        "categories": n_categories,
+        "option_columns": n_option_columns,
+        "benchmarks": results,
+    }
+
+
+def _time_repeats(function, repeats, setup=None, n_operations=1):
+    """Time the function repeats times, return the median and minimum seconds per operation."""
+    seconds = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start_time = time.perf_counter()
+        function()
+        seconds.append((time.perf_counter() - start_time) / n_operations)
+    return {
+        "median_seconds": statistics.median(seconds),
+        "min_seconds": min(seconds),
+        "repeats": repeats,
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Compare the median times of the results with the baseline results.
+
+    Returns a line describing each benchmark found in both results, and whether any benchmark is
+    slower than the baseline by more than the tolerance (e.g. 0.2 for 20% slower).
+    """
+    lines = []
+    has_regression = False
+    for bank_name, bank_results in results["banks"].items():
+        baseline_benchmarks = baseline["banks"].get(bank_name, dict()).get("benchmarks", dict())
+        for benchmark_name, benchmark_result in bank_results["benchmarks"].items():
+            if benchmark_name not in baseline_benchmarks:
+                continue
+            baseline_seconds = baseline_benchmarks[benchmark_name]["median_seconds"]
+            ratio = benchmark_result["median_seconds"] / baseline_seconds
+            is_regression = ratio > 1 + tolerance
+            has_regression |= is_regression
+            lines.append(
+                f"{bank_name:>5} {benchmark_name:<18} "
+                f"{benchmark_result['median_seconds']:.3e} s ({ratio:.2f}x baseline)"
+                f"{' REGRESSION' if is_regression else ''}"
+            )
+    return lines, has_regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of the question bank and the games')
+    parser.add_argument(
+        '--banks',
+        default=",".join(QUESTION_BANKS),
+        help=f'Comma separated question banks to benchmark, of {list(QUESTION_BANKS)}'
+    )
+    parser.add_argument('--repeats', type=int, default=5, help='Number of runs of each benchmark')
+    parser.add_argument('--random-backend', default="python", choices=RNG_BACKENDS)
+    parser.add_argument('--draw-mode', default="category", choices=DRAW_MODES)
+    parser.add_argument(
+        '--skip-excel',
+        action='store_true',
+        help='Do not write and parse the question banks as Excel files'
+    )
+    parser.add_argument(
+        '--output',
+        help='Path of the JSON results, the standard output if not given'
+    )
+    parser.add_argument('--baseline', help='Path of the JSON results of a baseline run')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help='Fraction by which a benchmark may be slower than the baseline'
+    )
+    args = parser.parse_args()
+    bank_names = [bank_name.strip() for bank_name in args.banks.split(',')]
+    for bank_name in bank_names:
+        if bank_name not in QUESTION_BANKS:
+            parser.error(f"Unknown question bank '{bank_name}', one of {list(QUESTION_BANKS)}.")
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "random_backend": args.random_backend,
+        "draw_mode": args.draw_mode,
+        "banks": {
+            bank_name: run_benchmarks(
+                bank_name,
+                args.repeats,
+                args.random_backend,
+                args.draw_mode,
+                args.skip_excel,
+            )
+            for bank_name in bank_names
+        },
+    }
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        lines, has_regression = compare_with_baseline(results, baseline, args.tolerance)
+        print("\n".join(lines), file=sys.stderr)
+        sys.exit(1 if has_regression else 0)
+
+
+if __name__ == '__main__':
+    main()
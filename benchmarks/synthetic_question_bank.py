@@ -0,0 +1,86 @@
+"""Synthetic question banks of any size for the benchmarks."""
+import string
+from typing import Tuple
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from trivia_game.data_processing import DataLoader
+
+QUESTION_CATEGORY_COLUMN_NAME = "Question Type"
+MAX_OPTION_COLUMNS = len(string.ascii_uppercase)
+
+
+def create_synthetic_question_bank(
+    n_questions: int,
+    n_categories: int,
+    n_option_columns: int = 3,
+    vary_option_columns: bool = False,
+) -> Tuple[pd.DataFrame, dict]:
+    """Create a question bank of n_questions synthetic questions, and its game description.
+
+    The questions are spread evenly over the categories, and each category uses n_option_columns
+    option columns. With vary_option_columns, the category of index i uses only
+    i % (n_option_columns + 1) of them instead, so the categories have between 0 and
+    n_option_columns options. Returns the question bank as a dataframe of strings, and the
+    data_info of its categories (see parse_game_metadata_from_json()).
+    """
+    if not 0 <= n_option_columns <= MAX_OPTION_COLUMNS:
+        raise ValueError(f"n_option_columns must be in [0, {MAX_OPTION_COLUMNS}].")
+    option_columns = [f"{letter})" for letter in string.ascii_uppercase[:n_option_columns]]
+    data_info = {
+        f"Category {category_idx}": {
+            "Question_column": "Question",
+            "Answer_column": "Answer",
+            "Question_option_columns": option_columns[
+                :category_idx % (n_option_columns + 1) if vary_option_columns else None
+            ],
+        }
+        for category_idx in range(n_categories)
+    }
+    question_ids = np.arange(n_questions)
+    df = pd.DataFrame({
+        QUESTION_CATEGORY_COLUMN_NAME: [f"Category {idx % n_categories}" for idx in question_ids],
+        "Question": [f"Question {idx}?" for idx in question_ids],
+        "Answer": [f"Answer {idx}" for idx in question_ids],
+        **{
+            option_column: [f"Option {option_column[0]} of {idx}" for idx in question_ids]
+            for option_column in option_columns
+        },
+    })
+    return df, data_info
+
+
+def create_synthetic_question_categories(
+    n_questions: int,
+    n_categories: int,
+    n_option_columns: int = 3,
+    vary_option_columns: bool = False,
+):
+    """Create question categories of n_questions synthetic questions in total.
+
+    See create_synthetic_question_bank() for the options of the question bank.
+    """
+    df, data_info = create_synthetic_question_bank(
+        n_questions,
+        n_categories,
+        n_option_columns,
+        vary_option_columns,
+    )
+    data_loader = DataLoader(
+        question_category_column_name=QUESTION_CATEGORY_COLUMN_NAME,
+        data_info=data_info,
+        logging_level_str='none'
+    )
+    return data_loader.parse_dataframe(df)
+
+
+def write_excel_question_bank(df: pd.DataFrame, database_path: str):
+    """Write the question bank to an Excel file, streaming its rows to keep large banks fast."""
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    worksheet.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        worksheet.append(row)
+    workbook.save(database_path)
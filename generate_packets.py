@@ -0,0 +1,179 @@
+import sys
+import os
+import argparse
+import contextlib
+from trivia_game.game_options import (
+    CACHE_MODES,
+    DRAW_MODES,
+    DUPLICATE_MODES,
+    PACKET_FORMATS,
+    QUESTION_BANK_FORMATS,
+    RNG_BACKENDS,
+)
+from trivia_game.user_game_interface import parse_difficulty_curve, parse_game_metadata_from_json
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate the question order of the game of each seed, e.g. to print the '
+        'answer sheets of many venues.'
+    )
+    parser.add_argument(
+        '--questions-path',
+        dest='questions_path',
+        metavar='QUESTIONS_PATH',
+        required=True,
+        help='Path to the file containing game questions, which is an Excel(.xlsx), CSV(.csv), '
+        'Parquet(.parquet) or JSON Lines(.jsonl) file.'
+    )
+    parser.add_argument(
+        '--questions-format',
+        dest='questions_format',
+        metavar='QUESTIONS_FORMAT',
+        help='Format of the file containing game questions, one of '
+        f'{QUESTION_BANK_FORMATS}. Deduced from the file extension if not given.',
+        default=None,
+        choices=QUESTION_BANK_FORMATS,
+    )
+    parser.add_argument(
+        '--game-description-json-path',
+        dest='game_description_json_path',
+        metavar='JSON_PATH',
+        required=True,
+        help='Path to the JSON(i.e. .json extension) file containing game description'
+    )
+    parser.add_argument(
+        '--seeds',
+        dest='seeds',
+        metavar='SEEDS',
+        required=True,
+        help='Seeds of the games, as comma separated seeds and inclusive seed ranges, '
+        'e.g. "1-100,250".'
+    )
+    parser.add_argument(
+        '--output',
+        dest='output',
+        metavar='OUTPUT_PATH',
+        help='Path of the file the packets are written to, the standard output if not given.',
+        default=None,
+    )
+    parser.add_argument(
+        '--output-format',
+        dest='output_format',
+        metavar='OUTPUT_FORMAT',
+        help='Format of the packets, one of ["csv", "jsonl"]. "csv" writes a row per question, '
+        '"jsonl" writes a JSON object per game.',
+        default="csv",
+        choices=PACKET_FORMATS,
+    )
+    parser.add_argument(
+        '--workers',
+        dest='workers',
+        metavar='N_WORKERS',
+        type=int,
+        help='Number of processes generating the packets, the number of CPUs if not given.',
+        default=os.cpu_count(),
+    )
+    parser.add_argument(
+        '--weight-calculation-method',
+        dest='weight_calculation_method',
+        metavar='WEIGHT_CALCULATION_METHOD',
+        help='Weights of the question categories, one of ["Weighted", "Equal"].',
+        default="Weighted",
+        choices=["Weighted", "Equal"],
+    )
+    parser.add_argument(
+        '--question-bank-cache',
+        dest='question_bank_cache',
+        metavar='CACHE_MODE',
+        help='Usage of the compiled question bank cache, one of ["use", "rebuild", "off"].',
+        default="use",
+        choices=CACHE_MODES,
+    )
+    parser.add_argument(
+        '--duplicate-questions',
+        dest='duplicate_questions',
+        metavar='DUPLICATE_MODE',
+        help='Handling of the duplicate questions of the question bank, one of '
+        '["off", "report", "drop"].',
+        default="off",
+        choices=DUPLICATE_MODES,
+    )
+    parser.add_argument(
+        '--random-backend',
+        dest='random_backend',
+        metavar='RANDOM_BACKEND',
+        help='Random number generator shuffling the questions, one of ["python", "numpy"].',
+        default="python",
+        choices=RNG_BACKENDS,
+    )
+    parser.add_argument(
+        '--draw-mode',
+        dest='draw_mode',
+        metavar='DRAW_MODE',
+        help='Way of drawing the questions, one of ["category", "permutation", "difficulty"].',
+        default="category",
+        choices=DRAW_MODES,
+    )
+    parser.add_argument(
+        '--difficulty-curve',
+        dest='difficulty_curve',
+        metavar='DIFFICULTY_CURVE',
+        type=parse_difficulty_curve,
+        help='Weights of the difficulty levels (separated by commas) in each round (separated by '
+        'semicolons) of the "difficulty" draw mode.',
+        default=None,
+    )
+    parser.add_argument(
+        '--questions-per-round',
+        dest='questions_per_round',
+        metavar='QUESTIONS_PER_ROUND',
+        type=int,
+        help='Number of questions of each round of the difficulty curve.',
+        default=10,
+    )
+
+    # Parse arguments
+    args = parser.parse_args()
+    # The game engine is imported after parsing the arguments, so that -h is instant
+    from trivia_game.game_packets import generate_game_packets, parse_seeds
+    try:
+        seeds = parse_seeds(args.seeds)
+    except ValueError as err:
+        parser.error(str(err))
+
+    # The notes about the game description must not be mixed with the packets
+    with contextlib.redirect_stdout(sys.stderr):
+        (question_category_column_name, game_metadata) = parse_game_metadata_from_json(
+            os.path.abspath(args.game_description_json_path)
+        )
+    if args.output is None:
+        sys.stdout.reconfigure(encoding='utf-8')
+        output_file = sys.stdout
+    else:
+        output_file = open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        generate_game_packets(
+            seeds,
+            question_category_column_name=question_category_column_name,
+            data_info=game_metadata,
+            data_path=os.path.abspath(args.questions_path),
+            output_file=output_file,
+            packet_format=args.output_format,
+            n_workers=args.workers,
+            cache_mode=args.question_bank_cache,
+            question_bank_format=args.questions_format,
+            duplicate_mode=args.duplicate_questions,
+            rng_backend=args.random_backend,
+            draw_mode=args.draw_mode,
+            difficulty_curve=args.difficulty_curve,
+            questions_per_round=args.questions_per_round,
+            weight_calculation_method=args.weight_calculation_method,
+        )
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == '__main__':
+    main()
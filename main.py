@@ -1,9 +1,17 @@
 import sys
 import os
 import argparse
-from PyQt6.QtWidgets import QApplication
-from trivia_game.trivia_game import TriviaGame
-from trivia_game.user_game_interface import parse_game_metadata_from_json
+# Only light modules are imported before parsing the arguments, the game engine (with pandas and
+# NumPy) and the GUI (with PyQt) are imported by the mode of the game which uses them
+from trivia_game.game_metrics import METRICS_FORMATS, GameMetrics, format_metrics
+from trivia_game.game_options import (
+    CACHE_MODES,
+    DRAW_MODES,
+    DUPLICATE_MODES,
+    QUESTION_BANK_FORMATS,
+    RNG_BACKENDS,
+)
+from trivia_game.user_game_interface import parse_difficulty_curve, parse_game_metadata_from_json
 
 
 def main():
@@ -14,6 +22,22 @@ def main():
         metavar='EXCEL_PATH',
         help='Path to the Excel(i.e. .xlsx extension) file containing game questions'
     )
+    parser.add_argument(
+        '--questions-path',
+        dest='questions_path',
+        metavar='QUESTIONS_PATH',
+        help='Path to the file containing game questions, which is an Excel(.xlsx), CSV(.csv), '
+        'Parquet(.parquet) or JSON Lines(.jsonl) file. Overrides --questions-excel-path.'
+    )
+    parser.add_argument(
+        '--questions-format',
+        dest='questions_format',
+        metavar='QUESTIONS_FORMAT',
+        help='Format of the file containing game questions, one of '
+        f'{QUESTION_BANK_FORMATS}. Deduced from the file extension if not given.',
+        default=None,
+        choices=QUESTION_BANK_FORMATS,
+    )
     parser.add_argument(
         '--game-description-json-path',
         dest='game_description_json_path',
@@ -34,24 +58,144 @@ def main():
         default="none",
         choices=["none", "info", "debug"],
     )
+    parser.add_argument(
+        '--question-bank-cache',
+        dest='question_bank_cache',
+        metavar='CACHE_MODE',
+        help='Usage of the compiled question bank cache stored next to the Excel file, one of '
+        '["use", "rebuild", "off"]. "use" loads the cache if the Excel file and the JSON file '
+        'are unchanged, "rebuild" forces re-parsing the Excel file, "off" skips the cache.',
+        default="use",
+        choices=CACHE_MODES,
+    )
+    parser.add_argument(
+        '--duplicate-questions',
+        dest='duplicate_questions',
+        metavar='DUPLICATE_MODE',
+        help='Handling of the duplicate and near-duplicate questions of the question bank, one of '
+        '["off", "report", "drop"]. "report" logs the groups of duplicates, "drop" keeps only '
+        'the first question of each group.',
+        default="off",
+        choices=DUPLICATE_MODES,
+    )
+    parser.add_argument(
+        '--random-backend',
+        dest='random_backend',
+        metavar='RANDOM_BACKEND',
+        help='Random number generator shuffling the questions, one of ["python", "numpy"]. '
+        '"numpy" is faster for large question banks, but gives different games for the same seed. '
+        'Defaults to "numpy" with --serve, so that starting a game does not hold up the other '
+        'sessions, and to "python" otherwise.',
+        default=None,
+        choices=RNG_BACKENDS,
+    )
+    parser.add_argument(
+        '--draw-mode',
+        dest='draw_mode',
+        metavar='DRAW_MODE',
+        help='Way of drawing the questions, one of ["category", "permutation", "difficulty"]. '
+        '"permutation" shuffles all questions at once, which makes drawing and going to questions '
+        'faster for large question banks, but gives different games for the same seed. '
+        '"difficulty" draws the questions of each round from the difficulty levels given by '
+        '--difficulty-curve, which needs the "difficulty" column in the JSON file.',
+        default="category",
+        choices=DRAW_MODES,
+    )
+    parser.add_argument(
+        '--difficulty-curve',
+        dest='difficulty_curve',
+        metavar='DIFFICULTY_CURVE',
+        type=parse_difficulty_curve,
+        help='Weights of the difficulty levels (from the easiest, separated by commas) in each '
+        'round (separated by semicolons) of the "difficulty" draw mode, e.g. "1,0,0; 1,1,0; 0,1,1"'
+        '. The last round is repeated. By default, each round asks the questions of a single '
+        'level, from the easiest.',
+        default=None,
+    )
+    parser.add_argument(
+        '--questions-per-round',
+        dest='questions_per_round',
+        metavar='QUESTIONS_PER_ROUND',
+        type=int,
+        help='Number of questions of each round of the difficulty curve.',
+        default=10,
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        default=False,
+        help='Run the headless game server instead of the GUI, which hosts many game sessions '
+        'sharing the question bank over HTTP.'
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        default=False,
+        help='Play the game in the terminal instead of the GUI, which does not need PyQt.'
+    )
+    parser.add_argument(
+        '--host',
+        dest='host',
+        metavar='HOST',
+        help='Address the game server listens on (with --serve).',
+        default="127.0.0.1",
+    )
+    parser.add_argument(
+        '--port',
+        dest='port',
+        metavar='PORT',
+        type=int,
+        help='Port the game server listens on (with --serve).',
+        default=8080,
+    )
+    parser.add_argument(
+        '--max-sessions',
+        dest='max_sessions',
+        metavar='MAX_SESSIONS',
+        type=int,
+        help='Maximum number of concurrent game sessions of the game server (with --serve).',
+        default=10000,
+    )
+    parser.add_argument(
+        '--metrics-output',
+        dest='metrics_output',
+        metavar='METRICS_PATH',
+        help='Collect the metrics of the game engine (counters and latencies of loading the '
+        'questions, starting games, drawing questions, computing the category weights and going '
+        'to questions) and write them to this file when the game (or the server) is closed.',
+        default=None,
+    )
+    parser.add_argument(
+        '--metrics-format',
+        dest='metrics_format',
+        metavar='METRICS_FORMAT',
+        help='Format of the metrics written to --metrics-output, one of ["json", "prometheus"].',
+        default="json",
+        choices=METRICS_FORMATS,
+    )
 
     # Parse arguments
     args = parser.parse_args()
+    if args.random_backend is None:
+        args.random_backend = "numpy" if args.serve else "python"
     logging_level = args.logging_level
+    metrics = GameMetrics() if args.metrics_output else None
 
     # --launch-example-game overrides the other options
     if args.launch_example_game:
         game_data_path = "example_game_data/example_game_questions.xlsx"
         game_definition_path = "example_game_data/example_game_definition.json"
     else:
-        if args.questions_excel_path:
+        if args.questions_path:
+            game_data_path = args.questions_path
+        elif args.questions_excel_path:
             game_data_path = args.questions_excel_path
         else:
             raise ValueError(
-                "Excel file containing the questions is not specified. "
+                "File containing the questions is not specified. "
                 "Either launch the example game with --launch-example-game flag "
-                "or specify a path to the Excel file containing the questions either by "
-                "--questions-excel-path argument.\n"
+                "or specify a path to the file containing the questions either by "
+                "--questions-path or --questions-excel-path argument.\n"
                 "To get help about the arguments, run 'python main.py -h'."
             )
         if args.game_description_json_path:
@@ -73,17 +217,109 @@ def main():
     (question_category_column_name, game_metadata) = parse_game_metadata_from_json(
         game_definition_path_absolute
     )
-    # Start the game application
     sys.stdout.reconfigure(encoding='utf-8')
+    if args.serve:
+        _serve_games(
+            args,
+            question_category_column_name,
+            game_metadata,
+            game_data_path_absolute,
+            metrics,
+        )
+        _write_metrics(metrics, args.metrics_output, args.metrics_format)
+        return
+    if args.headless:
+        _play_in_terminal(
+            args,
+            question_category_column_name,
+            game_metadata,
+            game_data_path_absolute,
+            metrics,
+        )
+        _write_metrics(metrics, args.metrics_output, args.metrics_format)
+        return
+
+    # Start the game application
+    from PyQt6.QtWidgets import QApplication
+    from trivia_game.trivia_game import TriviaGame
     app = QApplication(sys.argv)
     trivia_game = TriviaGame(
         logging_level_str=logging_level,
         question_category_column_name=question_category_column_name,
         data_info=game_metadata,
         data_path=game_data_path_absolute,
+        cache_mode=args.question_bank_cache,
+        question_bank_format=args.questions_format,
+        duplicate_mode=args.duplicate_questions,
+        rng_backend=args.random_backend,
+        draw_mode=args.draw_mode,
+        difficulty_curve=args.difficulty_curve,
+        questions_per_round=args.questions_per_round,
+        metrics=metrics,
     )
     trivia_game.start_game()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    trivia_game.stop_game()
+    _write_metrics(metrics, args.metrics_output, args.metrics_format)
+    sys.exit(exit_code)
+
+
+def _serve_games(args, question_category_column_name, game_metadata, game_data_path, metrics):
+    """Load the question bank once and serve the game sessions until interrupted."""
+    from trivia_game.data_processing import DataLoader
+    from trivia_game.game_server import run_game_server
+    data_loader = DataLoader(
+        question_category_column_name=question_category_column_name,
+        data_info=game_metadata,
+        logging_level_str=args.logging_level,
+        metrics=metrics,
+    )
+    question_category_list = data_loader.load_data(
+        game_data_path,
+        cache_mode=args.question_bank_cache,
+        question_bank_format=args.questions_format,
+        duplicate_mode=args.duplicate_questions,
+    )
+    run_game_server(
+        question_category_list,
+        host=args.host,
+        port=args.port,
+        max_sessions=args.max_sessions,
+        rng_backend=args.random_backend,
+        draw_mode=args.draw_mode,
+        difficulty_curve=args.difficulty_curve,
+        questions_per_round=args.questions_per_round,
+        logging_level_str=args.logging_level,
+        metrics=metrics,
+    )
+
+
+def _play_in_terminal(args, question_category_column_name, game_metadata, game_data_path, metrics):
+    """Play the game in the terminal until the quit command or the end of the input."""
+    from trivia_game.terminal_game import TerminalTriviaGame
+    terminal_game = TerminalTriviaGame(
+        logging_level_str=args.logging_level,
+        question_category_column_name=question_category_column_name,
+        data_info=game_metadata,
+        data_path=game_data_path,
+        cache_mode=args.question_bank_cache,
+        question_bank_format=args.questions_format,
+        duplicate_mode=args.duplicate_questions,
+        rng_backend=args.random_backend,
+        draw_mode=args.draw_mode,
+        difficulty_curve=args.difficulty_curve,
+        questions_per_round=args.questions_per_round,
+        metrics=metrics,
+    )
+    terminal_game.start_game()
+
+
+def _write_metrics(metrics, metrics_path, metrics_format):
+    """Write the collected metrics to the file, if they are collected."""
+    if metrics is None:
+        return
+    with open(metrics_path, 'w', encoding='utf-8') as metrics_file:
+        metrics_file.write(format_metrics(metrics, metrics_format))
 
 
 def _create_absolute_file_path(path_relative):
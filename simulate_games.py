@@ -0,0 +1,190 @@
+import sys
+import os
+import json
+import argparse
+import contextlib
+from trivia_game.game_options import (
+    CACHE_MODES,
+    DRAW_MODES,
+    DUPLICATE_MODES,
+    QUESTION_BANK_FORMATS,
+    RNG_BACKENDS,
+)
+from trivia_game.user_game_interface import parse_game_metadata_from_json
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Simulate many games of a question bank and report the distribution of the '
+        'question categories asked, e.g. to compare category weight strategies.'
+    )
+    parser.add_argument(
+        '--questions-path',
+        dest='questions_path',
+        metavar='QUESTIONS_PATH',
+        required=True,
+        help='Path to the file containing game questions, which is an Excel(.xlsx), CSV(.csv), '
+        'Parquet(.parquet) or JSON Lines(.jsonl) file.'
+    )
+    parser.add_argument(
+        '--questions-format',
+        dest='questions_format',
+        metavar='QUESTIONS_FORMAT',
+        help='Format of the file containing game questions, one of '
+        f'{QUESTION_BANK_FORMATS}. Deduced from the file extension if not given.',
+        default=None,
+        choices=QUESTION_BANK_FORMATS,
+    )
+    parser.add_argument(
+        '--game-description-json-path',
+        dest='game_description_json_path',
+        metavar='JSON_PATH',
+        required=True,
+        help='Path to the JSON(i.e. .json extension) file containing game description'
+    )
+    parser.add_argument(
+        '--games',
+        dest='games',
+        metavar='N_GAMES',
+        type=int,
+        help='Number of simulated games.',
+        default=100000,
+    )
+    parser.add_argument(
+        '--questions-per-game',
+        dest='questions_per_game',
+        metavar='N_QUESTIONS',
+        type=int,
+        help='Number of questions asked in each simulated game.',
+        default=40,
+    )
+    parser.add_argument(
+        '--first-seed',
+        dest='first_seed',
+        metavar='SEED',
+        type=int,
+        help='Seed of the first simulated game, the next games use the following seeds.',
+        default=0,
+    )
+    parser.add_argument(
+        '--weight-calculation-method',
+        dest='weight_calculation_method',
+        metavar='WEIGHT_CALCULATION_METHOD',
+        help='Weights of the question categories, one of ["Weighted", "Equal"].',
+        default="Weighted",
+        choices=["Weighted", "Equal"],
+    )
+    parser.add_argument(
+        '--weights-override',
+        dest='weights_override',
+        metavar='WEIGHTS',
+        help='Comma separated weights of the question categories, in the order of the question '
+        'categories of the question bank. Replaces the weight calculation method if given.',
+        default="",
+    )
+    parser.add_argument(
+        '--workers',
+        dest='workers',
+        metavar='N_WORKERS',
+        type=int,
+        help='Number of processes simulating the games, the number of CPUs if not given.',
+        default=os.cpu_count(),
+    )
+    parser.add_argument(
+        '--output',
+        dest='output',
+        metavar='OUTPUT_PATH',
+        help='Path of the JSON file the statistics are written to, the standard output if not '
+        'given.',
+        default=None,
+    )
+    parser.add_argument(
+        '--question-bank-cache',
+        dest='question_bank_cache',
+        metavar='CACHE_MODE',
+        help='Usage of the compiled question bank cache, one of ["use", "rebuild", "off"].',
+        default="use",
+        choices=CACHE_MODES,
+    )
+    parser.add_argument(
+        '--duplicate-questions',
+        dest='duplicate_questions',
+        metavar='DUPLICATE_MODE',
+        help='Handling of the duplicate questions of the question bank, one of '
+        '["off", "report", "drop"].',
+        default="off",
+        choices=DUPLICATE_MODES,
+    )
+    parser.add_argument(
+        '--random-backend',
+        dest='random_backend',
+        metavar='RANDOM_BACKEND',
+        help='Random number generator drawing the questions, one of ["python", "numpy"].',
+        default="python",
+        choices=RNG_BACKENDS,
+    )
+    parser.add_argument(
+        '--draw-mode',
+        dest='draw_mode',
+        metavar='DRAW_MODE',
+        help='Way of drawing the questions, one of ["category", "permutation"]. The simulated '
+        'question categories have no difficulties, hence the "difficulty" draw mode is not '
+        'supported.',
+        default="category",
+        choices=[draw_mode for draw_mode in DRAW_MODES if draw_mode != "difficulty"],
+    )
+
+    # Parse arguments
+    args = parser.parse_args()
+    try:
+        weights_override = [
+            float(weight) for weight in args.weights_override.split(',') if weight.strip()
+        ]
+    except ValueError:
+        parser.error(f"Invalid weights '{args.weights_override}', weights must be numbers "
+                     "separated by commas.")
+
+    # The notes about the game description must not be mixed with the statistics
+    with contextlib.redirect_stdout(sys.stderr):
+        (question_category_column_name, game_metadata) = parse_game_metadata_from_json(
+            os.path.abspath(args.game_description_json_path)
+        )
+    # The game engine is imported after parsing the arguments, so that -h is instant
+    from trivia_game.data_processing import DataLoader
+    from trivia_game.game_simulation import simulate_games
+    question_category_list = DataLoader(
+        question_category_column_name=question_category_column_name,
+        data_info=game_metadata,
+        logging_level_str='none',
+    ).load_data(
+        os.path.abspath(args.questions_path),
+        cache_mode=args.question_bank_cache,
+        question_bank_format=args.questions_format,
+        duplicate_mode=args.duplicate_questions,
+    )
+    if weights_override and len(weights_override) != len(question_category_list):
+        parser.error(f"{len(weights_override)} weights given for "
+                     f"{len(question_category_list)} question categories.")
+
+    statistics = simulate_games(
+        {category.name: category.num_questions for category in question_category_list},
+        n_games=args.games,
+        n_questions_per_game=args.questions_per_game,
+        weight_calculation_method=args.weight_calculation_method,
+        weights_override=weights_override,
+        n_workers=args.workers,
+        first_seed=args.first_seed,
+        rng_backend=args.random_backend,
+        draw_mode=args.draw_mode,
+    )
+    if args.output is None:
+        sys.stdout.reconfigure(encoding='utf-8')
+        json.dump(statistics, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(statistics, output_file, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import unittest
+from PyQt6.QtCore import Qt
+from trivia_game.background_task import BackgroundTask, wait_for_background_tasks
+
+
+class TestBackgroundTask(unittest.TestCase):
+    """Test running the functions in the thread pool and receiving their signals."""
+    def setUp(self):
+        self.received = []
+
+    def _run_task(self, function, cancel=False):
+        task = BackgroundTask(function)
+        # The signals are received in the thread of the task, since there is no event loop here
+        for signal, signal_name in [
+            (task.signals.progress, "progress"),
+            (task.signals.succeeded, "succeeded"),
+            (task.signals.failed, "failed"),
+        ]:
+            signal.connect(
+                lambda value, signal_name=signal_name: self.received.append((signal_name, value)),
+                Qt.ConnectionType.DirectConnection
+            )
+        if cancel:
+            task.cancel()
+        task.start()
+        wait_for_background_tasks()
+        return task
+
+    def test_succeeded(self):
+        def function(progress_callback):
+            progress_callback(1)
+            progress_callback(2)
+            return "result"
+        self._run_task(function)
+        self.assertEqual(
+            self.received,
+            [("progress", 1), ("progress", 2), ("succeeded", "result")]
+        )
+
+    def test_failed(self):
+        def function(progress_callback):
+            raise KeyError("Question")
+        self._run_task(function)
+        self.assertEqual(self.received, [("failed", "KeyError: 'Question'")])
+
+    def test_cancelled(self):
+        def function(progress_callback):
+            progress_callback(1)
+            return "result"
+        self._run_task(function, cancel=True)
+        self.assertEqual(self.received, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from benchmarks.import_time_report import STARTUP_COMMANDS, measure_startup, parse_import_times
+from benchmarks.run_benchmarks import compare_with_baseline
+from benchmarks.synthetic_question_bank import (
+    create_synthetic_question_bank,
+    create_synthetic_question_categories,
+)
+
+
+class TestSyntheticQuestionBank(unittest.TestCase):
+    """Test the synthetic question banks of the benchmarks."""
+    def test_vary_option_columns(self):
+        df, data_info = create_synthetic_question_bank(
+            20, 5, n_option_columns=3, vary_option_columns=True
+        )
+        self.assertEqual(len(df), 20)
+        self.assertEqual(
+            [len(category_info["Question_option_columns"]) for category_info in data_info.values()],
+            [0, 1, 2, 3, 0]
+        )
+        question_categories = create_synthetic_question_categories(
+            20, 5, n_option_columns=3, vary_option_columns=True
+        )
+        self.assertEqual([category.num_questions for category in question_categories], [4] * 5)
+        self.assertEqual(
+            question_categories[2].get_question_texts(0)[2],
+            ("Option A of 2", "Option B of 2")
+        )
+
+
+class TestCompareWithBaseline(unittest.TestCase):
+    def test_regression(self):
+        def create_results(seek_seconds):
+            return {"banks": {"1k": {"benchmarks": {
+                "seek": {"median_seconds": seek_seconds},
+                "full_game": {"median_seconds": 1.0},
+            }}}}
+        lines, has_regression = compare_with_baseline(
+            create_results(1.2), create_results(1.0), tolerance=0.25
+        )
+        self.assertEqual(len(lines), 2)
+        self.assertFalse(has_regression)
+        lines, has_regression = compare_with_baseline(
+            create_results(1.3), create_results(1.0), tolerance=0.25
+        )
+        self.assertTrue(has_regression)
+        self.assertIn("REGRESSION", lines[0])
+
+
+class TestImportTimeReport(unittest.TestCase):
+    def test_parse_import_times(self):
+        import_times = parse_import_times(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     numpy.core\n"
+            "import time:        30 |        150 |   numpy\n"
+            "import time:        10 |        160 | pandas\n"
+        )
+        self.assertEqual(
+            import_times,
+            [("numpy.core", 120, 120, 2), ("numpy", 30, 150, 1), ("pandas", 10, 160, 0)]
+        )
+
+    def test_main_help_imports_no_heavy_modules(self):
+        report = measure_startup(STARTUP_COMMANDS["main_help"], repeats=1)
+        self.assertEqual(report["heavy_modules"], [])
+        self.assertGreater(report["n_imported_modules"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,21 @@
+import datetime
+import os
+import random
+import shutil
+import tempfile
 import unittest
+import unittest.mock
+from array import array
+import openpyxl
 from pandas import DataFrame
-from trivia_game.data_processing import QuestionCategoryData, DataLoader
+from trivia_game.data_processing import (
+    QuestionCategoryData,
+    DataLoader,
+    DifficultyLevel,
+    split_question_categories_by_difficulty,
+)
+from trivia_game.game_random import generate_random_permutation
+from trivia_game.question_bank_readers import iter_excel_rows
 
 
 class TestQuestionCategoryData(unittest.TestCase):
@@ -45,6 +60,178 @@ class TestQuestionCategoryData(unittest.TestCase):
         remaining = self.question_category.get_num_of_remaining_questions()
         self.assertEqual(remaining, 3)
 
+    def test_get_next_question_when_exhausted(self):
+        for _ in range(3):
+            self.question_category.get_next_question()
+        next_question, is_valid = self.question_category.get_next_question()
+        self.assertFalse(is_valid)
+        self.assertEqual(len(next_question), 0)
+        self.assertEqual(self.question_category.get_num_of_remaining_questions(), 0)
+
+    def test_get_next_question_texts(self):
+        self.question_category.reset_game_state(random.Random(3))
+        texts = [self.question_category.get_next_question_texts() for _ in range(3)]
+        self.assertEqual(
+            texts,
+            [(f'Q{idx + 1}', f'A{idx + 1}', (f'Opt{idx + 1}',))
+             for idx in self.question_category.draw_order]
+        )
+        self.assertIsNone(self.question_category.get_next_question_texts())
+        self.assertEqual(self.question_category.get_question_texts_by_draw_index(0), texts[0])
+
+    def test_copy_for_new_game(self):
+        self.question_category.reset_game_state(random.Random(3))
+        self.question_category.get_next_question()
+        game_copy = self.question_category.copy_for_new_game()
+        self.assertIs(game_copy.df, self.question_category.df)
+        self.assertEqual(game_copy.draw_order.itemsize, 4)
+        self.assertEqual(game_copy.get_num_of_remaining_questions(), 2)
+        # The game state of the copy is independent of the original one
+        game_copy.reset_game_state(random.Random(5))
+        game_copy.get_next_question()
+        game_copy.get_next_question()
+        self.assertEqual(self.question_category.get_num_of_remaining_questions(), 2)
+        self.assertEqual(
+            list(self.question_category.draw_order),
+            generate_random_permutation(3, random.Random(3))
+        )
+
+    def test_deferred_reset_game_state(self):
+        permuted_orders = []
+
+        def deferred_permutation(order):
+            order[:] = array('I', [2, 0, 1])
+            permuted_orders.append(order)
+
+        self.question_category.get_next_question()
+        self.question_category.reset_game_state(deferred_permutation=deferred_permutation)
+        self.assertEqual(self.question_category.get_num_of_remaining_questions(), 3)
+        # The questions are shuffled at the first draw only
+        self.assertEqual(permuted_orders, [])
+        game_copy = self.question_category.copy_for_new_game()
+        self.assertEqual(self.question_category.get_next_question_texts(), ('Q3', 'A3', ('Opt3',)))
+        self.assertEqual(self.question_category.get_next_question_texts(), ('Q1', 'A1', ('Opt1',)))
+        self.assertEqual(len(permuted_orders), 1)
+        self.assertEqual(game_copy.get_question_texts_by_draw_index(2), ('Q2', 'A2', ('Opt2',)))
+        self.assertEqual(len(permuted_orders), 2)
+
+    def test_draw_order_matches_sorting_indices(self):
+        """The draw order must be the same as the one given by the former sorting indices."""
+        n = 50
+        random.seed(7)
+        integers = list(range(1, n + 1))
+        random.shuffle(integers)
+        sorting_indices = sorted(range(n), key=lambda k: integers[k])
+        expected_order = [sorting_indices.index(k) for k in range(n)]
+
+        self.assertEqual(generate_random_permutation(n, random.Random(7)), expected_order)
+
+    def _create_reloaded_category(self, rows):
+        return QuestionCategoryData(
+            name='Category1',
+            df=DataFrame(rows, columns=['Question', 'Answer', 'Option1'], index=[7, 8, 9]),
+            question_column_title='Question',
+            answer_column_title='Answer',
+            question_option_columns_list=['Option1']
+        )
+
+    def test_diff_questions(self):
+        # Q1's answer is modified, Q2 is replaced by an edited question and Q3 is kept
+        question_changes = self.question_category.diff_questions(
+            self._create_reloaded_category([
+                ['Q2 edited', 'A2', 'Opt2'],
+                ['Q3', 'A3', 'Opt3'],
+                ['Q1', 'A1 edited', 'Opt1'],
+            ])
+        )
+        self.assertEqual(question_changes.modified_rows, [(0, ('Q1', 'A1 edited', 'Opt1'))])
+        self.assertEqual(question_changes.added_questions, [(7, ('Q2 edited', 'A2', 'Opt2'))])
+        self.assertEqual(question_changes.removed_rows, [1])
+        self.assertEqual(question_changes.num_changes, 3)
+        self.assertTrue(question_changes.is_structural())
+        # Moving the rows is not a change
+        question_changes = self.question_category.diff_questions(
+            self._create_reloaded_category([
+                ['Q3', 'A3', 'Opt3'],
+                ['Q1', 'A1', 'Opt1'],
+                ['Q2', 'A2', 'Opt2'],
+            ])
+        )
+        self.assertEqual(question_changes.num_changes, 0)
+
+    def test_diff_questions_digest(self):
+        questions_digest = self.question_category.get_questions_digest()
+        question_changes = self.question_category.diff_questions(
+            self._create_reloaded_category([
+                ['Q1', 'A1 edited', 'Opt1'],
+                ['Q2', 'A2', 'Opt2'],
+                ['Q3', 'A3', 'Opt3 edited'],
+            ])
+        )
+        self.assertFalse(question_changes.is_structural())
+        # The digest of the modified questions is found with the changes, not when applying them
+        self.assertEqual(self.question_category.get_questions_digest(), questions_digest)
+        self.question_category.apply_question_changes(question_changes)
+        self.assertNotEqual(self.question_category.get_questions_digest(), questions_digest)
+        self.assertEqual(
+            self.question_category.get_questions_digest(),
+            self.question_category._compute_questions_digest()
+        )
+        # The digest is not known once questions are added or removed
+        question_changes = self.question_category.diff_questions(
+            self._create_reloaded_category([['Q1', 'A1', 'Opt1']])
+        )
+        self.assertIsNone(question_changes.questions_digest)
+
+    def test_apply_question_changes(self):
+        for seed in range(6):
+            self.question_category.reset_game_state(random.Random(seed))
+            asked_question = self.question_category.get_next_question_texts()
+            self.question_category.apply_question_changes(
+                self.question_category.diff_questions(
+                    self._create_reloaded_category([
+                        ['Q1', 'A1 edited', 'Opt1'],
+                        ['Q4', 'A4', 'Opt4'],
+                        ['Q3', 'A3', 'Opt3'],
+                    ])
+                ),
+                random.Random(seed)
+            )
+            # The asked question stays asked, even if it is removed
+            self.assertEqual(self.question_category.next_question_idx, 1)
+            self.assertEqual(
+                self.question_category.get_question_texts_by_draw_index(0)[0],
+                asked_question[0]
+            )
+            unasked_questions = {
+                self.question_category.get_next_question_texts()
+                for _ in range(self.question_category.get_num_of_remaining_questions())
+            }
+            expected_questions = {
+                ('Q1', 'A1 edited', ('Opt1',)), ('Q3', 'A3', ('Opt3',)), ('Q4', 'A4', ('Opt4',))
+            }
+            if asked_question[0] == 'Q2':
+                expected_questions.add(asked_question)
+            self.assertEqual(
+                unasked_questions | {self.question_category.get_question_texts_by_draw_index(0)},
+                expected_questions
+            )
+            self.assertEqual(self.question_category.df.values.tolist(), [
+                ['Q1', 'A1 edited', 'Opt1'],
+                ['Q2', 'A2', 'Opt2'],
+                ['Q3', 'A3', 'Opt3'],
+                ['Q4', 'A4', 'Opt4'],
+            ])
+            # The removed question is dropped from the next game
+            self.question_category.reset_game_state(random.Random(seed))
+            self.assertEqual(self.question_category.num_questions, 3)
+            self.assertEqual(
+                sorted(self.question_category.get_question_texts_by_draw_range(0, 3)),
+                [('Q1', 'A1 edited', ('Opt1',)), ('Q3', 'A3', ('Opt3',)), ('Q4', 'A4', ('Opt4',))]
+            )
+            self.assertEqual(self.question_category.df.index.tolist(), [0, 2, 8])
+            self.setUp()
+
 
 class TestDataLoader(unittest.TestCase):
     """Test DataLoader functionality."""
@@ -67,6 +254,254 @@ class TestDataLoader(unittest.TestCase):
         self.assertEqual(question_category.name, 'Category1')
         self.assertEqual(question_category.num_questions, 2)
 
+    def test_group_rows_by_question_category(self):
+        mock_df = DataFrame({
+            'Category': ['Category1', ' Category2', 'Category1 ', 'Category3', 'Category2'],
+            'Question': ['Q1', 'Q2', 'Q3', 'Q4', 'Q5'],
+        })
+        rows_by_question_category = DataLoader._group_rows_by_question_category(
+            'Category',
+            mock_df
+        )
+        self.assertEqual(
+            {category: list(rows) for category, rows in rows_by_question_category.items()},
+            {'Category1': [0, 2], 'Category2': [1, 4], 'Category3': [3]}
+        )
+
+    def test_report_unknown_question_categories(self):
+        data_loader = DataLoader(
+            question_category_column_name='Category',
+            data_info={'Category1 ': {'Question_column': 'Question',
+                                      'Answer_column': 'Answer',
+                                      'Question_option_columns': []}},
+            logging_level_str='none'
+        )
+        data_loader._report_unknown_question_categories({
+            'Category1': [0, 2],
+            'Category2': [1, 4],
+            '': [3],
+        })
+        self.assertEqual(
+            {category: list(rows) for category, rows in
+             data_loader.unknown_question_category_rows.items()},
+            {'Category2': [1, 4], '': [3]}
+        )
+
+
+class TestExcelIngestion(unittest.TestCase):
+    """Test streaming the Excel file into the question categories."""
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.temp_dir, "questions.xlsx")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['Category', 'Notes', 'Question', 'Answer', 'Option1', None])
+        sheet.append(['Category1', 'note', 'Q1', 'A1', 2.0, 'x'])
+        sheet.append([None, None, None, None, None, None])
+        sheet.append([' Category2', 'note', 'Q2', True, 2.5, None])
+        sheet.append(['Category1 ', None, 'Q3', 'NA', datetime.datetime(2020, 1, 2), None])
+        sheet.append(['Category3', None, 'Q4', '#DIV/0!', None, None])
+        workbook.save(self.data_path)
+        self.data_loader = DataLoader(
+            question_category_column_name='Category',
+            data_info={
+                'Category1': {'Question_column': 'Question',
+                              'Answer_column': 'Answer',
+                              'Question_option_columns': ['Option1']},
+                'Category2': {'Question_column': 'Question',
+                              'Answer_column': 'Answer',
+                              'Question_option_columns': []},
+            },
+            logging_level_str='none'
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_iter_excel_rows(self):
+        rows = list(iter_excel_rows(self.data_path, ['Category', 'Answer', 'Option1']))
+        self.assertEqual(rows, [
+            ('Category1', 'A1', '2'),
+            (' Category2', 'True', '2.5'),
+            ('Category1 ', '', '2020-01-02 00:00:00'),
+            ('Category3', '', ''),
+        ])
+
+    def test_iter_excel_rows_missing_column(self):
+        with self.assertRaises(KeyError):
+            list(iter_excel_rows(self.data_path, ['Category', 'Hint']))
+
+    def test_parse_excel_data(self):
+        category1, category2 = self.data_loader.parse_excel_data(self.data_path)
+        self.assertEqual(list(category1.df.columns), ['Question', 'Answer', 'Option1'])
+        self.assertEqual(category1.df.values.tolist(), [
+            ['Q1', 'A1', '2'],
+            ['Q3', '', '2020-01-02 00:00:00'],
+        ])
+        self.assertEqual(list(category2.df.columns), ['Question', 'Answer'])
+        self.assertEqual(category2.df.values.tolist(), [['Q2', 'True']])
+        self.assertEqual(
+            {category: list(rows) for category, rows in
+             self.data_loader.unknown_question_category_rows.items()},
+            {'Category3': [3]}
+        )
+
+    def test_parse_data_progress(self):
+        n_rows_read = []
+        with unittest.mock.patch('trivia_game.data_processing._PROGRESS_REPORT_INTERVAL', 3):
+            category1, _ = self.data_loader.parse_data(
+                self.data_path,
+                progress_callback=n_rows_read.append
+            )
+        self.assertEqual(n_rows_read, [3, 4])
+        self.assertEqual(category1.num_questions, 2)
+
+
+class TestDuplicateQuestions(unittest.TestCase):
+    """Test reporting and dropping the duplicate questions of the loaded question bank."""
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.temp_dir, "questions.csv")
+        DataFrame({
+            'Category': ['Art', 'Art', 'Geography', 'Art', 'Geography'],
+            'Question': ['Who painted the Mona Lisa?', 'What is the capital of France?',
+                         'What is the capital of France?', 'Who painted Mona Lisa',
+                         'What is the capital of Spain?'],
+            'Answer': ['Leonardo da Vinci', 'Paris', 'Paris', 'Leonardo da Vinci', 'Madrid'],
+        }).to_csv(self.data_path, index=False)
+        question_category_info = {'Question_column': 'Question',
+                                  'Answer_column': 'Answer',
+                                  'Question_option_columns': []}
+        self.data_loader = DataLoader(
+            question_category_column_name='Category',
+            data_info={'Art': question_category_info, 'Geography': question_category_info},
+            logging_level_str='none'
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_report_duplicate_questions(self):
+        art, geography = self.data_loader.load_data(self.data_path, duplicate_mode="report")
+        self.assertEqual(self.data_loader.duplicate_question_groups, [
+            [('Art', 0), ('Art', 3)],
+            [('Art', 1), ('Geography', 2)],
+        ])
+        self.assertEqual(art.num_questions, 3)
+        self.assertEqual(geography.num_questions, 2)
+
+    def test_drop_duplicate_questions(self):
+        art, geography = self.data_loader.load_data(self.data_path, duplicate_mode="drop")
+        self.assertEqual(art._question_texts, [
+            'Who painted the Mona Lisa?', 'What is the capital of France?'
+        ])
+        self.assertEqual(geography._question_texts, ['What is the capital of Spain?'])
+        self.assertEqual(geography.num_questions, 1)
+
+    def test_duplicate_questions_off(self):
+        art, geography = self.data_loader.load_data(self.data_path)
+        self.assertEqual(self.data_loader.duplicate_question_groups, [])
+        self.assertEqual(art.num_questions + geography.num_questions, 5)
+        with self.assertRaises(ValueError):
+            self.data_loader.load_data(self.data_path, duplicate_mode="merge")
+
+
+class TestDifficultyBuckets(unittest.TestCase):
+    """Test bucketing the questions of the loaded question bank by their difficulties."""
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.temp_dir, "questions.csv")
+        DataFrame({
+            'Category': ['Art', 'Art', 'Geography', 'Art', 'Geography', 'Geography', 'Art'],
+            'Question': ['Art 1', 'Art 2', 'Geography 3', 'Art 4', 'Geography 5', 'Geography 6',
+                         'Art 7'],
+            'Answer': ['A1', 'A2', 'G3', 'A4', 'G5', 'G6', 'A7'],
+            'Difficulty': ['hard', ' easy ', '2', 'easy', 'unknown', '1', ''],
+        }).to_csv(self.data_path, index=False)
+        self.data_info = {
+            'Art': {'Question_column': 'Question',
+                    'Answer_column': 'Answer',
+                    'Question_option_columns': [],
+                    'Difficulty_column': 'Difficulty',
+                    'Difficulty_levels': ['easy', 'medium', 'hard']},
+            'Geography': {'Question_column': 'Question',
+                          'Answer_column': 'Answer',
+                          'Question_option_columns': [],
+                          'Difficulty_column': 'Difficulty'},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_bucket_rows_by_difficulty(self):
+        data_loader = DataLoader('Category', self.data_info, logging_level_str='none')
+        art, geography = data_loader.load_data(self.data_path, cache_mode="use")
+        # The rows without a known difficulty are skipped
+        self.assertEqual(art._question_texts, ['Art 1', 'Art 2', 'Art 4'])
+        self.assertEqual(geography._question_texts, ['Geography 3', 'Geography 6'])
+        self.assertEqual(
+            {level: list(row_positions) for level, row_positions in art.difficulty_buckets.items()},
+            {DifficultyLevel(0.0, 'easy'): [1, 2], DifficultyLevel(2.0, 'hard'): [0]}
+        )
+        self.assertEqual(
+            {level: list(row_positions)
+             for level, row_positions in geography.difficulty_buckets.items()},
+            {DifficultyLevel(1.0, '1'): [1], DifficultyLevel(2.0, '2'): [0]}
+        )
+        # The buckets are cached with the questions
+        art, geography = data_loader.load_data(self.data_path, cache_mode="use")
+        self.assertEqual(len(art.difficulty_buckets), 2)
+
+        # The ranks of the levels of Art and Geography have other labels
+        with self.assertRaisesRegex(ValueError, "'Art' has the level 'hard' of rank 2"):
+            split_question_categories_by_difficulty([art, geography])
+
+    def test_split_question_categories_by_difficulty(self):
+        self.data_info['Geography']['Difficulty_levels'] = ['easy', 'medium', 'hard']
+        DataFrame({
+            'Category': ['Art', 'Art', 'Geography', 'Art', 'Geography', 'Geography'],
+            'Question': ['Art 1', 'Art 2', 'Geography 3', 'Art 4', 'Geography 5', 'Geography 6'],
+            'Answer': ['A1', 'A2', 'G3', 'A4', 'G5', 'G6'],
+            'Difficulty': ['hard', 'easy', 'medium', 'easy', 'hard', 'easy'],
+        }).to_csv(self.data_path, index=False)
+        art, geography = DataLoader(
+            'Category', self.data_info, logging_level_str='none'
+        ).load_data(self.data_path)
+        question_categories = split_question_categories_by_difficulty([art, geography])
+        self.assertEqual(
+            [(category.name, category.difficulty_level.label, category._question_texts)
+             for category in question_categories],
+            [('Art', 'easy', ['Art 2', 'Art 4']),
+             ('Geography', 'easy', ['Geography 6']),
+             ('Geography', 'medium', ['Geography 3']),
+             ('Art', 'hard', ['Art 1']),
+             ('Geography', 'hard', ['Geography 5'])]
+        )
+        # Split question categories are kept as they are
+        self.assertEqual(
+            split_question_categories_by_difficulty(question_categories),
+            question_categories
+        )
+        # The labels must have the same ranks too
+        self.data_info['Geography']['Difficulty_levels'] = ['medium', 'easy', 'hard']
+        art, geography = DataLoader(
+            'Category', self.data_info, logging_level_str='none'
+        ).load_data(self.data_path)
+        with self.assertRaisesRegex(ValueError, "'Geography' has the level 'medium' of rank 0"):
+            split_question_categories_by_difficulty([art, geography])
+
+    def test_no_difficulty_column(self):
+        data_info = {'Art': {'Question_column': 'Question',
+                             'Answer_column': 'Answer',
+                             'Question_option_columns': []}}
+        (art,) = DataLoader('Category', data_info, logging_level_str='none').load_data(
+            self.data_path
+        )
+        self.assertIsNone(art.difficulty_buckets)
+        self.assertEqual(art.num_questions, 4)
+        with self.assertRaises(ValueError):
+            split_question_categories_by_difficulty([art])
+
 
 if __name__ == '__main__':
     unittest.main()
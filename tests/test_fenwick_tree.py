@@ -0,0 +1,46 @@
+import bisect
+import itertools
+import random
+import unittest
+from trivia_game.fenwick_tree import FenwickTree
+
+
+class TestFenwickTree(unittest.TestCase):
+    """Test FenwickTree functionality."""
+    def setUp(self):
+        self.weights = [3, 0, 5, 1, 0, 0, 7]
+        self.tree = FenwickTree(self.weights)
+
+    def test_total_and_prefix_sum(self):
+        self.assertEqual(self.tree.total, 16)
+        for end in range(len(self.weights) + 1):
+            self.assertEqual(self.tree.prefix_sum(end), sum(self.weights[:end]))
+
+    def test_add_and_set(self):
+        self.tree.add(1, 2)
+        self.tree.set(6, 0)
+        self.assertEqual(self.tree.get(1), 2)
+        self.assertEqual(self.tree.get(6), 0)
+        self.assertEqual(self.tree.total, 11)
+        self.assertEqual(self.tree.prefix_sum(3), 10)
+
+    def test_find_matches_bisect(self):
+        cumulative_weights = list(itertools.accumulate(self.weights))
+        rng = random.Random(0)
+        for _ in range(1000):
+            value = rng.random() * self.tree.total
+            self.assertEqual(
+                self.tree.find(value),
+                bisect.bisect_right(cumulative_weights, value)
+            )
+
+    def test_find_skips_zero_weights(self):
+        self.assertEqual(self.tree.find(0), 0)
+        self.assertEqual(self.tree.find(3), 2)
+        self.assertEqual(self.tree.find(8.5), 3)
+        self.assertEqual(self.tree.find(9), 6)
+        self.assertEqual(self.tree.find(16), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
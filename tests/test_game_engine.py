@@ -1,20 +1,26 @@
+import itertools
 import unittest
 import os
+import random
+import shutil
+import tempfile
+from collections import Counter
+from typing import List
 from unittest.mock import patch, Mock
+import openpyxl
 from pandas import DataFrame
+from trivia_game.data_processing import QuestionCategoryData, QuestionChanges
 from trivia_game.game_engine import GameEngine, TriviaQuestion
 from trivia_game.user_game_interface import parse_game_metadata_from_json
 
 
 class TestTriviaQuestion(unittest.TestCase):
     def test_init_with_valid_question(self):
-        data = DataFrame({'Question': ['Q1'], 'Answer': ['A1'], 'Option1': ['Opt1']})
         question = TriviaQuestion(
             is_question_valid=True,
-            data=data,
-            question_column_str='Question',
-            answer_column_str='Answer',
-            question_options_list=['Option1'],
+            question_text='Q1',
+            answer_text='A1',
+            question_options=('Opt1',),
             question_category='Category'
         )
         self.assertTrue(question.is_question_valid())
@@ -31,6 +37,14 @@ class TestTriviaQuestion(unittest.TestCase):
         self.assertEqual(question.get_question_category_text(), '')
         self.assertEqual(question.get_question_options(), [])
 
+    def test_immutable(self):
+        question = TriviaQuestion(is_question_valid=True, question_text='Q1')
+        with self.assertRaises(AttributeError):
+            question._question_text = 'Q2'
+        with self.assertRaises(AttributeError):
+            question.extra_attribute = 1
+        self.assertFalse(hasattr(question, '__dict__'))
+
 
 class TestGameEngine(unittest.TestCase):
     @patch('trivia_game.data_processing.create_logger')
@@ -58,3 +72,574 @@ class TestGameEngine(unittest.TestCase):
         self.assertEqual(number_of_questions, 9)
         self.assertEqual(len(self.game_engine._ref_dict), 4)
         self.assertEqual(len(self.game_engine._question_categorys), 4)
+
+    def test_play_until_game_over(self):
+        self.game_engine.set_game_parameters(*_load_test_game_parameters())
+        for weight_calculation_method in ['Weighted', 'Equal']:
+            self.game_engine.initialize_game(seed=3)
+            questions = []
+            question = self.game_engine.get_next_question(weight_calculation_method)
+            while question.is_question_valid():
+                questions.append(question.get_question_text())
+                question = self.game_engine.get_next_question(weight_calculation_method)
+            self.assertEqual(len(questions), 9)
+            self.assertEqual(len(set(questions)), 9)
+            self.assertFalse(self.game_engine.get_next_question().is_question_valid())
+
+    def test_same_seed_same_questions(self):
+        self.game_engine.set_game_parameters(*_load_test_game_parameters())
+        self.game_engine.initialize_game(seed=42)
+        first_game = [self.game_engine.get_next_question().get_question_text() for _ in range(9)]
+        self.game_engine.initialize_game(seed=42)
+        second_game = [self.game_engine.get_next_question().get_question_text() for _ in range(9)]
+        self.assertEqual(first_game, second_game)
+
+    @patch('trivia_game.game_engine._RNG_CHECKPOINT_INTERVAL', 2)
+    def test_seek(self):
+        self.game_engine.set_game_parameters(*_load_test_game_parameters())
+        self.game_engine.initialize_game(seed=7)
+        expected_questions = [
+            self.game_engine.get_next_question().get_question_text() for _ in range(9)
+        ]
+        for question_number in [5, 9, 1, 4, 8, 3]:
+            # Seeking back and forth must continue the game as if it was played until there
+            question = self.game_engine.seek(question_number)
+            self.assertEqual(question.get_question_text(), expected_questions[question_number - 1])
+            continued_questions = [
+                self.game_engine.get_next_question().get_question_text()
+                for _ in range(9 - question_number)
+            ]
+            self.assertEqual(continued_questions, expected_questions[question_number:])
+            self.assertFalse(self.game_engine.get_next_question().is_question_valid())
+
+    @patch('trivia_game.game_engine._RNG_CHECKPOINT_INTERVAL', 2)
+    def test_seek_before_playing(self):
+        self.game_engine.set_game_parameters(*_load_test_game_parameters())
+        self.game_engine.initialize_game(seed=11)
+        question = self.game_engine.seek(6)
+        continued_questions = [
+            self.game_engine.get_next_question().get_question_text() for _ in range(3)
+        ]
+        self.game_engine.initialize_game(seed=11)
+        expected_questions = [
+            self.game_engine.get_next_question().get_question_text() for _ in range(9)
+        ]
+        self.assertEqual(question.get_question_text(), expected_questions[5])
+        self.assertEqual(continued_questions, expected_questions[6:])
+
+    @patch('trivia_game.game_engine._RNG_CHECKPOINT_INTERVAL', 2)
+    def test_get_next_questions(self):
+        game_parameters = _load_test_game_parameters()
+        for rng_backend in ['python', 'numpy']:
+            for weight_calculation_method in ['Weighted', 'Equal']:
+                game_engine = GameEngine(logging_level_str='none', rng_backend=rng_backend)
+                game_engine.set_game_parameters(*game_parameters)
+                game_engine.initialize_game(seed=8)
+                expected_questions = [
+                    repr(game_engine.get_next_question(weight_calculation_method))
+                    for _ in range(11)
+                ]
+                game_engine.initialize_game(seed=8)
+                questions = [repr(game_engine.get_next_question(weight_calculation_method))]
+                for n_questions in [0, 3, 5, 2]:
+                    questions += map(
+                        repr,
+                        game_engine.get_next_questions(n_questions, weight_calculation_method)
+                    )
+                self.assertEqual(questions, expected_questions)
+                self.assertEqual(
+                    [question.is_question_valid() for question in
+                     game_engine.get_next_questions(2, weight_calculation_method)],
+                    [False, False]
+                )
+                # The game continues from the batch after seeking
+                game_engine.seek(3, weight_calculation_method)
+                self.assertEqual(
+                    [repr(question) for question in
+                     game_engine.get_next_questions(6, weight_calculation_method)],
+                    expected_questions[3:9]
+                )
+
+    def test_draw_question_categories(self):
+        self.game_engine.set_game_parameters(*_load_test_game_parameters())
+        question_category_names = self.game_engine.get_question_category_names()
+        for weights_override in [[], [1, 2, 1, 1]]:
+            self.game_engine.initialize_game(seed=4)
+            expected_categories = [
+                self.game_engine.get_next_question(
+                    weights_override=weights_override
+                ).get_question_category_text()
+                for _ in range(11)
+            ]
+            self.game_engine.initialize_game(seed=4)
+            category_indices = self.game_engine.draw_question_categories(
+                11, weights_override=weights_override
+            )
+            self.assertEqual(
+                [question_category_names[category_idx] if category_idx >= 0 else ""
+                 for category_idx in category_indices],
+                expected_categories
+            )
+        # Without shuffling, the questions of each category are asked in the order of the bank
+        self.game_engine.initialize_game(seed=4, shuffle_questions=False)
+        self.game_engine.get_next_questions(9)
+        self.game_engine.initialize_game(seed=4, shuffle_questions=False)
+        self.assertEqual(len(self.game_engine.draw_question_categories(20)), 20)
+        self.assertFalse(self.game_engine.get_next_question().is_question_valid())
+
+    def test_seek_out_of_range(self):
+        self.game_engine.set_game_parameters(*_load_test_game_parameters())
+        self.game_engine.initialize_game(seed=1)
+        self.assertFalse(self.game_engine.seek(0).is_question_valid())
+        self.assertTrue(self.game_engine.get_next_question().is_question_valid())
+        self.assertFalse(self.game_engine.seek(10).is_question_valid())
+        self.assertFalse(self.game_engine.get_next_question().is_question_valid())
+
+    def test_invalid_weights_override_with_debug_logging(self):
+        game_parameters = _load_test_game_parameters()
+        self.game_engine.set_game_parameters(*game_parameters)
+        self.game_engine.initialize_game(seed=3)
+        expected_questions = [repr(question) for question in self.game_engine.get_next_questions(9)]
+        with self.assertLogs('GameEngine', level='DEBUG') as captured_logs:
+            game_engine = GameEngine(logging_level_str='debug')
+            game_engine.set_game_parameters(*game_parameters)
+            game_engine.initialize_game(seed=3)
+            # All-zero weights fall back to the default weights
+            questions = [
+                repr(game_engine.get_next_question(weights_override=[0, 0, 0, 0]))
+                for _ in range(9)
+            ]
+        self.assertEqual(questions, expected_questions)
+        self.assertTrue(any(
+            "Fall back to default normalization" in message for message in captured_logs.output
+        ))
+
+    def test_engines_do_not_share_random_state(self):
+        game_parameters = _load_test_game_parameters()
+        self.game_engine.set_game_parameters(*game_parameters)
+        other_game_engine = GameEngine(logging_level_str='none')
+        other_game_engine.set_game_parameters(*game_parameters)
+        self.game_engine.initialize_game(seed=5)
+        expected_questions = [
+            self.game_engine.get_next_question().get_question_text() for _ in range(9)
+        ]
+
+        self.game_engine.initialize_game(seed=5)
+        other_game_engine.initialize_game(seed=6)
+        questions = []
+        for _ in range(9):
+            # Interleave the draws of the other engine and of the random module
+            other_game_engine.get_next_question()
+            random.random()
+            questions.append(self.game_engine.get_next_question().get_question_text())
+        self.assertEqual(questions, expected_questions)
+
+    @patch('trivia_game.game_engine._RNG_CHECKPOINT_INTERVAL', 2)
+    def test_numpy_rng_backend(self):
+        game_engine = GameEngine(logging_level_str='none', rng_backend='numpy')
+        game_engine.set_game_parameters(*_load_test_game_parameters())
+        game_engine.initialize_game(seed=5)
+        questions = [game_engine.get_next_question().get_question_text() for _ in range(9)]
+        self.assertEqual(len(set(questions)), 9)
+        self.assertFalse(game_engine.get_next_question().is_question_valid())
+        game_engine.initialize_game(seed=5)
+        # The question categories are shuffled at their first draw
+        self.assertTrue(all(
+            question_category._deferred_permutation is not None
+            for question_category in game_engine._ref_dict.values()
+        ))
+        self.assertEqual(game_engine.seek(4).get_question_text(), questions[3])
+        self.assertEqual(
+            [game_engine.get_next_question().get_question_text() for _ in range(5)],
+            questions[4:]
+        )
+
+
+class TestPermutationDrawMode(unittest.TestCase):
+    def setUp(self):
+        self.game_engine = GameEngine(logging_level_str='none', draw_mode='permutation')
+        self.game_engine.set_game_parameters(*_load_test_game_parameters())
+
+    def test_play_until_game_over(self):
+        self.game_engine.initialize_game(seed=4)
+        questions = [self.game_engine.get_next_question() for _ in range(9)]
+        self.assertEqual(len({repr(question) for question in questions}), 9)
+        self.assertTrue(all(question.is_question_valid() for question in questions))
+        self.assertFalse(self.game_engine.get_next_question().is_question_valid())
+
+        self.game_engine.initialize_game(seed=4)
+        self.assertEqual(
+            [repr(question) for question in self.game_engine.get_next_questions(10)],
+            [repr(question) for question in questions] + [repr(TriviaQuestion())]
+        )
+        self.assertEqual(repr(self.game_engine.seek(7)), repr(questions[6]))
+        self.assertEqual(repr(self.game_engine.get_next_question()), repr(questions[7]))
+        self.assertFalse(self.game_engine.seek(0).is_question_valid())
+        self.assertFalse(self.game_engine.seek(10).is_question_valid())
+        self.assertFalse(self.game_engine.get_next_question().is_question_valid())
+
+    def test_unsupported_weights(self):
+        self.game_engine.initialize_game(seed=4)
+        with self.assertRaises(ValueError):
+            self.game_engine.get_next_question(weight_calculation_method='Equal')
+        with self.assertRaises(ValueError):
+            self.game_engine.seek(3, weights_override=[1, 0, 0, 0])
+        self.assertTrue(
+            self.game_engine.get_next_question(weights_override=[0, 0, 0, 0]).is_question_valid()
+        )
+        with self.assertRaises(ValueError):
+            GameEngine(logging_level_str='none', draw_mode='shuffle')
+
+    def test_same_distribution_as_category_draw_mode(self):
+        """Chi-squared tests of the games of 3000 seeds, played in both draw modes."""
+        n_games = 3000
+        games_by_draw_mode = dict()
+        for draw_mode in ['category', 'permutation']:
+            game_engine = GameEngine(logging_level_str='none', draw_mode=draw_mode)
+            game_engine.set_game_parameters(*_load_test_game_parameters())
+            games_by_draw_mode[draw_mode] = []
+            for seed in range(n_games):
+                game_engine.initialize_game(seed=seed)
+                games_by_draw_mode[draw_mode].append(
+                    [question.get_question_text() for question in game_engine.get_next_questions(9)]
+                )
+
+        questions = sorted(games_by_draw_mode['category'][0])
+        expected_count = n_games / len(questions)
+        for games in games_by_draw_mode.values():
+            for question_position in range(len(questions)):
+                # Every question is equally likely to be asked at every position
+                counts = Counter(game[question_position] for game in games)
+                chi_squared = sum(
+                    (counts[question] - expected_count) ** 2 / expected_count
+                    for question in questions
+                )
+                # Critical value of 8 degrees of freedom at the significance level of 0.001
+                self.assertLess(chi_squared, 26.12)
+
+        # The first two questions follow the same distribution in both draw modes
+        category_counts, permutation_counts = [
+            Counter((game[0], game[1]) for game in games)
+            for games in games_by_draw_mode.values()
+        ]
+        question_pairs = set(category_counts) | set(permutation_counts)
+        chi_squared = 0.0
+        for pair in question_pairs:
+            count_difference = category_counts[pair] - permutation_counts[pair]
+            count_sum = category_counts[pair] + permutation_counts[pair]
+            chi_squared += count_difference ** 2 / count_sum
+        # Critical value of 71 degrees of freedom at the significance level of 0.001
+        self.assertEqual(len(question_pairs), 72)
+        self.assertLess(chi_squared, 112.32)
+
+
+class TestQuestionBankReload(unittest.TestCase):
+    """Test patching the running games with the changes of the question bank."""
+    def setUp(self):
+        self.temporary_directory = tempfile.mkdtemp()
+        question_category_column_name, game_metadata, test_data_path = \
+            _load_test_game_parameters()
+        self.data_path = os.path.join(self.temporary_directory, "game_data.xlsx")
+        shutil.copyfile(test_data_path, self.data_path)
+        self.game_parameters = (question_category_column_name, game_metadata, self.data_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temporary_directory)
+
+    def _edit_question_bank(self) -> str:
+        """Modify, remove and add a 'Yes - No' question, and return the removed question."""
+        workbook = openpyxl.load_workbook(self.data_path)
+        worksheet = workbook.active
+        columns = {cell.value: cell.column for cell in worksheet[1]}
+        yes_no_rows = [
+            row for row in range(2, worksheet.max_row + 1)
+            if worksheet.cell(row, columns['Question Type']).value == 'Yes - No'
+        ]
+        worksheet.cell(yes_no_rows[1], columns['YesNo Answer']).value = 'Maybe'
+        removed_question_text = worksheet.cell(yes_no_rows[0], columns['YesNo Question']).value
+        worksheet.delete_rows(yes_no_rows[0])
+        added_row = worksheet.max_row + 1
+        worksheet.cell(added_row, columns['Question Type']).value = 'Yes - No'
+        worksheet.cell(added_row, columns['YesNo Question']).value = 'Is the bank reloaded?'
+        worksheet.cell(added_row, columns['YesNo Answer']).value = 'Yes'
+        workbook.save(self.data_path)
+        return removed_question_text
+
+    def test_apply_question_changes(self):
+        for engine_options, seed in itertools.product(
+            [dict(), dict(rng_backend='numpy'), dict(draw_mode='permutation')],
+            range(4)
+        ):
+            shutil.copyfile(_load_test_game_parameters()[2], self.data_path)
+            game_engine = GameEngine(logging_level_str='none', **engine_options)
+            n_questions = game_engine.set_game_parameters(*self.game_parameters)
+            game_engine.initialize_game(seed=seed)
+            asked_question_texts = [
+                question.get_question_text() for question in game_engine.get_next_questions(4)
+            ]
+            removed_question_text = self._edit_question_bank()
+            question_changes = game_engine.diff_question_bank()
+            self.assertEqual(
+                {name: question_changes[name].num_changes for name in question_changes},
+                {'Multiple Choice': 0, 'Yes - No': 3, 'Fill in the blanks': 0,
+                 'Open-ended / Custom': 0}
+            )
+
+            # The game goes on without the removed question, unless it is already asked
+            is_removed_question_asked = removed_question_text in asked_question_texts
+            n_patched_questions = game_engine.apply_question_changes(question_changes)
+            self.assertEqual(n_patched_questions, n_questions + is_removed_question_asked)
+            self.assertEqual(
+                game_engine.get_current_question().get_question_text(),
+                asked_question_texts[-1]
+            )
+            unasked_questions = game_engine.get_next_questions(n_patched_questions - 4)
+            self.assertTrue(all(question.is_question_valid() for question in unasked_questions))
+            self.assertFalse(game_engine.get_next_question().is_question_valid())
+            unasked_question_texts = [
+                question.get_question_text() for question in unasked_questions
+            ]
+            self.assertNotIn(removed_question_text, unasked_question_texts)
+            self.assertIn('Is the bank reloaded?', unasked_question_texts)
+
+            # The next game is the one of the edited question bank
+            game_engine.initialize_game(seed=seed)
+            patched_game = game_engine.get_next_questions(n_questions)
+            reloaded_game_engine = GameEngine(logging_level_str='none', **engine_options)
+            reloaded_game_engine.set_game_parameters(*self.game_parameters)
+            reloaded_game_engine.initialize_game(seed=seed)
+            self.assertEqual(
+                sorted(repr(question) for question in patched_game),
+                sorted(repr(question) for question in reloaded_game_engine.get_next_questions(9))
+            )
+            self.assertFalse(game_engine.get_next_question().is_question_valid())
+
+    @patch('trivia_game.game_engine._RNG_CHECKPOINT_INTERVAL', 4)
+    def test_seek_after_structural_changes(self):
+        """Seeking replays the questions asked before the patch, not draws of the new weights."""
+        def create_question_categories():
+            return [
+                QuestionCategoryData(
+                    name=name,
+                    df=DataFrame({
+                        'Question': [f"{name}{row}" for row in range(20)],
+                        'Answer': [f"{name}{row}" for row in range(20)],
+                    }),
+                    question_column_title='Question',
+                    answer_column_title='Answer',
+                    question_option_columns_list=[],
+                )
+                for name in ["x", "y", "z"]
+            ]
+
+        for engine_options, seed in itertools.product(
+            [dict(), dict(rng_backend='numpy')],
+            range(30)
+        ):
+            game_engine = GameEngine(logging_level_str='none', **engine_options)
+            game_engine.set_question_categories(create_question_categories())
+            game_engine.initialize_game(seed=seed)
+            asked_questions = [repr(question) for question in game_engine.get_next_questions(10)]
+            game_engine.apply_question_changes({"z": QuestionChanges(
+                modified_rows=[],
+                added_questions=[],
+                removed_rows=list(range(5, 20)),
+            )})
+            asked_questions += [repr(question) for question in game_engine.get_next_questions(5)]
+            game_engine.apply_question_changes({"x": QuestionChanges(
+                modified_rows=[],
+                added_questions=[(20, ("x20", "x20"))],
+                removed_rows=[],
+            )})
+            question = game_engine.get_next_question()
+            while question.is_question_valid():
+                asked_questions.append(repr(question))
+                question = game_engine.get_next_question()
+            self.assertNotIn(repr(TriviaQuestion()), asked_questions)
+            for question_number in range(len(asked_questions), 0, -1):
+                self.assertEqual(
+                    repr(game_engine.seek(question_number)),
+                    asked_questions[question_number - 1]
+                )
+            game_engine.seek(7)
+            self.assertEqual(
+                [repr(question) for question in
+                 game_engine.get_next_questions(len(asked_questions) - 7)],
+                asked_questions[7:]
+            )
+            # The draws are replayed from the history until the last patch
+            game_engine.seek(3)
+            self.assertEqual(
+                [repr(game_engine.get_next_question()) for _ in range(20)],
+                asked_questions[3:23]
+            )
+
+    def test_diff_question_categories_mismatch(self):
+        game_engine = GameEngine(logging_level_str='none')
+        with self.assertRaises(ValueError):
+            game_engine.diff_question_bank()
+        game_engine.set_game_parameters(*self.game_parameters)
+        with self.assertRaises(ValueError):
+            game_engine.diff_question_categories([])
+
+
+class TestQuestionSearch(unittest.TestCase):
+    """Test finding the questions by their words, and their numbers in the game."""
+    @patch('trivia_game.game_engine._RNG_CHECKPOINT_INTERVAL', 2)
+    def test_find_question_number(self):
+        for draw_mode in ['category', 'permutation']:
+            game_engine = GameEngine(logging_level_str='none', draw_mode=draw_mode)
+            game_engine.set_game_parameters(*_load_test_game_parameters(), build_search_index=True)
+            game_engine.initialize_game(seed=5)
+            expected_questions = [repr(question) for question in game_engine.get_next_questions(9)]
+            game_engine.seek(2)
+            question_numbers = []
+            for question_category_name in game_engine.get_question_category_names():
+                question_category = game_engine._ref_dict[question_category_name]
+                for row_position in range(question_category.num_questions):
+                    question_text = question_category.get_question_texts(row_position)[0]
+                    self.assertIn(
+                        (question_category_name, row_position),
+                        game_engine.search_questions(question_text, prefix=False, limit=9)
+                    )
+                    question_number = game_engine.find_question_number(
+                        question_category_name,
+                        row_position
+                    )
+                    question_numbers.append(question_number)
+                    self.assertEqual(
+                        repr(game_engine.get_current_question()),
+                        expected_questions[1]
+                    )
+                    found_question = game_engine.get_question(question_category_name, row_position)
+                    self.assertEqual(repr(found_question), expected_questions[question_number - 1])
+            self.assertEqual(sorted(question_numbers), list(range(1, 10)))
+            # The game goes on from the current question
+            self.assertEqual(
+                [repr(question) for question in game_engine.get_next_questions(7)],
+                expected_questions[2:]
+            )
+            with self.assertRaises(ValueError):
+                game_engine.find_question_number(question_category_name, 100)
+
+    def test_search_index_built_at_first_search(self):
+        game_engine = GameEngine(logging_level_str='none')
+        game_engine.set_game_parameters(*_load_test_game_parameters())
+        self.assertIsNone(game_engine._search_index)
+        self.assertEqual(game_engine.search_questions(""), [])
+        self.assertIsNotNone(game_engine._search_index)
+
+
+class TestDifficultyDrawMode(unittest.TestCase):
+    """Test drawing the questions of each round from the difficulty levels of the curve."""
+    def setUp(self):
+        self.temporary_directory = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.temporary_directory, "game_data.csv")
+        # 2 questions of each of the 3 difficulty levels in both categories
+        rows = [
+            (question_category, f"{question_category} {difficulty} {question_idx}", difficulty)
+            for question_category in ["Art", "Geography"]
+            for difficulty in ["1", "2", "3"]
+            for question_idx in range(2)
+        ]
+        with open(self.data_path, 'w', encoding='utf-8') as file:
+            file.write("Category,Question,Answer,Difficulty\n")
+            for question_category, question_text, difficulty in rows:
+                file.write(f"{question_category},{question_text},A,{difficulty}\n")
+        question_category_info = {'Question_column': 'Question',
+                                  'Answer_column': 'Answer',
+                                  'Question_option_columns': [],
+                                  'Difficulty_column': 'Difficulty'}
+        self.game_parameters = (
+            'Category',
+            {'Art': question_category_info, 'Geography': question_category_info},
+            self.data_path,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temporary_directory)
+
+    def _create_game_engine(self, **kwargs) -> GameEngine:
+        game_engine = GameEngine(logging_level_str='none', draw_mode='difficulty', **kwargs)
+        game_engine.set_game_parameters(*self.game_parameters)
+        return game_engine
+
+    @staticmethod
+    def _get_difficulties(questions) -> List[int]:
+        return [int(question.get_question_text().split()[1]) for question in questions]
+
+    @patch('trivia_game.game_engine._RNG_CHECKPOINT_INTERVAL', 2)
+    def test_rounds_follow_difficulty_curve(self):
+        game_engine = self._create_game_engine(questions_per_round=2)
+        self.assertEqual(game_engine.get_question_category_names(), [
+            'Art / 1', 'Geography / 1', 'Art / 2', 'Geography / 2', 'Art / 3', 'Geography / 3'
+        ])
+        for seed in range(20):
+            game_engine.initialize_game(seed=seed)
+            questions = [game_engine.get_next_question() for _ in range(13)]
+            # A round per level, then the last round is repeated until its level runs out and the
+            # questions left are drawn from the other levels
+            self.assertEqual(self._get_difficulties(questions[:8]), [1, 1, 2, 2, 3, 3, 3, 3])
+            self.assertEqual(sorted(self._get_difficulties(questions[8:12])), [1, 1, 2, 2])
+            self.assertEqual(len({repr(question) for question in questions[:12]}), 12)
+            self.assertEqual(
+                {question.get_question_category_text() for question in questions[:12]},
+                {'Art', 'Geography'}
+            )
+            self.assertFalse(questions[12].is_question_valid())
+
+            # Drawing at once and seeking replay the same draws
+            game_engine.initialize_game(seed=seed)
+            self.assertEqual(
+                [repr(question) for question in game_engine.get_next_questions(13)],
+                [repr(question) for question in questions]
+            )
+            self.assertEqual(repr(game_engine.seek(5)), repr(questions[4]))
+            self.assertEqual(repr(game_engine.get_next_question()), repr(questions[5]))
+            snapshot = game_engine.snapshot()
+            game_engine.restore(snapshot)
+            self.assertEqual(repr(game_engine.get_next_question()), repr(questions[6]))
+
+    def test_difficulty_curve_weights(self):
+        game_engine = self._create_game_engine(
+            difficulty_curve=[[1, 0, 0], [0, 1, 3]],
+            questions_per_round=1
+        )
+        level_counts = Counter()
+        for seed in range(200):
+            game_engine.initialize_game(seed=seed)
+            questions = game_engine.get_next_questions(3, weight_calculation_method='Equal')
+            self.assertEqual(self._get_difficulties(questions[:1]), [1])
+            level_counts.update(self._get_difficulties(questions[1:2]))
+        self.assertEqual(set(level_counts), {2, 3})
+        self.assertGreater(level_counts[3], level_counts[2])
+
+    def test_unsupported_options(self):
+        game_engine = self._create_game_engine()
+        game_engine.initialize_game(seed=1)
+        with self.assertRaises(ValueError):
+            game_engine.get_next_question(weights_override=[1, 0, 0, 0, 0, 0])
+        with self.assertRaises(ValueError):
+            self._create_game_engine(difficulty_curve=[[1, 0]])
+        with self.assertRaises(ValueError):
+            GameEngine(logging_level_str='none', draw_mode='difficulty', questions_per_round=0)
+        # A question bank without difficulties
+        game_engine = GameEngine(logging_level_str='none', draw_mode='difficulty')
+        with self.assertRaises(ValueError):
+            game_engine.set_game_parameters(*_load_test_game_parameters())
+
+
+def _load_test_game_parameters():
+    """Return the arguments of GameEngine.set_game_parameters() for the test game data."""
+    test_data_path = os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__))),
+        "data/test_game_data.xlsx"
+    )
+    game_metadata_path = os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__))),
+        "data/test_game_metadata.json"
+    )
+    question_category_column_name, game_metadata = parse_game_metadata_from_json(
+        game_metadata_path
+    )
+    return question_category_column_name, game_metadata, test_data_path
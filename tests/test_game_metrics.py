@@ -0,0 +1,80 @@
+import json
+import unittest
+from trivia_game.game_engine import GameEngine
+from trivia_game.game_metrics import GameMetrics, LatencyHistogram, format_metrics
+from tests.test_game_engine import _load_test_game_parameters
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_quantiles(self):
+        latency_histogram = LatencyHistogram()
+        for seconds in [2e-6] * 98 + [3e-3, 20.0]:
+            latency_histogram.observe(seconds)
+        self.assertEqual(latency_histogram.count, 100)
+        self.assertEqual(latency_histogram.get_quantile(0.5), 2.5e-6)
+        self.assertEqual(latency_histogram.get_quantile(0.99), 5e-3)
+        # Latencies above the largest bucket bound are bounded by the maximum
+        self.assertEqual(latency_histogram.get_quantile(1.0), 20.0)
+        self.assertEqual(LatencyHistogram().get_quantile(0.5), 0.0)
+
+
+class TestGameMetrics(unittest.TestCase):
+    """Test collecting the metrics of the game engine."""
+    def setUp(self):
+        self.metrics = GameMetrics()
+        self.game_engine = GameEngine(logging_level_str='none', metrics=self.metrics)
+        self.game_engine.set_game_parameters(*_load_test_game_parameters())
+
+    def test_stats(self):
+        self.game_engine.initialize_game(seed=2)
+        for _ in range(3):
+            self.game_engine.get_next_question()
+        self.game_engine.get_next_questions(4)
+        self.game_engine.seek(2)
+        stats = self.game_engine.stats()
+        self.assertEqual(stats['counters']['games'], 1)
+        self.assertEqual(stats['counters']['questions_drawn'], 7)
+        self.assertEqual(stats['counters']['questions_loaded'], 9)
+        self.assertEqual(stats['counters']['seek_replayed_draws'], 2)
+        self.assertEqual(stats['latencies']['draw']['count'], 3)
+        self.assertEqual(stats['latencies']['draw_batch']['count'], 1)
+        self.assertEqual(stats['latencies']['reset']['count'], 1)
+        self.assertEqual(stats['latencies']['seek']['count'], 1)
+        self.assertEqual(stats['latencies']['load']['count'], 1)
+        # At loading, reset and seek
+        self.assertEqual(stats['latencies']['weights']['count'], 3)
+        self.assertGreater(stats['latencies']['load']['sum_seconds'], 0)
+
+    def test_shared_metrics(self):
+        other_game_engine = GameEngine(logging_level_str='none', metrics=self.metrics)
+        other_game_engine.set_game_parameters(*_load_test_game_parameters())
+        for game_engine in [self.game_engine, other_game_engine]:
+            game_engine.initialize_game(seed=2)
+            game_engine.get_next_question()
+        self.assertEqual(self.game_engine.stats(), other_game_engine.stats())
+        self.assertEqual(self.game_engine.stats()['latencies']['draw']['count'], 2)
+
+    def test_without_metrics(self):
+        game_engine = GameEngine(logging_level_str='none')
+        game_engine.set_game_parameters(*_load_test_game_parameters())
+        game_engine.initialize_game(seed=2)
+        game_engine.get_next_question()
+        self.assertEqual(game_engine.stats(), {})
+        # The methods are not replaced by timed ones
+        self.assertNotIn('get_next_question', vars(game_engine))
+
+    def test_format_metrics(self):
+        self.game_engine.initialize_game(seed=2)
+        self.game_engine.get_next_question()
+        self.assertEqual(json.loads(format_metrics(self.metrics, "json")), self.metrics.to_dict())
+        prometheus_lines = format_metrics(self.metrics, "prometheus").splitlines()
+        self.assertIn("# TYPE trivia_game_questions_drawn_total counter", prometheus_lines)
+        self.assertIn("trivia_game_questions_drawn_total 1", prometheus_lines)
+        self.assertIn('trivia_game_draw_seconds_bucket{le="+Inf"} 1', prometheus_lines)
+        self.assertIn("trivia_game_draw_seconds_count 1", prometheus_lines)
+        with self.assertRaises(ValueError):
+            format_metrics(self.metrics, "xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
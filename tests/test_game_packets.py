@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import os
+import unittest
+from trivia_game.game_engine import GameEngine
+from trivia_game.game_packets import generate_game_packets, parse_seeds
+from trivia_game.user_game_interface import parse_game_metadata_from_json
+
+
+class TestGamePackets(unittest.TestCase):
+    """Test generating the packets of the games of many seeds."""
+    def setUp(self):
+        test_data_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "data")
+        self.data_path = os.path.join(test_data_dir, "test_game_data.xlsx")
+        self.question_category_column_name, self.game_metadata = parse_game_metadata_from_json(
+            os.path.join(test_data_dir, "test_game_metadata.json")
+        )
+
+    def _generate_game_packets(self, seeds, packet_format, n_workers):
+        output_file = io.StringIO()
+        generate_game_packets(
+            seeds,
+            question_category_column_name=self.question_category_column_name,
+            data_info=self.game_metadata,
+            data_path=self.data_path,
+            output_file=output_file,
+            packet_format=packet_format,
+            n_workers=n_workers,
+            cache_mode="off",
+            chunk_size=2,
+        )
+        return output_file.getvalue()
+
+    def _play_game(self, seed):
+        game_engine = GameEngine(logging_level_str='none')
+        game_engine.set_game_parameters(
+            self.question_category_column_name,
+            self.game_metadata,
+            self.data_path
+        )
+        game_engine.initialize_game(seed=seed)
+        return [game_engine.get_next_question() for _ in range(9)]
+
+    def test_csv_packets(self):
+        rows = list(csv.DictReader(io.StringIO(self._generate_game_packets([3, 1], "csv", 1))))
+        self.assertEqual(len(rows), 18)
+        self.assertEqual([row['seed'] for row in rows], ['3'] * 9 + ['1'] * 9)
+        for row, question in zip(rows, self._play_game(3) + self._play_game(1)):
+            self.assertEqual(row['question'], question.get_question_text())
+            self.assertEqual(row['answer'], question.get_answer_text())
+            self.assertEqual(row['category'], question.get_question_category_text())
+            options = [row[f'option_{option_idx}'] for option_idx in range(1, 6)]
+            self.assertEqual(options[:len(question.get_question_options())],
+                             question.get_question_options())
+
+    def test_workers_give_same_packets(self):
+        seeds = list(range(7))
+        for packet_format in ["csv", "jsonl"]:
+            self.assertEqual(
+                self._generate_game_packets(seeds, packet_format, 2),
+                self._generate_game_packets(seeds, packet_format, 1)
+            )
+
+    def test_jsonl_packets(self):
+        packets = [
+            json.loads(line)
+            for line in self._generate_game_packets([5], "jsonl", 1).splitlines()
+        ]
+        self.assertEqual(len(packets), 1)
+        self.assertEqual(packets[0]['seed'], 5)
+        self.assertEqual(
+            [question['question'] for question in packets[0]['questions']],
+            [question.get_question_text() for question in self._play_game(5)]
+        )
+
+    def test_parse_seeds(self):
+        self.assertEqual(parse_seeds("1-3, 7,-2--1"), [1, 2, 3, 7, -2, -1])
+        for seeds_str in ["", "1-", "5-1", "a"]:
+            with self.assertRaises(ValueError):
+                parse_seeds(seeds_str)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import random
+import unittest
+from array import array
+from trivia_game.game_random import (
+    NumpyRandomGenerator,
+    PythonRandomGenerator,
+    create_random_generator,
+    generate_random_permutation,
+)
+
+
+class TestGameRandom(unittest.TestCase):
+    """Test the random number generators of the games."""
+    def test_python_backend_matches_random_module(self):
+        rng = PythonRandomGenerator(10)
+        random.seed(10)
+        positions = list(range(20))
+        expected_positions = list(range(20))
+        rng.shuffle(positions)
+        random.shuffle(expected_positions)
+        self.assertEqual(positions, expected_positions)
+        self.assertEqual([rng.random() for _ in range(5)], [random.random() for _ in range(5)])
+
+    def test_compact_state(self):
+        for rng in [PythonRandomGenerator(3), NumpyRandomGenerator(3)]:
+            # Cover the states before, inside and at the end of the NumPy draw buffer
+            for n_draws in [0, 1, 255, 256, 300]:
+                rng.seed(3)
+                for _ in range(n_draws):
+                    rng.random()
+                state = rng.get_compact_state()
+                expected_values = [rng.random() for _ in range(300)]
+                rng.set_compact_state(state)
+                self.assertEqual([rng.random() for _ in range(300)], expected_values)
+
+    def test_random_batch(self):
+        for rng, other_rng in [
+            (PythonRandomGenerator(6), PythonRandomGenerator(6)),
+            (NumpyRandomGenerator(6), NumpyRandomGenerator(6)),
+        ]:
+            values = rng.random_batch(3) + rng.random_batch(400) + [rng.random()]
+            self.assertEqual(values, [other_rng.random() for _ in range(404)])
+            self.assertEqual(rng.get_compact_state(), other_rng.get_compact_state())
+
+    def test_numpy_backend_is_deterministic(self):
+        rng = NumpyRandomGenerator(-4)
+        other_rng = NumpyRandomGenerator(-4)
+        positions = list(range(100))
+        other_positions = list(range(100))
+        rng.shuffle(positions)
+        other_rng.shuffle(other_positions)
+        self.assertEqual(positions, other_positions)
+        self.assertEqual(sorted(positions), list(range(100)))
+        self.assertEqual(
+            rng.choices(['a', 'b', 'c'], weights=[1, 0, 2], k=10),
+            other_rng.choices(['a', 'b', 'c'], weights=[1, 0, 2], k=10)
+        )
+        self.assertNotIn('b', rng.choices(['a', 'b', 'c'], weights=[1, 0, 2], k=100))
+
+    def test_generate_random_permutation(self):
+        for n in list(range(40)) + [255, 256, 257, 1000, 4097]:
+            for rng, other_rng in [
+                (random.Random(n), random.Random(n)),
+                (PythonRandomGenerator(n), PythonRandomGenerator(n)),
+            ]:
+                positions = list(range(n))
+                other_rng.shuffle(positions)
+                self.assertEqual(generate_random_permutation(n, rng), positions)
+                self.assertEqual(rng.random(), other_rng.random())
+
+    def test_fill_permutation(self):
+        for rng in [PythonRandomGenerator(2), NumpyRandomGenerator(2)]:
+            order = array('I', [0] * 50)
+            rng.fill_permutation(order)
+            self.assertEqual(sorted(order), list(range(50)))
+        rng = PythonRandomGenerator(2)
+        rng.fill_permutation(order)
+        self.assertEqual(list(order), generate_random_permutation(50, PythonRandomGenerator(2)))
+
+    def test_deferred_permutation(self):
+        self.assertIsNone(PythonRandomGenerator(1).create_deferred_permutation(0))
+        rng = NumpyRandomGenerator(1)
+        deferred_permutations = [rng.create_deferred_permutation(idx) for idx in range(2)]
+        # The permutations do not depend on the later use of the generator
+        rng.seed(2)
+        rng.random_batch(10)
+        orders = [array('I', [0] * 30) for _ in range(3)]
+        for order, deferred_permutation in zip(orders, deferred_permutations * 2):
+            deferred_permutation(order)
+        self.assertEqual(sorted(orders[0]), list(range(30)))
+        self.assertNotEqual(orders[0], orders[1])
+        self.assertEqual(orders[2], orders[0])
+        NumpyRandomGenerator(1).create_deferred_permutation(0)(order)
+        self.assertEqual(order, orders[0])
+
+    def test_create_random_generator(self):
+        self.assertIsInstance(create_random_generator("python"), PythonRandomGenerator)
+        self.assertIsInstance(create_random_generator("numpy"), NumpyRandomGenerator)
+        with self.assertRaises(ValueError):
+            create_random_generator("xorshift")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import os
+import unittest
+from http import HTTPStatus
+from unittest.mock import patch
+from trivia_game.data_processing import DataLoader
+from trivia_game.game_engine import GameEngine
+from trivia_game.game_metrics import GameMetrics
+from trivia_game.game_server import GameServer, GameSessionError, GameSessionManager
+from trivia_game.user_game_interface import parse_game_metadata_from_json
+
+
+def _load_test_question_categories():
+    test_data_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "data")
+    question_category_column_name, game_metadata = parse_game_metadata_from_json(
+        os.path.join(test_data_dir, "test_game_metadata.json")
+    )
+    data_loader = DataLoader(
+        question_category_column_name=question_category_column_name,
+        data_info=game_metadata,
+        logging_level_str='none'
+    )
+    return data_loader.load_data(os.path.join(test_data_dir, "test_game_data.xlsx"))
+
+
+class TestGameSessionManager(unittest.TestCase):
+    def setUp(self):
+        self.question_categories = _load_test_question_categories()
+        self.session_manager = GameSessionManager(self.question_categories, max_sessions=3)
+
+    def test_sessions_play_same_game_as_game_engine(self):
+        # The sessions shuffle the questions lazily by default
+        self.assertEqual(self.session_manager.rng_backend, "numpy")
+        game_engine = GameEngine(logging_level_str='none', rng_backend="numpy")
+        game_engine.set_question_categories(self.question_categories)
+        game_engine.initialize_game(seed=7)
+        expected_questions = [game_engine.get_next_question().get_question_text() for _ in range(9)]
+
+        session_1 = self.session_manager.create_session(seed=7)
+        session_2 = self.session_manager.create_session(seed=7)
+        session_1.next_question()
+        # Interleaved sessions must not affect each other
+        questions_1 = [session_1.to_dict()['question']]
+        questions_2 = []
+        for _ in range(8):
+            questions_2.append(session_2.next_question()['question'])
+            questions_1.append(session_1.next_question()['question'])
+        questions_2.append(session_2.next_question()['question'])
+        self.assertEqual(questions_1, expected_questions)
+        self.assertEqual(questions_2, expected_questions)
+        self.assertTrue(session_1.next_question()['is_game_over'])
+
+    def test_go_to_question(self):
+        session = self.session_manager.create_session(seed=3)
+        answers = []
+        for _ in range(9):
+            session.next_question()
+            answers.append(session.show_answer()['answer'])
+        self.assertEqual(session.go_to_question(4)['question_number'], 4)
+        self.assertEqual(session.show_answer()['answer'], answers[3])
+        self.assertTrue(session.go_to_question(10)['is_game_over'])
+
+    def test_session_limits(self):
+        sessions = [self.session_manager.create_session(seed=1) for _ in range(3)]
+        with self.assertRaises(GameSessionError):
+            self.session_manager.create_session(seed=1)
+        self.session_manager.remove_session(sessions[0].session_id)
+        with self.assertRaises(GameSessionError):
+            self.session_manager.get_session(sessions[0].session_id)
+        self.assertEqual(self.session_manager.remove_idle_sessions(max_idle_seconds=-1.0), 2)
+        self.assertEqual(len(self.session_manager), 0)
+
+    def test_metrics(self):
+        game_server = GameServer(self.session_manager)
+        with self.assertRaises(GameSessionError):
+            game_server.handle_request('GET', '/metrics', {})
+        self.session_manager.metrics = GameMetrics()
+        session = self.session_manager.create_session(seed=1)
+        session.next_question()
+        session.go_to_question(1)
+        status, stats = game_server.handle_request('GET', '/metrics', {})
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(stats['counters']['questions_drawn'], 1)
+        self.assertEqual(stats['latencies']['seek']['count'], 1)
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        session_manager = GameSessionManager(_load_test_question_categories(), max_sessions=10)
+        self.game_server = GameServer(session_manager)
+        self.port = await self.game_server.start("127.0.0.1", 0)
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.game_server.close()
+
+    async def _request(self, method, path, body=None):
+        body_bytes = json.dumps(body).encode() if body is not None else b''
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body_bytes)}\r\n\r\n"
+            .encode() + body_bytes
+        )
+        status_line = await self.reader.readline()
+        headers = dict()
+        while (line := await self.reader.readline()) not in [b'\r\n', b'']:
+            name, _, value = line.decode().partition(':')
+            headers[name.lower()] = value.strip()
+        response = await self.reader.readexactly(int(headers['content-length']))
+        return int(status_line.split()[1]), json.loads(response)
+
+    async def test_session_roundtrip(self):
+        status, session = await self._request("POST", "/sessions", {"seed": 5})
+        self.assertEqual(status, HTTPStatus.CREATED)
+        session_path = f"/sessions/{session['session_id']}"
+        status, question = await self._request("POST", session_path + "/next")
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(question['question_number'], 1)
+        status, answer = await self._request("GET", session_path + "/answer")
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertNotEqual(answer['answer'], '')
+        status, _ = await self._request("POST", session_path + "/goto", {"question_number": 3})
+        self.assertEqual(status, HTTPStatus.OK)
+        status, _ = await self._request("POST", session_path + "/goto", {"question_number": "3"})
+        self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+        status, _ = await self._request("GET", session_path + "/next")
+        self.assertEqual(status, HTTPStatus.METHOD_NOT_ALLOWED)
+        status, _ = await self._request("DELETE", session_path)
+        self.assertEqual(status, HTTPStatus.OK)
+        status, _ = await self._request("POST", session_path + "/next")
+        self.assertEqual(status, HTTPStatus.NOT_FOUND)
+
+    async def test_invalid_content_length(self):
+        for content_length in ["ten", "-1"]:
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            writer.write(
+                f"POST /sessions HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n".encode()
+            )
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            self.assertTrue(response.startswith(b"HTTP/1.1 400"))
+            self.assertIn(b"Connection: close", response)
+
+    async def test_unexpected_error(self):
+        with patch.object(
+            self.game_server.session_manager,
+            'create_session',
+            side_effect=RuntimeError("unexpected")
+        ):
+            status, response = await self._request("POST", "/sessions", {"seed": 5})
+        self.assertEqual(status, HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertNotIn("unexpected", response['error'])
+        # The connection is kept alive
+        status, _ = await self._request("POST", "/sessions", {"seed": 5})
+        self.assertEqual(status, HTTPStatus.CREATED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from trivia_game.game_simulation import simulate_games
+
+QUESTION_CATEGORY_SIZES = {"Large": 30, "Small": 3, "Medium": 10}
+
+
+class TestGameSimulation(unittest.TestCase):
+    """Test the Monte Carlo simulation of the question categories of many games."""
+    def test_distributions(self):
+        statistics = simulate_games(QUESTION_CATEGORY_SIZES, n_games=500, n_questions_per_game=8)
+        self.assertEqual(statistics["question_categories"], ["Large", "Small", "Medium"])
+        self.assertEqual(len(statistics["category_distribution_by_position"]), 8)
+        for category_distribution, invalid_question_rate in zip(
+            statistics["category_distribution_by_position"],
+            statistics["invalid_question_rate_by_position"]
+        ):
+            self.assertAlmostEqual(sum(category_distribution) + invalid_question_rate, 1)
+            self.assertEqual(invalid_question_rate, 0)
+        self.assertAlmostEqual(sum(statistics["mean_questions_per_game"].values()), 8)
+        # The first question is drawn in proportion to the sizes of the categories
+        self.assertGreater(statistics["category_distribution_by_position"][0][0], 0.6)
+
+    def test_run_out_of_questions(self):
+        statistics = simulate_games(
+            QUESTION_CATEGORY_SIZES,
+            n_games=50,
+            n_questions_per_game=45,
+            weight_calculation_method="Equal",
+        )
+        self.assertEqual(statistics["invalid_question_rate_by_position"][43:], [1.0, 1.0])
+        self.assertEqual(statistics["invalid_question_rate_by_position"][42], 0.0)
+        self.assertEqual(list(statistics["category_run_out_rate"].values()), [1.0, 1.0, 1.0])
+        self.assertEqual(statistics["mean_questions_per_game"], QUESTION_CATEGORY_SIZES)
+
+    def test_weights_override(self):
+        statistics = simulate_games(
+            QUESTION_CATEGORY_SIZES,
+            n_games=20,
+            n_questions_per_game=5,
+            weights_override=[0, 1, 0],
+        )
+        self.assertEqual(statistics["mean_questions_per_game"]["Small"], 3)
+        self.assertEqual(statistics["invalid_question_rate_by_position"], [0, 0, 0, 1, 1])
+        self.assertEqual(statistics["category_run_out_rate"]["Small"], 1)
+
+    def test_same_seeds_same_statistics(self):
+        statistics = [
+            simulate_games(
+                QUESTION_CATEGORY_SIZES,
+                n_games=30,
+                n_questions_per_game=12,
+                first_seed=5,
+                n_workers=n_workers,
+                chunk_size=chunk_size,
+            )
+            for n_workers, chunk_size in [(1, 10000), (1, 7), (2, 4)]
+        ]
+        for other_statistics in statistics[1:]:
+            for key in ["category_distribution_by_position", "category_run_out_rate",
+                        "mean_questions_per_game"]:
+                self.assertEqual(other_statistics[key], statistics[0][key])
+
+    def test_no_games(self):
+        with self.assertRaises(ValueError):
+            simulate_games(QUESTION_CATEGORY_SIZES, n_games=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from array import array
+from unittest.mock import patch
+from trivia_game.data_processing import QuestionChanges
+from trivia_game.game_engine import GameEngine
+from trivia_game.game_snapshot import (
+    SNAPSHOT_FORMAT_VERSION,
+    GameSnapshotFile,
+    decode_value,
+    encode_value,
+)
+from tests.test_game_engine import _load_test_game_parameters
+
+
+class TestGameEngineSnapshot(unittest.TestCase):
+    """Test resuming the games from their snapshots."""
+    def _create_game_engine(self, **engine_options):
+        game_engine = GameEngine(logging_level_str='none', **engine_options)
+        game_engine.set_game_parameters(*_load_test_game_parameters())
+        return game_engine
+
+    @patch('trivia_game.game_engine._RNG_CHECKPOINT_INTERVAL', 2)
+    def test_restore(self):
+        for engine_options in [
+            dict(),
+            dict(rng_backend='numpy'),
+            dict(draw_mode='permutation'),
+        ]:
+            game_engine = self._create_game_engine(**engine_options)
+            game_engine.initialize_game(seed=9)
+            expected_questions = [repr(game_engine.get_next_question()) for _ in range(9)]
+            game_engine.seek(5)
+            # The snapshot is restored from its JSON text by another engine
+            snapshot = json.loads(json.dumps(game_engine.snapshot()))
+
+            restored_game_engine = self._create_game_engine(**engine_options)
+            restored_game_engine.restore(snapshot)
+            self.assertEqual(
+                repr(restored_game_engine.get_current_question()),
+                expected_questions[4]
+            )
+            self.assertEqual(
+                [repr(restored_game_engine.get_next_question()) for _ in range(4)],
+                expected_questions[5:]
+            )
+            self.assertFalse(restored_game_engine.get_next_question().is_question_valid())
+            self.assertEqual(repr(restored_game_engine.seek(2)), expected_questions[1])
+            self.assertEqual(repr(restored_game_engine.get_next_question()), expected_questions[2])
+
+    def test_restore_at_game_over(self):
+        game_engine = self._create_game_engine()
+        game_engine.initialize_game(seed=2)
+        game_engine.seek(10)
+        restored_game_engine = self._create_game_engine()
+        restored_game_engine.restore(game_engine.snapshot())
+        self.assertFalse(restored_game_engine.get_current_question().is_question_valid())
+        self.assertFalse(restored_game_engine.get_next_question().is_question_valid())
+
+    def test_restore_mismatch(self):
+        game_engine = self._create_game_engine()
+        with self.assertRaises(ValueError):
+            game_engine.snapshot()
+        game_engine.initialize_game(seed=2)
+        snapshot = game_engine.snapshot()
+        with self.assertRaises(ValueError):
+            self._create_game_engine(rng_backend='numpy').restore(snapshot)
+        snapshot["question_category_sizes"]["Multiple Choice"] += 1
+        with self.assertRaises(ValueError):
+            self._create_game_engine().restore(snapshot)
+
+    def test_restore_other_question_bank(self):
+        game_engine = self._create_game_engine()
+        game_engine.initialize_game(seed=2)
+        game_engine.get_next_questions(3)
+        snapshot = game_engine.snapshot()
+        # A question bank of the same shape, but with an edited question
+        other_game_engine = self._create_game_engine()
+        question = other_game_engine.get_question("Multiple Choice", 0)
+        other_game_engine.apply_question_changes({"Multiple Choice": QuestionChanges(
+            modified_rows=[(0, (
+                "Edited question",
+                question.get_answer_text(),
+                *question.get_question_options()
+            ))],
+            added_questions=[],
+            removed_rows=[],
+        )})
+        with self.assertRaises(ValueError):
+            other_game_engine.restore(snapshot)
+        self._create_game_engine().restore(snapshot)
+
+    def test_restore_after_structural_changes(self):
+        game_engine = self._create_game_engine()
+        game_engine.initialize_game(seed=4)
+        game_engine.get_next_questions(3)
+        question = game_engine.get_question("Yes - No", 0)
+        game_engine.apply_question_changes({"Yes - No": QuestionChanges(
+            modified_rows=[],
+            added_questions=[(100, ("Added question", question.get_answer_text()))],
+            removed_rows=[],
+        )})
+        snapshot = game_engine.snapshot()
+        self.assertEqual(snapshot["num_structural_patches"], 1)
+        self.assertIsNone(snapshot["question_bank_hash"])
+        with self.assertRaises(ValueError):
+            self._create_game_engine().restore(snapshot)
+        # A new game can be restored again
+        game_engine.initialize_game(seed=4)
+        self.assertEqual(game_engine.snapshot()["num_structural_patches"], 0)
+
+
+class TestGameSnapshotFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.snapshot_file = GameSnapshotFile(os.path.join(self.temp_dir, "questions.xlsx"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_load_delete(self):
+        self.assertIsNone(self.snapshot_file.load())
+        snapshot = {"version": SNAPSHOT_FORMAT_VERSION, "seed": 3}
+        self.snapshot_file.save(snapshot)
+        self.assertEqual(self.snapshot_file.load(), snapshot)
+        self.assertEqual(os.listdir(self.temp_dir), ["questions.xlsx.tgsave"])
+        self.snapshot_file.delete()
+        self.assertIsNone(self.snapshot_file.load())
+        self.snapshot_file.delete()
+
+    def test_invalid_snapshot(self):
+        with open(self.snapshot_file.snapshot_path, 'w', encoding='utf-8') as file:
+            file.write('{"version": 1, "se')
+        self.assertIsNone(self.snapshot_file.load())
+        self.snapshot_file.save({"version": 0})
+        self.assertIsNone(self.snapshot_file.load())
+
+    def test_encode_value(self):
+        value = (3, array('I', [1, 2, 1 << 31]), {"state": [array('i', [-1]), None]})
+        encoded_value = json.loads(json.dumps(encode_value(value)))
+        self.assertEqual(
+            decode_value(encoded_value),
+            [3, array('I', [1, 2, 1 << 31]), {"state": [array('i', [-1]), None]}]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from trivia_game.data_processing import DataLoader, build_question_search_index
+from trivia_game.user_game_interface import parse_game_metadata_from_json
+
+
+class TestQuestionBankCache(unittest.TestCase):
+    """Test loading the question bank through the compiled cache."""
+    def setUp(self):
+        test_data_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "data")
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.temp_dir, "test_game_data.xlsx")
+        shutil.copyfile(os.path.join(test_data_dir, "test_game_data.xlsx"), self.data_path)
+        self.cache_path = self.data_path + ".tgcache"
+        self.question_category_column_name, self.game_metadata = parse_game_metadata_from_json(
+            os.path.join(test_data_dir, "test_game_metadata.json")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _load_data(self, cache_mode, game_metadata=None):
+        data_loader = DataLoader(
+            question_category_column_name=self.question_category_column_name,
+            data_info=game_metadata or self.game_metadata,
+            logging_level_str='none'
+        )
+        return data_loader.load_data(self.data_path, cache_mode=cache_mode)
+
+    def test_cache_is_used(self):
+        parsed_categories = self._load_data("use")
+        self.assertTrue(os.path.exists(self.cache_path))
+        with patch.object(DataLoader, 'parse_data') as mock_parse_data:
+            cached_categories = self._load_data("use")
+            mock_parse_data.assert_not_called()
+        self.assertEqual(
+            [category.name for category in cached_categories],
+            [category.name for category in parsed_categories]
+        )
+        for cached_category, parsed_category in zip(cached_categories, parsed_categories):
+            self.assertTrue(cached_category.df.equals(parsed_category.df))
+            # The digests of the questions are cached too
+            self.assertEqual(
+                cached_category._questions_digest,
+                parsed_category.get_questions_digest()
+            )
+
+    def test_search_index_is_cached(self):
+        data_loader = DataLoader(
+            question_category_column_name=self.question_category_column_name,
+            data_info=self.game_metadata,
+            logging_level_str='none'
+        )
+        data_loader.load_data(self.data_path, cache_mode="use")
+        self.assertIsNone(data_loader.search_index)
+        # The cache created without the search index is re-written with it
+        with patch('trivia_game.data_processing.build_question_search_index',
+                   wraps=build_question_search_index) as mock_build:
+            data_loader.load_data(self.data_path, cache_mode="use", build_search_index=True)
+            data_loader.load_data(self.data_path, cache_mode="use", build_search_index=True)
+            mock_build.assert_called_once()
+        self.assertEqual(data_loader.search_index.num_questions, 9)
+
+    def test_cache_is_rebuilt_when_data_changes(self):
+        self._load_data("use")
+        with open(self.data_path, 'ab') as file:
+            file.write(b'\0')
+        with patch.object(DataLoader, 'parse_data', return_value=[]) as mock_parse:
+            self._load_data("use")
+            mock_parse.assert_called_once()
+
+    def test_cache_is_used_when_only_modification_time_changes(self):
+        self._load_data("use")
+        os.utime(self.data_path, ns=(0, 0))
+        with patch.object(DataLoader, 'parse_data') as mock_parse_data:
+            self._load_data("use")
+            mock_parse_data.assert_not_called()
+
+    def test_cache_is_rebuilt_when_metadata_changes(self):
+        self._load_data("use")
+        game_metadata = dict(list(self.game_metadata.items())[:2])
+        with patch.object(DataLoader, 'parse_data', return_value=[]) as mock_parse:
+            self._load_data("use", game_metadata)
+            mock_parse.assert_called_once()
+
+    def test_cache_modes(self):
+        self._load_data("off")
+        self.assertFalse(os.path.exists(self.cache_path))
+        self._load_data("rebuild")
+        self.assertTrue(os.path.exists(self.cache_path))
+        with patch.object(DataLoader, 'parse_data', return_value=[]) as mock_parse:
+            self._load_data("rebuild")
+            mock_parse.assert_called_once()
+        with self.assertRaises(ValueError):
+            self._load_data("always")
+
+
+if __name__ == '__main__':
+    unittest.main()
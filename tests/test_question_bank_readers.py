@@ -0,0 +1,108 @@
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from openpyxl.cell.cell import ERROR_CODES
+from trivia_game.data_processing import DataLoader
+from trivia_game.game_options import QUESTION_BANK_FORMATS
+from trivia_game.question_bank_readers import (
+    QUESTION_BANK_READERS,
+    convert_cell_value,
+    get_question_bank_format,
+    iter_csv_rows,
+    iter_jsonl_rows,
+)
+from trivia_game.user_game_interface import parse_game_metadata_from_json
+
+_HAS_PARQUET_ENGINE = any(
+    importlib.util.find_spec(engine) is not None for engine in ["pyarrow", "fastparquet"]
+)
+
+
+class TestQuestionBankReaders(unittest.TestCase):
+    """Test that every question bank format gives the same question categories."""
+    def setUp(self):
+        test_data_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "data")
+        self.excel_path = os.path.join(test_data_dir, "test_game_data.xlsx")
+        question_category_column_name, game_metadata = parse_game_metadata_from_json(
+            os.path.join(test_data_dir, "test_game_metadata.json")
+        )
+        self.data_loader = DataLoader(
+            question_category_column_name=question_category_column_name,
+            data_info=game_metadata,
+            logging_level_str='none'
+        )
+        self.temp_dir = tempfile.mkdtemp()
+        # Export the Excel file to the other formats
+        self.df = pd.read_excel(self.excel_path, dtype=str).fillna("")
+        self.expected_categories = self.data_loader.parse_data(self.excel_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _assert_same_question_categories(self, database_path):
+        question_categories = self.data_loader.parse_data(database_path)
+        self.assertEqual(len(question_categories), len(self.expected_categories))
+        for question_category, expected_category in zip(
+            question_categories,
+            self.expected_categories
+        ):
+            self.assertEqual(question_category.name, expected_category.name)
+            self.assertTrue(question_category.df.equals(expected_category.df))
+
+    def test_csv(self):
+        csv_path = os.path.join(self.temp_dir, "questions.csv")
+        self.df.to_csv(csv_path, index=False)
+        self._assert_same_question_categories(csv_path)
+
+    def test_jsonl(self):
+        jsonl_path = os.path.join(self.temp_dir, "questions.jsonl")
+        self.df.to_json(jsonl_path, orient="records", lines=True, force_ascii=False)
+        self._assert_same_question_categories(jsonl_path)
+
+    @unittest.skipUnless(_HAS_PARQUET_ENGINE, "pyarrow or fastparquet is not installed")
+    def test_parquet(self):
+        parquet_path = os.path.join(self.temp_dir, "questions.parquet")
+        self.df.to_parquet(parquet_path, index=False)
+        self._assert_same_question_categories(parquet_path)
+
+    def test_missing_columns(self):
+        csv_path = os.path.join(self.temp_dir, "questions.csv")
+        jsonl_path = os.path.join(self.temp_dir, "questions.jsonl")
+        with open(csv_path, 'w', encoding='utf-8') as file:
+            file.write("Category,Question\nC1,Q1\n")
+        with open(jsonl_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({"Category": "C1", "Question": "Q1"}) + "\n")
+        with self.assertRaises(KeyError):
+            list(iter_csv_rows(csv_path, ["Category", "Answer"]))
+        with self.assertRaises(KeyError):
+            list(iter_jsonl_rows(jsonl_path, ["Category", "Answer"]))
+
+    def test_get_question_bank_format(self):
+        self.assertEqual(get_question_bank_format("questions.XLSX"), "excel")
+        self.assertEqual(get_question_bank_format("questions.jsonl"), "jsonl")
+        self.assertEqual(get_question_bank_format("questions.txt", "csv"), "csv")
+        with self.assertRaises(ValueError):
+            get_question_bank_format("questions.txt")
+        with self.assertRaises(ValueError):
+            get_question_bank_format("questions.csv", "xml")
+        self.assertEqual(list(QUESTION_BANK_READERS), QUESTION_BANK_FORMATS)
+
+    def test_convert_cell_value(self):
+        self.assertEqual(convert_cell_value(None), "")
+        self.assertEqual(convert_cell_value(float("nan")), "")
+        self.assertEqual(convert_cell_value("N/A"), "")
+        for error_code in ERROR_CODES:
+            self.assertEqual(convert_cell_value(error_code), "")
+        self.assertEqual(convert_cell_value(" text "), " text ")
+        self.assertEqual(convert_cell_value(3.0), "3")
+        self.assertEqual(convert_cell_value(3.25), "3.25")
+        self.assertEqual(convert_cell_value(7), "7")
+        self.assertEqual(convert_cell_value(False), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+from trivia_game.question_bank_watcher import QuestionBankWatcher, get_file_signature
+
+
+class TestQuestionBankWatcher(unittest.TestCase):
+    """Test the checks of the question bank file, which are run once the file events settle."""
+    def setUp(self):
+        self.temporary_directory = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.temporary_directory, "game_data.csv")
+        self._write_question_bank("Question Type\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temporary_directory)
+
+    def _write_question_bank(self, text: str):
+        with open(self.data_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    def test_get_file_signature(self):
+        file_signature = get_file_signature(self.data_path)
+        self.assertEqual(file_signature[1], len("Question Type\n"))
+        self.assertIsNone(get_file_signature(self.data_path + ".missing"))
+
+    def test_changed_only_if_file_changed(self):
+        watcher = QuestionBankWatcher(self.data_path)
+        n_changes = []
+        watcher.changed.connect(lambda: n_changes.append(1))
+        # e.g. the events of the other files of the directory
+        watcher._check_file_signature()
+        self.assertEqual(len(n_changes), 0)
+        # The file is replaced by a new one
+        replacing_path = self.data_path + ".tmp"
+        with open(replacing_path, 'w', encoding='utf-8') as file:
+            file.write("Question Type,Question\n")
+        os.replace(replacing_path, self.data_path)
+        watcher._check_file_signature()
+        self.assertEqual(len(n_changes), 1)
+        self.assertIn(self.data_path, watcher._file_system_watcher.files())
+        # A missing file is not reloaded until it is written again
+        os.remove(self.data_path)
+        watcher._check_file_signature()
+        self.assertEqual(len(n_changes), 1)
+        self._write_question_bank("Question Type,Question,Answer\n")
+        watcher._check_file_signature()
+        self.assertEqual(len(n_changes), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
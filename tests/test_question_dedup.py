@@ -0,0 +1,65 @@
+import random
+import unittest
+from trivia_game.question_dedup import find_duplicate_questions, normalize_question_text
+
+
+class TestQuestionDedup(unittest.TestCase):
+    """Test finding the duplicate and the near-duplicate questions."""
+    def test_normalize_question_text(self):
+        self.assertEqual(
+            normalize_question_text("What's the capital of  FRANCE?!"),
+            ["s", "capital", "france"]
+        )
+
+    def test_find_duplicate_questions(self):
+        questions = [
+            ("Who painted the Mona Lisa?", "Leonardo da Vinci"),
+            ("Who painted Mona Lisa", "Leonardo da Vinci"),
+            ("What is the capital of France?", "Paris"),
+            ("What is the capital of Spain?", "Madrid"),
+            ("Is 5 greater than 3?", "Yes"),
+            ("Is 3 greater than 5?", "No"),
+            ("", ""),
+            ("Paris", "France"),
+            ("paris!", "France"),
+            ("WHO PAINTED THE MONA LISA", "Leonardo da Vinci"),
+            ("", ""),
+        ]
+        question_texts, answer_texts = zip(*questions)
+        self.assertEqual(
+            find_duplicate_questions(question_texts, answer_texts),
+            [[0, 1, 9], [7, 8]]
+        )
+        # The same question with another answer is not a duplicate
+        self.assertEqual(find_duplicate_questions(["Paris?", "Paris?"], ["France", "Texas"]), [])
+        self.assertEqual(find_duplicate_questions([], []), [])
+
+    def test_similarity_threshold(self):
+        question_texts = [
+            "Which planet is known as the red planet in our solar system",
+            "Which planet is known as the red planet in the solar system",
+        ]
+        answer_texts = ["Mars", "Mars"]
+        self.assertEqual(find_duplicate_questions(question_texts, answer_texts), [[0, 1]])
+        self.assertEqual(
+            find_duplicate_questions(question_texts, answer_texts, similarity_threshold=1.0),
+            []
+        )
+
+    def test_find_duplicate_questions_among_many(self):
+        rng = random.Random(0)
+        words = [f"word{word_idx}" for word_idx in range(5000)]
+        question_texts = [" ".join(rng.choices(words, k=8)) for _ in range(2000)]
+        answer_texts = [rng.choice(words) for _ in range(2000)]
+        # Copies of some questions, with the first word changed
+        for question_idx in range(0, 100, 10):
+            question_texts.append("changed " + question_texts[question_idx].split(" ", 1)[1])
+            answer_texts.append(answer_texts[question_idx])
+        self.assertEqual(
+            find_duplicate_questions(question_texts, answer_texts),
+            [[question_idx, 2000 + question_idx // 10] for question_idx in range(0, 100, 10)]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from trivia_game.question_search import (
+    QuestionSearchIndex,
+    QuestionSearchResult,
+    split_search_words,
+)
+
+
+class TestQuestionSearchIndex(unittest.TestCase):
+    """Test the term and the prefix queries of the full-text index of the questions."""
+    def setUp(self):
+        self.search_index = QuestionSearchIndex.build(
+            ["History", "Geography"],
+            [
+                ["Who sailed around the world first? Magellan", "Who was Magnus the Good? A king"],
+                ["", "What is the Strait of Magellan?", "Which sea is the largest? Pacific"],
+            ]
+        )
+
+    def test_split_search_words(self):
+        self.assertEqual(split_search_words("Who's Magellan?"), ["who", "s", "magellan"])
+
+    def test_term_query(self):
+        self.assertEqual(self.search_index.search("MAGELLAN", prefix=False), [
+            QuestionSearchResult("History", 0),
+            QuestionSearchResult("Geography", 1),
+        ])
+        self.assertEqual(self.search_index.search("magel", prefix=False), [])
+        self.assertEqual(self.search_index.search("strait magellan", prefix=False), [
+            QuestionSearchResult("Geography", 1),
+        ])
+
+    def test_prefix_query(self):
+        self.assertEqual(self.search_index.search("mag"), [
+            QuestionSearchResult("History", 0),
+            QuestionSearchResult("History", 1),
+            QuestionSearchResult("Geography", 1),
+        ])
+        self.assertEqual(self.search_index.search("mag", limit=1), [
+            QuestionSearchResult("History", 0),
+        ])
+        self.assertEqual(self.search_index.search("the mag k"), [
+            QuestionSearchResult("History", 1),
+        ])
+        self.assertEqual(self.search_index.search("zebra"), [])
+        self.assertEqual(self.search_index.search(" ?! "), [])
+
+    def test_drop_questions(self):
+        search_index = self.search_index.drop_questions(
+            np.array([True, False, False, False, False])
+        )
+        self.assertEqual(search_index.num_questions, 4)
+        self.assertEqual(search_index.search("mag"), [
+            QuestionSearchResult("History", 0),
+            QuestionSearchResult("Geography", 1),
+        ])
+        self.assertEqual(search_index.search("pacific"), [QuestionSearchResult("Geography", 2)])
+
+    def test_empty_index(self):
+        self.assertEqual(QuestionSearchIndex.build([], []).search("magellan"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import io
+import unittest
+from trivia_game.game_engine import GameEngine
+from trivia_game.terminal_game import TerminalTriviaGame
+from tests.test_game_engine import _load_test_game_parameters
+
+
+class TestTerminalTriviaGame(unittest.TestCase):
+    """Test playing the game with the terminal commands."""
+    def setUp(self):
+        question_category_column_name, game_metadata, test_data_path = (
+            _load_test_game_parameters()
+        )
+        self.game_parameters = dict(
+            question_category_column_name=question_category_column_name,
+            data_info=game_metadata,
+            data_path=test_data_path,
+        )
+
+    def _play(self, commands):
+        output_file = io.StringIO()
+        terminal_game = TerminalTriviaGame(
+            logging_level_str='none',
+            input_file=io.StringIO("".join(command + "\n" for command in commands)),
+            output_file=output_file,
+            **self.game_parameters,
+        )
+        terminal_game.start_game()
+        return terminal_game, output_file.getvalue()
+
+    def test_same_questions_as_game_engine(self):
+        game_engine = GameEngine(logging_level_str='none')
+        n_total_questions = game_engine.set_game_parameters(**self.game_parameters)
+        game_engine.initialize_game(seed=7)
+        questions = [game_engine.get_next_question() for _ in range(3)]
+
+        terminal_game, output = self._play(["start 7", "next", "", "answer", "n"])
+        self.assertEqual(terminal_game.question_counter, 3)
+        self.assertEqual(repr(terminal_game.current_question), repr(questions[2]))
+        self.assertIn(
+            f"[2/{n_total_questions}] {questions[1].get_question_category_text()}", output
+        )
+        self.assertIn(f"Answer: {questions[1].get_answer_text()}", output)
+
+    def test_goto_and_game_over(self):
+        terminal_game, output = self._play(["start 7", "goto 2", "next", "goto 1000", "answer"])
+        self.assertTrue(terminal_game.is_game_over)
+        self.assertIn("Game is over, thanks for playing!", output)
+        self.assertIn("Thanks for playing, the game is over!", output)
+
+        game_engine = GameEngine(logging_level_str='none')
+        game_engine.set_game_parameters(**self.game_parameters)
+        game_engine.initialize_game(seed=7)
+        questions = [game_engine.get_next_question() for _ in range(3)]
+        terminal_game, _ = self._play(["start 7", "goto 2", "next"])
+        self.assertEqual(repr(terminal_game.current_question), repr(questions[2]))
+
+    def test_invalid_commands(self):
+        terminal_game, output = self._play(["next", "start seven", "jump", "quit", "start 1"])
+        self.assertIsNone(terminal_game.seed)
+        self.assertIn("Start a game first", output)
+        self.assertIn("'start' needs an integer", output)
+        self.assertIn("Unknown command", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from trivia_game.user_game_interface import parse_difficulty_curve, parse_game_metadata_from_json
+
+
+class TestParseGameMetadata(unittest.TestCase):
+    """Test parsing the JSON file of the game metadata."""
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.metadata_path = os.path.join(self.temp_dir, "game_metadata.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write_metadata(self, metadata: dict):
+        with open(self.metadata_path, 'w', encoding='utf-8') as file:
+            json.dump(metadata, file)
+
+    def test_difficulty_columns(self):
+        self._write_metadata({"Category": {
+            "Art": {"Question": "Q", "Answer": "A", "Difficulty": "Level",
+                    "Difficulty Levels": ["easy", "hard"]},
+            "Geography": {"question": "Q", "answer": "A", "difficulty": "Level"},
+            "History": {"question": "Q", "answer": "A", "additional text": ["B"]},
+        }})
+        question_category_column_name, game_metadata = parse_game_metadata_from_json(
+            self.metadata_path
+        )
+        self.assertEqual(question_category_column_name, "Category")
+        self.assertEqual(game_metadata["Art"]["Difficulty_column"], "Level")
+        self.assertEqual(game_metadata["Art"]["Difficulty_levels"], ["easy", "hard"])
+        self.assertEqual(game_metadata["Geography"]["Difficulty_column"], "Level")
+        self.assertNotIn("Difficulty_levels", game_metadata["Geography"])
+        self.assertEqual(game_metadata["History"], {
+            'Question_column': "Q",
+            'Answer_column': "A",
+            'Question_option_columns': ["B"],
+        })
+
+    def test_difficulty_levels_without_column(self):
+        self._write_metadata({"Category": {
+            "Art": {"question": "Q", "answer": "A", "difficulty levels": ["easy", "hard"]},
+        }})
+        with self.assertRaises(ValueError):
+            parse_game_metadata_from_json(self.metadata_path)
+
+
+class TestParseDifficultyCurve(unittest.TestCase):
+    def test_parse_difficulty_curve(self):
+        self.assertEqual(
+            parse_difficulty_curve("1,0,0; 1, 1, 0 ;0,0.5,1;"),
+            [[1, 0, 0], [1, 1, 0], [0, 0.5, 1]]
+        )
+        for invalid_curve in ["", "1,0; 1", "1,-1", "0,0", "easy"]:
+            with self.assertRaises(ValueError):
+                parse_difficulty_curve(invalid_curve)
+
+
+if __name__ == '__main__':
+    unittest.main()
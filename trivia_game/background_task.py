@@ -0,0 +1,60 @@
+"""Tasks of the GUI run in a thread pool, so that the window stays responsive while they run."""
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class TaskCancelledError(Exception):
+    """Raised by the progress callback of a cancelled task, to stop the task at its next report."""
+
+
+class _BackgroundTaskSignals(QObject):
+    """Signals of a task, emitted in the thread of the task and delivered in the GUI thread."""
+    progress = pyqtSignal(int)
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class BackgroundTask(QRunnable):
+    """Run a function in the global thread pool and report its progress and result by signals.
+
+    The function is called with a progress callback, which emits the progress signal, or raises
+    TaskCancelledError once the task is cancelled. The result of the function is emitted by the
+    succeeded signal, and the message of an exception raised by the function by the failed signal.
+    Nothing is emitted after the task is cancelled.
+    """
+    def __init__(self, function: Callable[[Callable[[int], None]], object]):
+        super().__init__()
+        self.signals = _BackgroundTaskSignals()
+        self._function = function
+        self._is_cancelled = False
+
+    def start(self):
+        """Run the task in the global thread pool."""
+        QThreadPool.globalInstance().start(self)
+
+    def cancel(self):
+        """Stop the task at its next progress report, and discard its result."""
+        self._is_cancelled = True
+
+    def run(self):
+        try:
+            result = self._function(self._report_progress)
+        except TaskCancelledError:
+            return
+        except Exception as err:
+            if not self._is_cancelled:
+                self.signals.failed.emit(f"{type(err).__name__}: {err}")
+            return
+        if not self._is_cancelled:
+            self.signals.succeeded.emit(result)
+
+    def _report_progress(self, progress: int):
+        if self._is_cancelled:
+            raise TaskCancelledError()
+        self.signals.progress.emit(progress)
+
+
+def wait_for_background_tasks():
+    """Block until the tasks running in the global thread pool are finished."""
+    QThreadPool.globalInstance().waitForDone()
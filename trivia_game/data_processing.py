@@ -1,24 +1,90 @@
-from typing import Tuple, List
+from typing import Callable, Dict, Hashable, Iterable, Iterator, NamedTuple, Tuple, List, Optional
+import copy
+import hashlib
+import itertools
+import logging
 import random
+from array import array
 
+import numpy as np
 import pandas as pd
 
 from trivia_game.game_logger import create_logger
+from trivia_game.game_metrics import GameMetrics, instrument, record_latency
+from trivia_game.game_random import generate_random_permutation
+from trivia_game.game_options import DUPLICATE_MODES
+from trivia_game.question_bank_cache import CACHE_MODES, QuestionBankCache
+from trivia_game.question_bank_readers import (
+    QUESTION_BANK_READERS,
+    get_question_bank_format,
+)
+from trivia_game.question_dedup import find_duplicate_questions
+from trivia_game.question_search import QuestionSearchIndex
 
+# Type code of the draw order array, i.e. 4 bytes per question
+_DRAW_ORDER_TYPECODE = 'I'
+# Number of rows of the question bank between the reports of the parsing progress
+_PROGRESS_REPORT_INTERVAL = 10000
 
-def _generate_random_int_and_sort(n):
-    """Generate numbers 1:N and sort randomly."""
-    integers = list(range(1, n + 1))
-    # Shuffle the integers
-    random.shuffle(integers)
-    # Sort the elements and get the sorted indices
-    sorted_indices = sorted(range(len(integers)), key=lambda k: integers[k])
-    return integers, sorted_indices
+
+def _iter_with_progress(
+    rows: Iterable[tuple],
+    progress_callback: Callable[[int], None]
+) -> Iterator[tuple]:
+    """Yield the rows, reporting the number of rows yielded so far to the progress callback."""
+    n_rows = 0
+    for n_rows, row in enumerate(rows, start=1):
+        if n_rows % _PROGRESS_REPORT_INTERVAL == 0:
+            progress_callback(n_rows)
+        yield row
+    progress_callback(n_rows)
+
+
+class QuestionChanges(NamedTuple):
+    """The changes of the questions of a question category, found by diff_questions().
+
+    The questions are given as (question, answer, option 1, option 2, ...) tuples of texts, and the
+    rows by their row positions in the question category. The digest of the questions once the
+    changes are applied (see QuestionCategoryData.get_questions_digest()) is given if it is known.
+    """
+    modified_rows: List[Tuple[int, tuple]]
+    added_questions: List[Tuple[Hashable, tuple]]
+    removed_rows: List[int]
+    questions_digest: Optional[bytes] = None
+
+    @property
+    def num_changes(self) -> int:
+        """The number of modified, added and removed questions."""
+        return len(self.modified_rows) + len(self.added_questions) + len(self.removed_rows)
+
+    def is_structural(self) -> bool:
+        """Return whether any question is added or removed, i.e. the rows themselves changed."""
+        return len(self.added_questions) != 0 or len(self.removed_rows) != 0
+
+
+class DifficultyLevel(NamedTuple):
+    """Difficulty of the questions: its rank orders the levels from the easiest, and its label is
+    the difficulty value of the question bank (or the rank, if the values are numbers).
+    """
+    rank: float
+    label: str
 
 
 class QuestionCategoryData:
     """The interface class between the game engine and the game data for a specified question
     category.
+
+    The questions (i.e. the dataframe) are read-only, thus they can be shared by many games. The
+    game state is only the draw order and a cursor, which takes 4 bytes per question. The draw
+    order may be shuffled lazily, i.e. at its first access (see reset_game_state()).
+
+    The questions of a running game can be patched with the ones of a reloaded question bank (see
+    diff_questions() and apply_question_changes()). The copies of copy_for_new_game() share the
+    modified questions, hence only the questions of a single game should be patched.
+
+    If the questions have difficulties, difficulty_buckets holds the row positions of each
+    difficulty level, and split_by_difficulty() returns the question category of each level, whose
+    difficulty_level is set.
     """
     def __init__(
         self,
@@ -27,113 +93,825 @@ class QuestionCategoryData:
         question_column_title: str,
         answer_column_title: str,
         question_option_columns_list: List[str],
-        logging_level_str: str = "none"
+        logging_level_str: str = "none",
+        difficulty_buckets: Optional[Dict[DifficultyLevel, np.ndarray]] = None,
+        difficulty_level: Optional[DifficultyLevel] = None
     ):
         self.logger = create_logger(name=name, logging_level_str=logging_level_str)
-        self.df = df
+        self._logging_level_str = logging_level_str
+        self._df = df
+        # Rows added by apply_question_changes() but not yet appended to the dataframe, as
+        # (index label, question) tuples, and the positions of the removed rows until the next game
+        self._added_df_rows: List[Tuple[Hashable, tuple]] = []
+        self._removed_row_positions = set()
         self.name = name
         self.num_questions = len(df)
         self.question_column_title = question_column_title
         self.answer_column_title = answer_column_title
         self.question_option_columns_list = question_option_columns_list
-        # Append question_val and is_question_asked column to dataframe self.df
-        self.df['Question Value'] = [0.0 for _ in range(self.num_questions)]
-        self.df['Sorting Indices'] = [-1 for _ in range(self.num_questions)]
-        self.df['is_question_asked'] = [False for _ in range(self.num_questions)]
+        self.difficulty_buckets = difficulty_buckets
+        self.difficulty_level = difficulty_level
+        # Column values as lists, which share the strings with the dataframe but are much faster
+        # to index than the dataframe when retrieving a single question
+        self._question_texts = df[question_column_title].tolist()
+        self._answer_texts = df[answer_column_title].tolist()
+        self._question_option_texts = [
+            df[column].tolist() for column in question_option_columns_list
+        ]
+        # Digest of the texts, computed at the first get_questions_digest() after they change
+        self._questions_digest: Optional[bytes] = None
+        # Game state: the row positions in the order they will be asked and a cursor pointing to
+        # the next question to be asked. Questions before the cursor are the asked ones.
+        self._draw_order = array(_DRAW_ORDER_TYPECODE)
+        self._deferred_permutation: Optional[Callable[[array], None]] = None
+        self.next_question_idx = 0
 
         self.reset_game_state()
-        self.next_question_idx = 0
         self.logger.info("Initialized " + __class__.__name__ + ": " + name)
         self.logger.debug("Number of questions = " + str(self.num_questions))
 
-    def reset_game_state(self):
-        """ Resets game state, which is tracked by columns of self.df"""
-        self.df['is_question_asked'] = [False for _ in range(self.num_questions)]
-        self.df['Question Value'], self.df['Sorting Indices'] = self._sort_questions_randomly()
+    @property
+    def df(self) -> pd.DataFrame:
+        """The questions as a dataframe, which holds the removed questions until the next game."""
+        if self._added_df_rows:
+            labels, rows = zip(*self._added_df_rows)
+            self._df = pd.concat([
+                self._df,
+                pd.DataFrame(list(rows), index=list(labels), columns=self._df.columns, dtype=object)
+            ])
+            self._added_df_rows = []
+        return self._df
+
+    @property
+    def num_rows(self) -> int:
+        """The number of rows, i.e. the questions including the removed ones asked in this game."""
+        return len(self._question_texts)
+
+    @property
+    def draw_order(self) -> array:
+        """The row positions of the questions in the order they are asked."""
+        if self._deferred_permutation is not None:
+            self._deferred_permutation(self._draw_order)
+            self._deferred_permutation = None
+        return self._draw_order
+
+    def reset_game_state(
+        self,
+        rng: Optional[random.Random] = None,
+        deferred_permutation: Optional[Callable[[array], None]] = None
+    ):
+        """Resets game state by re-shuffling the draw order and rewinding the cursor.
+
+        The questions are shuffled by the given random generator (e.g. the one of the GameEngine),
+        or by a new one seeded from the OS entropy if not given. If deferred_permutation is given
+        instead (see NumpyRandomGenerator.create_deferred_permutation()), the draw order is
+        shuffled by it in place at its first access, so that resetting the category costs almost
+        nothing until its questions are drawn. The questions removed by apply_question_changes()
+        are dropped from the new game.
+        """
+        if self._removed_row_positions:
+            self._drop_removed_questions()
+        if deferred_permutation is not None:
+            if len(self._draw_order) != self.num_questions:
+                self._draw_order = array(_DRAW_ORDER_TYPECODE, bytes(4 * self.num_questions))
+            self._deferred_permutation = deferred_permutation
+        else:
+            self._deferred_permutation = None
+            self._draw_order = self._sort_questions_randomly(rng or random.Random())
         self.next_question_idx = 0
-        self.logger.debug('Game Reset: Questions are re-shuffled')
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Game Reset: Questions are re-shuffled')
+
+    def copy_for_new_game(self) -> "QuestionCategoryData":
+        """Return a copy sharing the questions (i.e. the dataframe) but with its own game state.
+
+        This allows playing many games with the same questions loaded once.
+        """
+        game_copy = copy.copy(self)
+        game_copy._draw_order = array(_DRAW_ORDER_TYPECODE, self._draw_order)
+        game_copy._added_df_rows = list(self._added_df_rows)
+        game_copy._removed_row_positions = set(self._removed_row_positions)
+        return game_copy
+
+    def split_by_difficulty(self) -> List["QuestionCategoryData"]:
+        """Return a question category of the questions of each difficulty level, from the easiest.
+
+        The question categories have the same name, and their rows keep the index labels.
+        """
+        if self.difficulty_buckets is None:
+            raise ValueError(f"The questions of the category '{self.name}' have no difficulty.")
+        return [
+            QuestionCategoryData(
+                name=self.name,
+                df=self.df.iloc[row_positions],
+                question_column_title=self.question_column_title,
+                answer_column_title=self.answer_column_title,
+                question_option_columns_list=self.question_option_columns_list,
+                logging_level_str=self._logging_level_str,
+                difficulty_level=difficulty_level,
+            )
+            for difficulty_level, row_positions in sorted(self.difficulty_buckets.items())
+        ]
 
     def get_next_question(self):
-        """Retrive the next question from the dataframe and update  'is_question_asked' column.
+        """Retrive the next question from the dataframe and advance the cursor.
 
         Also returns a boolean flag to indicate whether an unasked question is returned from
         the dataframe.
         """
-        msk_next_question = self.df['Sorting Indices'] == self.next_question_idx
-        next_question = self.df[self.df['Sorting Indices'] == self.next_question_idx]
-        n_questions_retrieved = len(next_question)
-        if n_questions_retrieved > 1:
-            raise ValueError("More than 1 question is retrieved, check get_next_question() method.")
-        elif len(next_question) == 1:
+        if self.next_question_idx < self.num_questions:
             # An unasked question is succesfully retrieved from the dataframe.
+            next_question = self.get_question_by_draw_index(self.next_question_idx)
             self.next_question_idx += 1
             is_query_valid = True
-            self.df.loc[msk_next_question, 'is_question_asked'] = True
         else:
             # The dataframe has no unasked questions.
+            next_question = self.df.iloc[[]]
             is_query_valid = False
         return next_question, is_query_valid
 
+    def get_question_by_draw_index(self, draw_idx: int) -> pd.DataFrame:
+        """Return the question asked (or to be asked) as the draw_idx'th one of this category."""
+        return self.df.iloc[[self.draw_order[draw_idx]]]
+
+    def get_next_question_texts(self) -> Optional[Tuple[str, str, Tuple[str, ...]]]:
+        """Retrieve the texts of the next question and advance the cursor.
+
+        Returns None if there are no unasked questions, see get_question_texts_by_draw_index().
+        """
+        if self.next_question_idx == self.num_questions:
+            return None
+        self.next_question_idx += 1
+        return self.get_question_texts_by_draw_index(self.next_question_idx - 1)
+
+    def get_question_texts_by_draw_index(self, draw_idx: int) -> Tuple[str, str, Tuple[str, ...]]:
+        """Return the question, the answer and the options of the draw_idx'th question."""
+        return self.get_question_texts(self.draw_order[draw_idx])
+
+    def get_question_texts(self, row_position: int) -> Tuple[str, str, Tuple[str, ...]]:
+        """Return the question, the answer and the options of the question at the row position."""
+        return (
+            self._question_texts[row_position],
+            self._answer_texts[row_position],
+            tuple(option_texts[row_position] for option_texts in self._question_option_texts),
+        )
+
+    def get_question_texts_by_draw_range(
+        self,
+        first_draw_idx: int,
+        end_draw_idx: int
+    ) -> List[Tuple[str, str, Tuple[str, ...]]]:
+        """Return the texts of the questions drawn in [first_draw_idx, end_draw_idx).
+
+        Same as get_question_texts_by_draw_index() of each draw index, but column by column.
+        """
+        row_positions = self.draw_order[first_draw_idx:end_draw_idx]
+        question_options = zip(*[
+            [option_texts[row_position] for row_position in row_positions]
+            for option_texts in self._question_option_texts
+        ]) if self._question_option_texts else itertools.repeat((), len(row_positions))
+        return list(zip(
+            [self._question_texts[row_position] for row_position in row_positions],
+            [self._answer_texts[row_position] for row_position in row_positions],
+            question_options,
+        ))
+
+    def get_searchable_texts(self) -> List[str]:
+        """Return the question, the answer and the options of each row joined, to be indexed."""
+        return [" ".join(question) for question in self._iter_questions()]
+
+    def get_draw_index(self, row_position: int) -> Optional[int]:
+        """Return the draw index of the question at the row position, or None if it is not drawn
+        in this game (e.g. it is removed).
+        """
+        draw_indices = np.flatnonzero(
+            np.frombuffer(self.draw_order, dtype=np.uintc) == row_position
+        )
+        return int(draw_indices[0]) if len(draw_indices) != 0 else None
+
     def get_num_of_remaining_questions(self):
         """Return the number of unasked questions."""
-        return (~self.df['is_question_asked']).values.sum()  # False.sum()
+        return self.num_questions - self.next_question_idx
+
+    def set_num_of_asked_questions(self, num_asked_questions: int):
+        """Move the cursor such that the first num_asked_questions questions are the asked ones."""
+        if not 0 <= num_asked_questions <= self.num_questions:
+            raise ValueError(
+                f"Number of asked questions must be in [0, {self.num_questions}], "
+                f"got {num_asked_questions}."
+            )
+        self.next_question_idx = num_asked_questions
+
+    def diff_questions(self, reloaded_category: "QuestionCategoryData") -> QuestionChanges:
+        """Return the changes from the questions of this category to the ones of the reloaded one.
+
+        The rows are matched by their contents first, then the remaining rows by their question
+        texts (in their order, if a question text is repeated), which are the modified rows whose
+        answer or options changed. The rows left are the added or the removed ones, thus editing
+        the text of a question removes the question and adds a new one. Neither category is
+        modified, hence the changes can be found in a background thread while the game goes on.
+        If questions are only modified, the digest of the patched questions is computed too.
+        """
+        unmatched_rows_by_question = dict()
+        for row_position, question in enumerate(self._iter_questions()):
+            if row_position not in self._removed_row_positions:
+                unmatched_rows_by_question.setdefault(question, []).append(row_position)
+        unmatched_questions = []
+        for row_label, question in zip(
+            reloaded_category.df.index,
+            reloaded_category._iter_questions()
+        ):
+            matching_rows = unmatched_rows_by_question.get(question)
+            if matching_rows:
+                matching_rows.pop()
+            else:
+                unmatched_questions.append((row_label, question))
 
-    def _sort_questions_randomly(self):
-        """Sort the questions randomly.
+        unmatched_rows_by_question_text = dict()
+        for row_position in sorted(itertools.chain.from_iterable(
+            unmatched_rows_by_question.values()
+        )):
+            unmatched_rows_by_question_text.setdefault(
+                self._question_texts[row_position], []
+            ).append(row_position)
+        modified_rows = []
+        added_questions = []
+        for row_label, question in unmatched_questions:
+            matching_rows = unmatched_rows_by_question_text.get(question[0])
+            if matching_rows:
+                modified_rows.append((matching_rows.pop(0), question))
+            else:
+                added_questions.append((row_label, question))
 
-        Sorting is done by re-setting 'Question Value' and 'Sorting Indices' columns
+        removed_rows = sorted(itertools.chain.from_iterable(
+            unmatched_rows_by_question_text.values()
+        ))
+        questions_digest = None
+        if modified_rows and not added_questions and not removed_rows:
+            questions_digest = self._compute_questions_digest(modified_rows)
+        return QuestionChanges(
+            modified_rows=modified_rows,
+            added_questions=added_questions,
+            removed_rows=removed_rows,
+            questions_digest=questions_digest,
+        )
+
+    def apply_question_changes(
+        self,
+        question_changes: QuestionChanges,
+        rng: Optional[random.Random] = None
+    ):
+        """Patch the questions with the changes returned by diff_questions(), keeping the game.
+
+        The asked questions stay asked and the unasked ones unasked, in their order. The modified
+        questions are replaced in their rows, the added questions are appended as new rows and
+        placed at random positions among the unasked questions (by the given random generator, or
+        by a new one seeded from the OS entropy if not given), and the removed questions are
+        dropped from the unasked questions. The removed questions which are already asked are
+        kept until the next game, so that the asked questions and the cursor stay the same.
+        The cost is proportional to the number of changes, except the search of the draw position
+        of each removed question.
         """
-        random_elements, sorted_indices = _generate_random_int_and_sort(self.num_questions)
-        self.logger.debug(f'Sorted {self.num_questions} questions.')
-        assert (len(random_elements) == len(sorted_indices))
-        assert (len(random_elements) == len(self.df['Question Value']))
-        return random_elements, sorted_indices
+        if question_changes.num_changes != 0:
+            self._questions_digest = question_changes.questions_digest
+        if question_changes.modified_rows:
+            df = self.df
+            for row_position, question in question_changes.modified_rows:
+                self._set_question(row_position, question)
+                for column_position, text in enumerate(question):
+                    df.iat[row_position, column_position] = text
+        if not question_changes.is_structural():
+            return
+
+        draw_order = self.draw_order
+        for row_position in question_changes.removed_rows:
+            self._removed_row_positions.add(row_position)
+            if self.next_question_idx == self.num_questions:
+                continue
+            try:
+                draw_idx = draw_order.index(row_position, self.next_question_idx)
+            except ValueError:
+                # The question is already asked
+                continue
+            # Replacing it by the last question keeps the unasked questions in a random order
+            draw_order[draw_idx] = draw_order[-1]
+            draw_order.pop()
+            self.num_questions -= 1
+
+        rng = rng or random.Random()
+        for row_label, question in question_changes.added_questions:
+            self._question_texts.append(question[0])
+            self._answer_texts.append(question[1])
+            for option_texts, option_text in zip(self._question_option_texts, question[2:]):
+                option_texts.append(option_text)
+            self._added_df_rows.append((row_label, question))
+            draw_order.append(self.num_rows - 1)
+            draw_idx = rng.randint(self.next_question_idx, self.num_questions)
+            draw_order[draw_idx], draw_order[-1] = draw_order[-1], draw_order[draw_idx]
+            self.num_questions += 1
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                f"Patched {len(question_changes.modified_rows)} modified, "
+                f"{len(question_changes.added_questions)} added and "
+                f"{len(question_changes.removed_rows)} removed questions."
+            )
+
+    def get_questions_digest(self) -> bytes:
+        """Return a digest of the texts of all rows, which changes whenever any text changes.
+
+        The digest is kept until the questions change, and computing it costs in proportion to the
+        total length of the texts.
+        """
+        if self._questions_digest is None:
+            self._questions_digest = self._compute_questions_digest()
+        return self._questions_digest
+
+    def _compute_questions_digest(
+        self,
+        modified_rows: Iterable[Tuple[int, tuple]] = ()
+    ) -> bytes:
+        """Compute the digest of the texts of all rows, with the given rows modified."""
+        text_columns = [self._question_texts, self._answer_texts, *self._question_option_texts]
+        if modified_rows:
+            text_columns = [list(texts) for texts in text_columns]
+            for row_position, question in modified_rows:
+                for texts, text in zip(text_columns, question):
+                    texts[row_position] = text
+        questions_hash = hashlib.blake2b(str(self.num_rows).encode('ascii'), digest_size=16)
+        for texts in text_columns:
+            questions_hash.update(
+                "\x00".join(texts).encode('utf-8', errors='surrogatepass') + b"\x00\x00"
+            )
+        return questions_hash.digest()
+
+    def _iter_questions(self) -> Iterator[tuple]:
+        """Yield the question of each row as a (question, answer, option 1, ...) tuple."""
+        return zip(self._question_texts, self._answer_texts, *self._question_option_texts)
+
+    def _set_question(self, row_position: int, question: tuple):
+        """Replace the texts of the question at the row position."""
+        self._question_texts[row_position] = question[0]
+        self._answer_texts[row_position] = question[1]
+        for option_texts, option_text in zip(self._question_option_texts, question[2:]):
+            option_texts[row_position] = option_text
+
+    def _drop_removed_questions(self):
+        """Drop the rows of the removed questions, which renumbers the rows after them."""
+        kept_row_positions = [
+            row_position for row_position in range(self.num_rows)
+            if row_position not in self._removed_row_positions
+        ]
+        self._df = self.df.iloc[kept_row_positions]
+        self._questions_digest = None
+        self._question_texts = [self._question_texts[row] for row in kept_row_positions]
+        self._answer_texts = [self._answer_texts[row] for row in kept_row_positions]
+        self._question_option_texts = [
+            [option_texts[row] for row in kept_row_positions]
+            for option_texts in self._question_option_texts
+        ]
+        self._removed_row_positions = set()
+        self.num_questions = len(kept_row_positions)
+
+    def _sort_questions_randomly(self, rng: random.Random) -> array:
+        """Sort the questions randomly and return the row positions in the draw order."""
+        # Shuffling a list is faster than shuffling the array in place
+        draw_order = array(
+            _DRAW_ORDER_TYPECODE,
+            generate_random_permutation(self.num_questions, rng)
+        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f'Sorted {self.num_questions} questions.')
+        assert (len(draw_order) == self.num_questions)
+        return draw_order
+
+
+def split_question_categories_by_difficulty(
+    question_category_db_list: List[QuestionCategoryData]
+) -> List[QuestionCategoryData]:
+    """Return the question categories of each difficulty level of the question categories, which
+    are sorted by their difficulty ranks and then by the order of the question categories.
+
+    The question categories which are already of a difficulty level are kept. The levels of the
+    question categories are grouped by their ranks, hence ValueError is raised unless each rank
+    has the same label in every question category (e.g. the same list of difficulty levels).
+    """
+    question_category_db_by_level = []
+    for question_category_db in question_category_db_list:
+        if question_category_db.difficulty_level is not None:
+            question_category_db_by_level.append(question_category_db)
+        elif question_category_db.difficulty_buckets is None:
+            raise ValueError(
+                f"The question category '{question_category_db.name}' has no difficulty column."
+            )
+        else:
+            question_category_db_by_level.extend(question_category_db.split_by_difficulty())
+    # The first question category of each difficulty rank and of each difficulty label
+    first_question_category_db_by_level_key = {}
+    for question_category_db in question_category_db_by_level:
+        difficulty_level = question_category_db.difficulty_level
+        for level_key in difficulty_level:
+            first_question_category_db = first_question_category_db_by_level_key.setdefault(
+                level_key,
+                question_category_db
+            )
+            first_difficulty_level = first_question_category_db.difficulty_level
+            if first_difficulty_level != difficulty_level:
+                raise ValueError(
+                    "The difficulty levels of the question categories do not match: "
+                    f"'{first_question_category_db.name}' has the level "
+                    f"'{first_difficulty_level.label}' of rank {first_difficulty_level.rank:g}, "
+                    f"but '{question_category_db.name}' has the level "
+                    f"'{difficulty_level.label}' of rank {difficulty_level.rank:g}."
+                )
+    return sorted(
+        question_category_db_by_level,
+        key=lambda question_category_db: question_category_db.difficulty_level.rank
+    )
+
+
+def build_question_search_index(
+    question_category_db_list: List[QuestionCategoryData]
+) -> QuestionSearchIndex:
+    """Build the full-text index of the questions of the question categories."""
+    return QuestionSearchIndex.build(
+        [question_category_db.name for question_category_db in question_category_db_list],
+        [question_category_db.get_searchable_texts()
+         for question_category_db in question_category_db_list]
+    )
 
 
 class DataLoader:
-    """ Class to Load & Parse the Excel database."""
-    def __init__(self, question_category_column_name, data_info, logging_level_str):
+    """ Class to Load & Parse the question bank (Excel, CSV, Parquet or JSON Lines) database.
+
+    If metrics are given, the latency of load_data() and the numbers of the loaded questions and
+    of the cache hits are collected.
+    """
+    def __init__(
+        self,
+        question_category_column_name,
+        data_info,
+        logging_level_str,
+        metrics: Optional[GameMetrics] = None
+    ):
         self.logging_level_str = logging_level_str
+        self._metrics = metrics
+        if metrics is not None:
+            instrument(self, metrics)
         # Store State Data
         self.question_category_column_name = question_category_column_name
         self.data_info = data_info
+        # Rows of the last parsed data whose question category is not defined in data_info
+        self.unknown_question_category_rows: dict[str, np.ndarray] = dict()
+        # Groups of the duplicate questions found by the last load_data(), see load_data()
+        self.duplicate_question_groups: List[List[Tuple[str, Hashable]]] = []
+        # Full-text index of the questions loaded by the last load_data(), see load_data()
+        self.search_index: Optional[QuestionSearchIndex] = None
         self.logger = create_logger(name="DataLoader", logging_level_str=logging_level_str)
         self.logger.info("Initialized DataLoader.")
 
-    def parse_excel_data(self, database_path: pd.DataFrame) -> list[QuestionCategoryData]:
-        """ Parse the Excel file for each question category defined in self.data_info.keys().
+    @record_latency("load")
+    def load_data(
+        self,
+        database_path: str,
+        cache_mode: str = "off",
+        question_bank_format: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        duplicate_mode: str = "off",
+        build_search_index: bool = False
+    ) -> list[QuestionCategoryData]:
+        """ Load the question categories, using the compiled question bank cache if enabled.
+
+        cache_mode is one of "use" (load the cache if it is up-to-date, else parse the question
+        bank and create the cache), "rebuild" (parse the question bank and re-create the cache)
+        or "off" (parse the question bank without touching the cache).
+        duplicate_mode is one of "off" (keep all questions), "report" (find the duplicate and the
+        near-duplicate questions of all categories and log them) or "drop" (find them and keep
+        only the first question of each group). The found groups are stored in
+        self.duplicate_question_groups, and the cache always holds all questions.
+        With build_search_index, the full-text index of the questions (see QuestionSearchIndex)
+        is stored in self.search_index, and it is stored in the cache too. The digests of the
+        questions (see QuestionCategoryData.get_questions_digest()) are stored in the cache, so
+        that they are not computed again from the cached questions.
+        See parse_data() for the question_bank_format and the progress_callback options.
+        """
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got '{cache_mode}'.")
+        if duplicate_mode not in DUPLICATE_MODES:
+            raise ValueError(
+                f"duplicate_mode must be one of {DUPLICATE_MODES}, got '{duplicate_mode}'."
+            )
+        self.duplicate_question_groups = []
+        self.search_index = None
+        question_bank_format = get_question_bank_format(database_path, question_bank_format)
+        if cache_mode == "off":
+            question_category_db_list = self.parse_data(
+                database_path,
+                question_bank_format,
+                progress_callback
+            )
+            if build_search_index:
+                self.search_index = build_question_search_index(question_category_db_list)
+            return self._count_loaded_questions(
+                self._handle_duplicate_questions(question_category_db_list, duplicate_mode)
+            )
+
+        cache = QuestionBankCache(
+            data_path=database_path,
+            question_category_column_name=self.question_category_column_name,
+            data_info=self.data_info,
+            question_bank_format=question_bank_format,
+            logging_level_str=self.logging_level_str,
+        )
+        if cache_mode == "use":
+            question_category_dfs = cache.load()
+            if question_category_dfs is not None:
+                if self._metrics is not None:
+                    self._metrics.increment("question_bank_cache_hits")
+                question_category_db_list = [
+                    self._create_question_category_data(subset_df, question_category)
+                    for question_category, subset_df in question_category_dfs.items()
+                ]
+                questions_digests = cache.load_questions_digests()
+                for question_category_db in question_category_db_list:
+                    question_category_db._questions_digest = questions_digests.get(
+                        question_category_db.name
+                    )
+                if build_search_index:
+                    self.search_index = cache.load_search_index()
+                    if self.search_index is None:
+                        # The cache is created without the search index
+                        self.search_index = build_question_search_index(question_category_db_list)
+                        cache.save(question_category_dfs, questions_digests, self.search_index)
+                return self._count_loaded_questions(
+                    self._handle_duplicate_questions(question_category_db_list, duplicate_mode)
+                )
+        question_category_db_list = self.parse_data(
+            database_path,
+            question_bank_format,
+            progress_callback
+        )
+        if build_search_index:
+            self.search_index = build_question_search_index(question_category_db_list)
+        cache.save(
+            {
+                question_category_db.name: question_category_db.df
+                for question_category_db in question_category_db_list
+            },
+            {
+                question_category_db.name: question_category_db.get_questions_digest()
+                for question_category_db in question_category_db_list
+            },
+            self.search_index
+        )
+        return self._count_loaded_questions(
+            self._handle_duplicate_questions(question_category_db_list, duplicate_mode)
+        )
+
+    @record_latency("parse")
+    def parse_data(
+        self,
+        database_path: str,
+        question_bank_format: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None
+    ) -> list[QuestionCategoryData]:
+        """ Parse the question bank for each question category defined in self.data_info.keys().
 
         For each question category, a QuestionCategoryData object is created which interfaces with
-        the main game engine.
+        the main game engine. question_bank_format is one of the keys of QUESTION_BANK_READERS,
+        which is deduced from the file extension if not given. Only the columns used by the
+        question categories are read, and the rows are streamed into the question categories they
+        belong to, so the whole question bank is never loaded into the memory.
+        If given, progress_callback is called with the number of rows read so far, every
+        _PROGRESS_REPORT_INTERVAL rows and once all rows are read.
         """
-        self.logger.debug("Reading question/ answer data from " + database_path + ".")
-        question_categories = list(self.data_info.keys())
-        # Read excel sheet and treat data as strings
-        # Replace NaN values with ""
-        df = pd.read_excel(
+        question_bank_format = get_question_bank_format(database_path, question_bank_format)
+        self.logger.debug(
+            f"Reading question/ answer data from {database_path} as {question_bank_format}."
+        )
+        rows = QUESTION_BANK_READERS[question_bank_format](
             database_path,
-            dtype=str,
+            self._get_required_columns()
         )
-        df = df.fillna("")
+        if progress_callback is not None:
+            rows = _iter_with_progress(rows, progress_callback)
+        return self._parse_rows(rows)
+
+    def parse_excel_data(self, database_path: str) -> list[QuestionCategoryData]:
+        """ Parse the Excel file for each question category defined in self.data_info.keys()."""
+        return self.parse_data(database_path, question_bank_format="excel")
+
+    def parse_dataframe(self, df: pd.DataFrame) -> list[QuestionCategoryData]:
+        """ Parse the dataframe for each question category defined in self.data_info.keys().
+
+        The dataframe must contain the question category column and the columns used by the
+        question categories, with the values stored as strings.
+        """
+        question_categories = list(self.data_info.keys())
         self.logger.debug("Parsing question categories:")
         self.logger.debug(question_categories)
+        rows_by_question_category = self._group_rows_by_question_category(
+            self.question_category_column_name,
+            df
+        )
+        self._report_unknown_question_categories(rows_by_question_category)
         question_category_db_list = [
-            self._parse_by_question_category(df, question_category)
+            self._parse_by_question_category(df, question_category, rows_by_question_category)
             for question_category in question_categories
         ]
         return question_category_db_list
 
+    def _count_loaded_questions(
+        self,
+        question_category_db_list: List[QuestionCategoryData]
+    ) -> List[QuestionCategoryData]:
+        """ Count the questions of the loaded question categories, and return them."""
+        if self._metrics is not None:
+            self._metrics.increment(
+                "questions_loaded",
+                sum(question_category_db.num_questions
+                    for question_category_db in question_category_db_list)
+            )
+        return question_category_db_list
+
+    def _handle_duplicate_questions(
+        self,
+        question_category_db_list: List[QuestionCategoryData],
+        duplicate_mode: str
+    ) -> List[QuestionCategoryData]:
+        """ Find the duplicate questions of all question categories, and report or drop them.
+
+        Each group of self.duplicate_question_groups holds the (question category, row label)
+        pairs of its questions, in the order of the question categories and of their rows.
+        """
+        if duplicate_mode == "off":
+            return question_category_db_list
+        question_keys = [
+            (question_category_db.name, row_label)
+            for question_category_db in question_category_db_list
+            for row_label in question_category_db.df.index
+        ]
+        duplicate_groups = find_duplicate_questions(
+            [text for question_category_db in question_category_db_list
+             for text in question_category_db._question_texts],
+            [text for question_category_db in question_category_db_list
+             for text in question_category_db._answer_texts]
+        )
+        self.duplicate_question_groups = [
+            [question_keys[question_idx] for question_idx in group] for group in duplicate_groups
+        ]
+        n_duplicates = sum(len(group) - 1 for group in duplicate_groups)
+        if self._metrics is not None:
+            self._metrics.increment("duplicate_questions", n_duplicates)
+        if n_duplicates == 0:
+            return question_category_db_list
+        if duplicate_mode == "report":
+            for group in self.duplicate_question_groups:
+                question_keys_text = ", ".join(
+                    f"({question_category}, {row_label})" for question_category, row_label in group
+                )
+                self.logger.warning(
+                    f"Duplicate questions (question category, row): {question_keys_text}"
+                )
+            return question_category_db_list
+
+        is_dropped = np.zeros(len(question_keys), dtype=bool)
+        for group in duplicate_groups:
+            is_dropped[group[1:]] = True
+        self.logger.info(f"{n_duplicates} duplicate questions are dropped.")
+        if self.search_index is not None:
+            self.search_index = self.search_index.drop_questions(is_dropped)
+        deduplicated_db_list = []
+        first_question_idx = 0
+        for question_category_db in question_category_db_list:
+            is_category_row_dropped = is_dropped[
+                first_question_idx:first_question_idx + question_category_db.num_questions
+            ]
+            first_question_idx += question_category_db.num_questions
+            if is_category_row_dropped.any():
+                question_category_db = self._create_question_category_data(
+                    question_category_db.df[~is_category_row_dropped],
+                    question_category_db.name
+                )
+            deduplicated_db_list.append(question_category_db)
+        return deduplicated_db_list
+
+    def _parse_rows(self, rows: Iterable[tuple]) -> list[QuestionCategoryData]:
+        """ Sort the streamed rows into the question categories defined in self.data_info.keys().
+
+        Each row holds the string values of the columns returned by _get_required_columns().
+        """
+        question_categories = list(self.data_info.keys())
+        self.logger.debug("Parsing question categories:")
+        self.logger.debug(question_categories)
+        required_column_indices = {
+            column: idx for idx, column in enumerate(self._get_required_columns())
+        }
+        # Question categories are matched by their names without the leading/ending whitespaces
+        question_categories_by_stripped_name = dict()
+        for question_category in question_categories:
+            question_categories_by_stripped_name.setdefault(
+                question_category.strip(), []
+            ).append(question_category)
+        # For each question category, the indices of its columns in the rows, the positions of its
+        # rows and the values of its columns
+        category_column_indices = dict()
+        category_row_positions = dict()
+        category_column_values = dict()
+        for question_category in question_categories:
+            category_columns = self._get_unique_columns_by_question_category(question_category)
+            category_column_indices[question_category] = [
+                required_column_indices[column] for column in category_columns
+            ]
+            category_row_positions[question_category] = []
+            category_column_values[question_category] = [[] for _ in category_columns]
+
+        rows_by_unknown_question_category = dict()
+        for row_position, row in enumerate(rows):
+            stripped_question_category = row[0].strip()
+            matching_question_categories = question_categories_by_stripped_name.get(
+                stripped_question_category
+            )
+            if matching_question_categories is None:
+                rows_by_unknown_question_category.setdefault(
+                    stripped_question_category, []
+                ).append(row_position)
+                continue
+            for question_category in matching_question_categories:
+                category_row_positions[question_category].append(row_position)
+                for column_values, column_idx in zip(
+                    category_column_values[question_category],
+                    category_column_indices[question_category]
+                ):
+                    column_values.append(row[column_idx])
+        self._report_unknown_question_categories({
+            question_category: np.array(rows_positions, dtype=np.intp)
+            for question_category, rows_positions in rows_by_unknown_question_category.items()
+        })
+
+        question_category_db_list = []
+        for question_category in question_categories:
+            category_columns = self._get_unique_columns_by_question_category(question_category)
+            subset_df = pd.DataFrame(
+                dict(zip(category_columns, category_column_values[question_category])),
+                index=category_row_positions[question_category],
+                columns=category_columns,
+                dtype=object,
+            )
+            subset_df = subset_df[self._get_dataframe_columns(question_category)]
+            question_category_db_list.append(
+                self._create_question_category_data(subset_df, question_category)
+            )
+        return question_category_db_list
+
+    def _get_required_columns(self) -> List[str]:
+        """Return the question category column followed by the columns used by the categories."""
+        required_columns = [self.question_category_column_name]
+        for question_category in self.data_info.keys():
+            required_columns.extend(
+                self._get_unique_columns_by_question_category(question_category)
+            )
+        return list(dict.fromkeys(required_columns))
+
+    def _get_unique_columns_by_question_category(self, question_category: str) -> List[str]:
+        """Return the columns used by the question category, without duplicates."""
+        return list(dict.fromkeys(self._get_dataframe_columns(question_category)))
+
+    def _get_dataframe_columns(self, question_category: str) -> List[str]:
+        """Return the columns of the dataframe of the question category: the question, the answer
+        and the question option columns, followed by the difficulty column if any.
+        """
+        (question_column_title,
+         answer_column_title,
+         question_option_columns_list) = self._get_columns_by_question_category(
+            data_info_dict=self.data_info,
+            question_category=question_category
+        )
+        columns = [question_column_title, answer_column_title] + question_option_columns_list
+        difficulty_column_title = self.data_info[question_category].get('Difficulty_column')
+        if difficulty_column_title is not None:
+            columns.append(difficulty_column_title)
+        return columns
+
     def _parse_by_question_category(
         self,
         df: pd.DataFrame,
-        question_category: str
+        question_category: str,
+        rows_by_question_category: Optional[dict[str, np.ndarray]] = None
     ) -> QuestionCategoryData:
-        """ Parse the dataframe for the given question category(type)."""
+        """ Parse the dataframe for the given question category(type).
+
+        rows_by_question_category is the output of _group_rows_by_question_category() for the
+        dataframe, which is computed if not given.
+        """
+        if rows_by_question_category is None:
+            rows_by_question_category = self._group_rows_by_question_category(
+                self.question_category_column_name,
+                df
+            )
         # Return the rows matching the specified question category
-        matching_rows_indices = self._get_rows_by_question_category(
-            self.question_category_column_name,
-            df,
-            question_category
+        matching_rows_positions = rows_by_question_category.get(
+            question_category.strip(),
+            np.array([], dtype=np.intp)
         )
         # Return the columns to extract for the specified question category
         (question_column_title,
@@ -147,35 +925,115 @@ class DataLoader:
         self.logger.debug(f"Answer column: {answer_column_title}")
         self.logger.debug(f"Question optional text columns(): {question_option_columns_list}")
 
-        # Create QuestionCategoryData object which is a wrapper class around pandas.Dataframe
-        subset_df = df.loc[
-            matching_rows_indices,
-            [question_column_title, answer_column_title] + question_option_columns_list
+        subset_df = df.iloc[
+            matching_rows_positions,
+            df.columns.get_indexer(self._get_dataframe_columns(question_category))
         ]
+        return self._create_question_category_data(subset_df, question_category)
+
+    def _create_question_category_data(
+        self,
+        subset_df: pd.DataFrame,
+        question_category: str
+    ) -> QuestionCategoryData:
+        """ Create the QuestionCategoryData object from the rows of the given question category."""
+        (question_column_title,
+         answer_column_title,
+         question_option_columns_list) = self._get_columns_by_question_category(
+            data_info_dict=self.data_info,
+            question_category=question_category
+        )
+        difficulty_buckets = None
+        if self.data_info[question_category].get('Difficulty_column') is not None:
+            subset_df, difficulty_buckets = self._bucket_rows_by_difficulty(
+                subset_df,
+                question_category
+            )
+        # Create QuestionCategoryData object which is a wrapper class around pandas.Dataframe
         return QuestionCategoryData(
             name=question_category,
             df=subset_df,
             question_column_title=question_column_title,
             answer_column_title=answer_column_title,
             question_option_columns_list=question_option_columns_list,
-            logging_level_str=self.logging_level_str
+            logging_level_str=self.logging_level_str,
+            difficulty_buckets=difficulty_buckets
         )
 
+    def _bucket_rows_by_difficulty(
+        self,
+        subset_df: pd.DataFrame,
+        question_category: str
+    ) -> Tuple[pd.DataFrame, Dict[DifficultyLevel, np.ndarray]]:
+        """ Find the row positions of each difficulty level of the question category.
+
+        The ranks of the difficulties are their positions in the 'Difficulty_levels' of the
+        question category if given, else the difficulties must be numbers, which are their ranks.
+        The rows with any other (or an empty) difficulty are skipped, and the rows left are
+        returned with the row positions of each difficulty level.
+        """
+        question_category_dict = self.data_info[question_category]
+        difficulties = subset_df[question_category_dict['Difficulty_column']].str.strip()
+        difficulty_levels = question_category_dict.get('Difficulty_levels')
+        if difficulty_levels is not None:
+            labels_by_rank = list(difficulty_levels)
+            ranks = difficulties.map(
+                {label.strip(): rank for rank, label in enumerate(difficulty_levels)}
+            ).to_numpy(dtype=float)
+        else:
+            labels_by_rank = None
+            ranks = pd.to_numeric(difficulties, errors='coerce').to_numpy(dtype=float)
+        has_difficulty = ~np.isnan(ranks)
+        if not has_difficulty.all():
+            self.logger.warning(
+                f"{int((~has_difficulty).sum())} rows of the question category "
+                f"'{question_category}' are skipped, since their difficulty is empty or unknown."
+            )
+            subset_df = subset_df[has_difficulty]
+            ranks = ranks[has_difficulty]
+        difficulty_buckets = {
+            DifficultyLevel(
+                float(rank),
+                labels_by_rank[int(rank)] if labels_by_rank is not None else f"{rank:g}"
+            ): row_positions
+            for rank, row_positions in pd.Series(ranks).groupby(ranks, sort=True).indices.items()
+        }
+        return subset_df, difficulty_buckets
+
     @staticmethod
-    def _get_rows_by_question_category(
+    def _group_rows_by_question_category(
         question_category_column_name: str,
-        df: pd.DataFrame,
-        question_category: str
-    ) -> List:
+        df: pd.DataFrame
+    ) -> dict[str, np.ndarray]:
         """
-        Find the rows where the specific question category is stored
+        Find the row positions where each question category is stored, in a single pass.
 
-        Leading and ending whitespaces are removed from strings while doing the comparison.
+        Leading and ending whitespaces are removed from the question categories.
         """
-        matching_rows_indices = df.index[
-            df[question_category_column_name].str.strip() == question_category.strip()
-        ].tolist()
-        return matching_rows_indices
+        stripped_question_categories = df[question_category_column_name].str.strip()
+        return stripped_question_categories.groupby(
+            stripped_question_categories,
+            sort=False
+        ).indices
+
+    def _report_unknown_question_categories(
+        self,
+        rows_by_question_category: dict[str, np.ndarray]
+    ):
+        """Report the rows whose question category is not defined in self.data_info."""
+        known_question_categories = {
+            question_category.strip() for question_category in self.data_info.keys()
+        }
+        self.unknown_question_category_rows = {
+            question_category: rows_positions
+            for question_category, rows_positions in rows_by_question_category.items()
+            if question_category not in known_question_categories
+        }
+        for question_category, rows_positions in self.unknown_question_category_rows.items():
+            self.logger.warning(
+                f"{len(rows_positions)} rows with the question category '{question_category}' "
+                "are skipped, since the category is not defined in the game metadata."
+            )
 
     @staticmethod
     def _get_columns_by_question_category(
@@ -0,0 +1,70 @@
+"""Fenwick (binary indexed) tree to sample an index with probability proportional to its weight."""
+from typing import List
+
+
+class FenwickTree:
+    """Prefix sums over non-negative weights with O(log N) updates and weighted index lookups."""
+    def __init__(self, weights: List[int]):
+        self._n = len(weights)
+        self._weights = list(weights)
+        # 1-based tree where node i stores the sum of the weights in (i - lowbit(i), i]
+        self._tree = [0] + list(weights)
+        for idx in range(1, self._n + 1):
+            parent = idx + (idx & -idx)
+            if parent <= self._n:
+                self._tree[parent] += self._tree[idx]
+        self._total = sum(self._weights)
+        self._top_bit = 1 << (self._n.bit_length() - 1) if self._n > 0 else 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def total(self):
+        """Return the sum of all weights."""
+        return self._total
+
+    def get(self, idx: int):
+        """Return the weight stored at the index."""
+        return self._weights[idx]
+
+    def add(self, idx: int, delta):
+        """Add delta to the weight stored at the index."""
+        self._weights[idx] += delta
+        self._total += delta
+        node = idx + 1
+        while node <= self._n:
+            self._tree[node] += delta
+            node += node & -node
+
+    def set(self, idx: int, value):
+        """Overwrite the weight stored at the index."""
+        delta = value - self._weights[idx]
+        if delta != 0:
+            self.add(idx, delta)
+
+    def prefix_sum(self, end: int):
+        """Return the sum of the weights of the indices in [0, end)."""
+        result = 0
+        node = end
+        while node > 0:
+            result += self._tree[node]
+            node -= node & -node
+        return result
+
+    def find(self, value) -> int:
+        """Return the first index whose cumulative weight is strictly larger than the value.
+
+        This is equivalent to bisect.bisect_right() over the cumulative weights, so drawing
+        value = random() * total selects an index with probability proportional to its weight,
+        the same way random.choices() does. Values beyond the total select the last index.
+        """
+        node = 0
+        step = self._top_bit
+        while step > 0:
+            next_node = node + step
+            if next_node <= self._n and self._tree[next_node] <= value:
+                node = next_node
+                value -= self._tree[next_node]
+            step >>= 1
+        return min(node, self._n - 1)
@@ -1,60 +1,96 @@
+import bisect
+import hashlib
+import itertools
+import logging
 import random
-from typing import List
+from array import array
+from typing import Dict, List, Optional, Tuple
 
-from pandas import DataFrame
+import numpy as np
 
-from trivia_game.data_processing import DataLoader
+from trivia_game.data_processing import (
+    DataLoader,
+    QuestionCategoryData,
+    QuestionChanges,
+    split_question_categories_by_difficulty,
+)
+from trivia_game.fenwick_tree import FenwickTree
 from trivia_game.game_logger import create_logger
+from trivia_game.game_metrics import GameMetrics, instrument, record_latency
+from trivia_game.game_options import DRAW_MODES
+from trivia_game.game_random import create_random_generator
+from trivia_game.game_snapshot import SNAPSHOT_FORMAT_VERSION, decode_value, encode_value
+from trivia_game.question_search import QuestionSearchIndex, QuestionSearchResult
 
+# Number of questions between the random state checkpoints used by GameEngine.seek()
+_RNG_CHECKPOINT_INTERVAL = 1024
 
-def _normalize_weight_list(weights: list) -> List:
-    sum_weights = sum(weights)
-    return [x / sum_weights if x != 0 else 0.0 for x in weights]
 
+class TriviaQuestion:
+    """Data interface between the GameEngine and the GUI.
+
+    An immutable record of the question strings, which are shared with the question bank.
+    """
+    __slots__ = (
+        '_is_question_valid',
+        '_question_text',
+        '_answer_text',
+        '_question_options',
+        '_question_category',
+    )
 
-class TriviaQuestion():
-    """Data interface between the GameEngine and the GUI."""
     def __init__(
         self,
         is_question_valid: bool = False,
-        data: DataFrame = DataFrame(),
-        question_column_str: str = "",
-        answer_column_str: str = "",
-        question_options_list: List[str] = [],
+        question_text: str = "",
+        answer_text: str = "",
+        question_options: Tuple[str, ...] = (),
         question_category: str = "",
     ):
-        self._is_question_valid = is_question_valid
-        self._data = data if is_question_valid else DataFrame()
-        self._question_column_str = question_column_str if is_question_valid else ""
-        self._answer_column_str = answer_column_str if is_question_valid else ""
-        self._question_options_list = question_options_list if is_question_valid else []
-        self._question_category = question_category if is_question_valid else ""
+        set_attribute = object.__setattr__
+        set_attribute(self, '_is_question_valid', is_question_valid)
+        set_attribute(self, '_question_text', question_text if is_question_valid else "")
+        set_attribute(self, '_answer_text', answer_text if is_question_valid else "")
+        set_attribute(
+            self,
+            '_question_options',
+            tuple(question_options) if is_question_valid else ()
+        )
+        set_attribute(self, '_question_category', question_category if is_question_valid else "")
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{__class__.__name__} is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{__class__.__name__} is immutable.")
 
     def __repr__(self):
         """Override for print() method calls"""
         if self._is_question_valid:
-            return repr(self._data)
+            return (
+                f"{__class__.__name__}(question_text={self._question_text!r}, "
+                f"answer_text={self._answer_text!r}, "
+                f"question_options={self._question_options!r}, "
+                f"question_category={self._question_category!r})"
+            )
         else:
             return ""
 
     def get_question_text(self) -> str:
         """Return the question as a text."""
-        return self._data[self._question_column_str].values[0] if self._is_question_valid else ""
+        return self._question_text
 
     def get_answer_text(self) -> str:
         """Return the answer as a text."""
-        return self._data[self._answer_column_str].values[0] if self._is_question_valid else ""
+        return self._answer_text
 
     def get_question_category_text(self) -> str:
         """Return the question category as a text."""
-        return self._question_category if self._is_question_valid else ""
+        return self._question_category
 
     def get_question_options(self) -> List[str]:
         """Return the question options as a list of strings."""
-        return [
-            self._data[column].values[0]
-            for column in self._question_options_list
-        ] if self._is_question_valid else []
+        return list(self._question_options)
 
     def is_question_valid(self) -> bool:
         """Return a boolean flag that indicates whether the question is valid."""
@@ -62,140 +98,1153 @@ class TriviaQuestion():
 
 
 class GameEngine:
-    """Main class that controls the game."""
-    def __init__(self, logging_level_str):
+    """Main class that controls the game.
+
+    Each GameEngine owns its random generator of the given backend (one of RNG_BACKENDS), so the
+    games played by different engines in the same process do not affect each other. The "python"
+    backend gives the same games as the global random module did for the same seed.
+
+    The draw mode (one of DRAW_MODES) selects how the questions are drawn:
+    - "category" draws the category of each question first, with probabilities proportional to
+      the weights of the categories, then the next question of the category's shuffled order.
+    - "permutation" shuffles all questions of all categories into a single order at the start of
+      the game, so that drawing and seeking any question is a lookup in this order. It only
+      supports the 'Weighted' mode without weights_override: choosing a category with probability
+      proportional to its remaining questions and then its next shuffled question gives every
+      order of all questions with the same probability, which is what a single shuffle does.
+      Hence the games follow the same distribution, but the same seed gives a different game
+      than the "category" draw mode.
+    - "difficulty" splits each category into its difficulty levels (see
+      QuestionCategoryData.split_by_difficulty()), which are the categories of the game, named
+      "<category> / <difficulty>". Each question of a round of questions_per_round questions is
+      drawn from a difficulty level, with probabilities proportional to the weights of the levels
+      in the round's row of the difficulty curve (the last row is used for all later rounds), and
+      then from a category of the level like in the "category" draw mode. The levels without
+      questions left have zero weight, and the questions of any level are drawn once the levels of
+      the round are out of questions. The default curve has a row per level, from the easiest,
+      which gives only questions of that level. weights_override is not supported.
+
+    The counters and the latencies of the engine (see GameMetrics) are collected only if metrics
+    are given, which may be shared with other engines, and they are returned by stats().
+    """
+    def __init__(
+        self,
+        logging_level_str,
+        rng_backend="python",
+        draw_mode="category",
+        metrics: Optional[GameMetrics] = None,
+        difficulty_curve: Optional[List[List[float]]] = None,
+        questions_per_round: int = 10,
+    ):
+        if draw_mode not in DRAW_MODES:
+            raise ValueError(f"draw_mode must be one of {DRAW_MODES}, got '{draw_mode}'.")
+        if questions_per_round < 1:
+            raise ValueError(f"questions_per_round must be positive, got {questions_per_round}.")
+        self._draw_mode = draw_mode
         self._logging_level_str = logging_level_str
         self._logging = create_logger(
             'GameEngine',
             logging_level_str=logging_level_str,
         )
+        self._rng_backend = rng_backend
+        self._rng = create_random_generator(rng_backend)
+        # Seed of the current game, None until a game with shuffled questions is initialized
+        self._seed = None
         self._is_game_over = False
         self._ref_dict = dict()
         self._question_categorys = list()
+        # Remaining questions and 'has remaining questions' flags of each question category,
+        # used as the category weights of the 'Weighted' and the equal-weight modes respectively.
+        self._remaining_questions_tree = FenwickTree([])
+        self._available_categories_tree = FenwickTree([])
+        # Category index of every question drawn in the current game, and the random state before
+        # every _RNG_CHECKPOINT_INTERVAL'th draw, which are used to seek to any question.
+        self._question_position = 0
+        self._draw_history = array('i')
+        self._rng_checkpoints = list()
+        # Number of recorded draws made before questions were last added or removed, which are
+        # repeated rather than drawn again, and the random state of the game at that question
+        self._num_frozen_draws = 0
+        self._frozen_rng_state = None
+        # Draw mode "permutation": the first question index of each question category when the
+        # questions of all categories are concatenated, and the order of these indices in the game
+        self._category_offsets = list()
+        self._question_order = array('I')
+        # Draw mode "difficulty": the given difficulty curve, the weights of the difficulty levels
+        # of each round, the first category index of each level (and the category count), and the
+        # level weights of the current round, which are rebuilt at the start of each round and
+        # when a level runs out of questions
+        self._difficulty_curve = difficulty_curve
+        self._questions_per_round = questions_per_round
+        self._round_level_weights = list()
+        self._level_category_offsets = list()
+        self._level_weights_tree = None
+        self._level_weights_round = None
+        # Arguments of DataLoader.load_data() given to set_game_parameters(), to reload the data
+        self._question_bank_parameters = None
+        # Full-text index of the questions, None until it is loaded or built by search_questions()
+        self._search_index = None
+        # Hash of the texts of the questions stored in the snapshots, None until it is computed,
+        # and the number of patches adding or removing questions since the game is initialized
+        self._question_bank_hash = None
+        self._num_structural_patches = 0
+        self._metrics = metrics
+        if metrics is not None:
+            instrument(self, metrics)
         self._logging.info('Initialized GameEngine.')
 
     def set_game_parameters(
         self,
         question_category_column_name,
         data_info,
-        data_path
+        data_path,
+        cache_mode="off",
+        question_bank_format=None,
+        progress_callback=None,
+        duplicate_mode="off",
+        build_search_index=False,
     ) -> int:
         """Create a game with the specified data.
 
-        Creates a dataloader with specified question categories.
+        Creates a dataloader with specified question categories. See DataLoader.load_data() for
+        the cache_mode options of the compiled question bank cache, the question_bank_format
+        options, the progress_callback reporting the number of parsed rows and the
+        duplicate_mode options of the duplicate questions. With build_search_index, the index of
+        search_questions() is built (or loaded from the cache) with the questions. The hash of the
+        questions held by the snapshots is computed too, so that the first snapshot is fast.
         """
-        dataloader = DataLoader(
+        self._question_bank_parameters = dict(
             question_category_column_name=question_category_column_name,
             data_info=data_info,
-            logging_level_str=self._logging_level_str,
+            data_path=data_path,
+            cache_mode=cache_mode,
+            question_bank_format=question_bank_format,
+            duplicate_mode=duplicate_mode,
         )
-
         # Sort questions into different categories and put them in a list
-        question_category_list = dataloader.parse_excel_data(data_path)
+        dataloader = self._create_data_loader()
+        question_category_list = self._load_question_categories(
+            dataloader,
+            progress_callback,
+            build_search_index
+        )
+        number_of_questions_total = self.set_question_categories(question_category_list)
+        if dataloader.search_index is not None \
+                and dataloader.search_index.question_category_names == self._question_categorys:
+            # The categories of the "difficulty" draw mode are not the ones of the index
+            self._search_index = dataloader.search_index
+        self._get_question_bank_hash()
+
+        self._logging.info('Data is loaded into the GameEngine succesfully.')
+        return number_of_questions_total
+
+    def diff_question_bank(self, progress_callback=None) -> Dict[str, QuestionChanges]:
+        """Reload the question bank of set_game_parameters(), return the changes of each category.
+
+        The game is not changed, so that the question bank can be reloaded in a background thread
+        while the game goes on, and the changes are applied by apply_question_changes() later.
+        Reloading reads the whole question bank (or its cache, if it is up-to-date), whereas
+        applying the changes costs in proportion to the number of changed questions.
+        """
+        if self._question_bank_parameters is None:
+            raise ValueError("No question bank is loaded by set_game_parameters().")
+        return self.diff_question_categories(
+            self._load_question_categories(self._create_data_loader(), progress_callback)
+        )
+
+    def diff_question_categories(
+        self,
+        question_category_list: List[QuestionCategoryData]
+    ) -> Dict[str, QuestionChanges]:
+        """Return the changes from the questions of the game to the given question categories.
+
+        The given categories must have the same names as the ones of the game, see
+        QuestionCategoryData.diff_questions() for how the questions are matched. In the
+        "difficulty" draw mode, the questions of each difficulty level are matched separately.
+        """
+        if self._draw_mode == "difficulty":
+            question_category_list = split_question_categories_by_difficulty(
+                question_category_list
+            )
+        question_categories_by_name = {
+            self._get_category_key(question_category): question_category
+            for question_category in question_category_list
+        }
+        if question_categories_by_name.keys() != self._ref_dict.keys():
+            raise ValueError(
+                f"Question categories must be {self._question_categorys}, "
+                f"got {list(question_categories_by_name)}."
+            )
+        return {
+            name: question_category.diff_questions(question_categories_by_name[name])
+            for name, question_category in self._ref_dict.items()
+        }
+
+    @record_latency("patch")
+    def apply_question_changes(
+        self,
+        question_changes_by_category: Dict[str, QuestionChanges]
+    ) -> int:
+        """Patch the questions of the game with the changes returned by diff_question_bank().
+
+        The game goes on from the current question: the asked questions stay asked, the added
+        questions are placed at random positions among the unasked ones, and the removed questions
+        are not asked anymore (see QuestionCategoryData.apply_question_changes()). The category
+        weights follow the new numbers of unasked questions. A later seek() repeats the recorded
+        draws until the current question and draws the following ones with the patched questions,
+        but the snapshots taken after adding or removing questions are rejected by restore().
+        In the "permutation" draw mode, adding or removing questions renumbers the question order,
+        which costs in proportion to the number of questions. Returns the total number of questions.
+        """
+        question_categories = list(self._ref_dict.values())
+        old_num_rows = [question_category.num_rows for question_category in question_categories]
+        for name, question_changes in question_changes_by_category.items():
+            self._ref_dict[name].apply_question_changes(question_changes)
+            if question_changes.num_changes != 0:
+                self._search_index = None
+                self._question_bank_hash = None
+        if self._metrics is not None:
+            self._metrics.increment(
+                "questions_patched",
+                sum(question_changes.num_changes
+                    for question_changes in question_changes_by_category.values())
+            )
+        if not any(question_changes.is_structural()
+                   for question_changes in question_changes_by_category.values()):
+            return self._get_number_of_questions_total()
+
+        # The added questions are placed at unseeded random positions, thus the game can no longer
+        # be replayed from its seed (see restore())
+        self._num_structural_patches += 1
+        if self._draw_mode == "permutation":
+            self._update_question_order(
+                [question_changes_by_category.get(name) for name in self._question_categorys],
+                old_num_rows
+            )
+            self._is_game_over = self._question_position == len(self._question_order) \
+                and self._is_game_over
+        else:
+            self._reset_category_weights()
+            self._is_game_over = self._remaining_questions_tree.total == 0 and self._is_game_over
+            # The recorded draws after the current question may no longer be drawn, and the ones
+            # before it can not be drawn again with the patched weights
+            self._truncate_draw_history()
+            self._num_frozen_draws = self._question_position
+            self._frozen_rng_state = self._rng.get_compact_state()
+        return self._get_number_of_questions_total()
+
+    def set_question_categories(self, question_category_list: List[QuestionCategoryData]) -> int:
+        """Create a game with the given question categories, e.g. the ones loaded by a DataLoader.
+
+        In the "difficulty" draw mode, the categories are split into their difficulty levels, and
+        ValueError is raised if a category has no difficulties or if the rows of the difficulty
+        curve do not have a weight for each level. Returns the total number of questions.
+        """
+        if self._draw_mode == "difficulty":
+            question_category_list = split_question_categories_by_difficulty(
+                question_category_list
+            )
+            self._set_difficulty_levels(question_category_list)
         number_of_questions_total = sum(
             [category.num_questions for category in question_category_list]
         )
 
         # Store the question categories in a dictionary where keys are the names of categories
-        self._ref_dict = {q_category.name: q_category for q_category in question_category_list}
+        self._ref_dict = {
+            self._get_category_key(q_category): q_category for q_category in question_category_list
+        }
         self._question_categorys = list(self._ref_dict.keys())
-
-        self._logging.info('Data is loaded into the GameEngine succesfully.')
+        self._category_offsets = list(itertools.accumulate(
+            [category.num_questions for category in self._ref_dict.values()],
+            initial=0
+        ))[:-1]
+        if self._draw_mode == "permutation":
+            self._question_order = array('I', range(number_of_questions_total))
+        else:
+            self._question_order = array('I')
+        self._search_index = None
+        self._question_bank_hash = None
+        self._reset_category_weights()
+        self._reset_draw_history()
         return number_of_questions_total
 
-    def initialize_game(self, seed=1):
-        """ Initialize the game by randomly sorting questions by the given seed."""
-        random.seed(seed)
-        self._logging.debug(f'Initializing the game with seed = {seed}')
+    def stats(self) -> dict:
+        """Return the collected counters and latencies (see GameMetrics.to_dict()).
+
+        Returns an empty dictionary if the engine does not collect metrics.
+        """
+        if self._metrics is None:
+            return dict()
+        return self._metrics.to_dict()
+
+    def get_question_category_names(self) -> List[str]:
+        """Return the names of the question categories, in the order of the category indices."""
+        return list(self._question_categorys)
+
+    @record_latency("reset")
+    def initialize_game(self, seed=1, shuffle_questions=True):
+        """ Initialize the game by randomly sorting questions by the given seed.
 
-        for question_category in self._ref_dict.values():
-            question_category.reset_game_state()
+        If shuffle_questions is False, the questions of each category are asked in the order of
+        the previous game, which is useful when only the categories of the questions are needed
+        (see draw_question_categories()). The categories are drawn from the same distribution,
+        but they differ from the ones of the same seed with shuffle_questions. It has no effect in
+        the "permutation" draw mode, where the categories follow the order of the questions.
+        """
+        self._rng.seed(seed)
+        if self._logging.isEnabledFor(logging.DEBUG):
+            self._logging.debug(f'Initializing the game with seed = {seed}')
+        self._seed = seed if shuffle_questions or self._draw_mode == "permutation" else None
         self._is_game_over = False
+        self._num_structural_patches = 0
+        if self._metrics is not None:
+            self._metrics.increment("games")
+
+        question_categories = list(self._ref_dict.values())
+        has_removed_questions = any(
+            question_category.num_rows != question_category.num_questions
+            for question_category in question_categories
+        )
+        if has_removed_questions:
+            # The new game drops the rows of the questions removed by apply_question_changes(),
+            # which renumbers the rows of the search index
+            self._search_index = None
+            self._question_bank_hash = None
+        if self._draw_mode == "permutation":
+            if has_removed_questions:
+                for question_category in question_categories:
+                    question_category.reset_game_state()
+                self.set_question_categories(question_categories)
+            self._rng.fill_permutation(self._question_order)
+            self._question_position = 0
+            return
 
+        # The categories are shuffled lazily if the random generator supports it
+        for category_idx, question_category in enumerate(question_categories):
+            if shuffle_questions:
+                question_category.reset_game_state(
+                    self._rng,
+                    self._rng.create_deferred_permutation(category_idx)
+                )
+            else:
+                question_category.set_num_of_asked_questions(0)
+        self._reset_category_weights()
+        self._reset_draw_history()
+
+    @record_latency("draw")
     def get_next_question(self, weight_calculation_method='Weighted', weights_override=[]):
         """Get the next question to be asked.
 
-        This is done by calculating the weights of each question category type and
-        randomly selecting one using the normalizedd weights as probabilities.
+        This is done by randomly selecting a question category, with probabilities proportional to
+        the weights of the question categories (or to weights_override, if given).
         """
+        if self._metrics is not None:
+            self._metrics.increment("questions_drawn")
+        if self._draw_mode == "permutation":
+            self._check_permutation_weights(weight_calculation_method, weights_override)
+            return self._get_next_questions_by_order(1)[0]
         if self._is_game_over:
             # Method called while the game is already over
             self._logging.debug('Game is over already!')
             return TriviaQuestion(is_question_valid=False)
 
-        weights = self._calculate_weights_of_question_categories(weight_calculation_method)
-        sum_weights = sum(weights)
-        if sum_weights == 0:
+        category_idx = self._draw_question_category(weight_calculation_method, weights_override)
+        if category_idx is None:
             # Game is over
             self._logging.info('We are out of questions, game is over!')
             self._is_game_over = True
             return TriviaQuestion(is_question_valid=False)
         else:
-            # Get Weights for Question Categories
-            if len(weights_override) == 0:
-                normalized_weights = _normalize_weight_list(weights)
-            else:
-                sum_weights_override = sum(weights_override)
-                if sum_weights_override == 0:
-                    normalized_weights = _normalize_weight_list(weights)
-                    self._logging.debug(
-                        "Weights override invalid! Fall back to default normalization."
-                    )
-                else:
-                    normalized_weights = weights_override
-                    self._logging.debug("Weights are overridden.")
+            # Return the next TriviaQuestion to be displayed.
+            question_category_database = self._ref_dict[self._question_categorys[category_idx]]
+            question_texts = question_category_database.get_next_question_texts()
+            if question_texts is None:
+                # An exhausted question category is selected by the weights override
+                return TriviaQuestion(is_question_valid=False)
+            return self._create_trivia_question(question_category_database, question_texts)
+
+    @record_latency("draw_batch")
+    def get_next_questions(
+        self,
+        n_questions: int,
+        weight_calculation_method='Weighted',
+        weights_override=[]
+    ) -> List[TriviaQuestion]:
+        """Get the next n_questions questions to be asked.
+
+        The result is the same as the one of n_questions get_next_question() calls, including the
+        invalid questions returned once the game is over. The random values of the category draws
+        are generated together (in batches between the random state checkpoints), and the
+        questions of each category are retrieved together after all categories are drawn.
+        """
+        if self._metrics is not None:
+            self._metrics.increment("questions_drawn", max(n_questions, 0))
+        if self._draw_mode == "permutation":
+            self._check_permutation_weights(weight_calculation_method, weights_override)
+            return self._get_next_questions_by_order(n_questions)
+
+        category_indices = self.draw_question_categories(
+            n_questions,
+            weight_calculation_method,
+            weights_override
+        )
+        # Retrieve the drawn questions of each question category at once
+        question_texts_by_category = dict()
+        for category_idx, n_category_draws in enumerate(
+            self._count_category_draws(category_indices)
+        ):
+            if n_category_draws == 0:
+                continue
+            question_category = self._ref_dict[self._question_categorys[category_idx]]
+            question_texts_by_category[category_idx] = iter(
+                question_category.get_question_texts_by_draw_range(
+                    question_category.next_question_idx - int(n_category_draws),
+                    question_category.next_question_idx
+                )
+            )
+        return [
+            self._create_trivia_question(
+                self._ref_dict[self._question_categorys[category_idx]],
+                next(question_texts_by_category[category_idx])
+            ) if category_idx >= 0 else TriviaQuestion(is_question_valid=False)
+            for category_idx in category_indices
+        ]
+
+    def draw_question_categories(
+        self,
+        n_questions: int,
+        weight_calculation_method='Weighted',
+        weights_override=[]
+    ) -> array:
+        """Draw the categories of the next n_questions questions, without retrieving the questions.
+
+        Returns the index of the category of each question (see get_question_category_names()),
+        or -1 for each invalid question, which is returned once the game is over or if a category
+        without questions left is selected by weights_override. The game continues exactly as if
+        the questions were retrieved one by one.
+        """
+        category_indices = array('i')
+        if self._draw_mode == "permutation":
+            self._check_permutation_weights(weight_calculation_method, weights_override)
+            first_position = self._question_position
+            self._question_position = min(
+                first_position + max(n_questions, 0),
+                len(self._question_order)
+            )
+            category_indices.extend(
+                bisect.bisect_right(self._category_offsets, question_idx) - 1
+                for question_idx in self._question_order[first_position:self._question_position]
+            )
+        elif len(weights_override) != 0:
+            # Rarely used, the draws of the overridden weights are not batched
+            while len(category_indices) < n_questions and not self._is_game_over:
+                question_position = self._question_position
+                category_idx = self._draw_question_category(
+                    weight_calculation_method,
+                    weights_override
+                )
+                if category_idx is None:
+                    break
+                # An exhausted question category may be selected by the weights override
+                category_indices.append(
+                    category_idx if self._question_position > question_position else -1
+                )
+            self._advance_question_categories(category_indices)
+        else:
+            # Every draw asks a question until we are out of questions, since the categories
+            # without questions left have zero weight in both modes
+            n_draws = 0 if self._is_game_over else \
+                max(min(n_questions, self._remaining_questions_tree.total), 0)
+            weights_tree = self._get_category_weights_tree(weight_calculation_method)
+            is_difficulty_mode = self._draw_mode == "difficulty"
+            while len(category_indices) < n_draws \
+                    and self._question_position < self._num_frozen_draws:
+                category_indices.append(self._draw_frozen_question_category())
+            while len(category_indices) < n_draws:
+                if self._question_position == \
+                        len(self._rng_checkpoints) * _RNG_CHECKPOINT_INTERVAL:
+                    self._rng_checkpoints.append(self._rng.get_compact_state())
+                n_batch_draws = min(
+                    n_draws - len(category_indices),
+                    _RNG_CHECKPOINT_INTERVAL - self._question_position % _RNG_CHECKPOINT_INTERVAL
+                )
+                find_category, record_draw = weights_tree.find, self._record_draw
+                for value in self._rng.random_batch(n_batch_draws):
+                    if is_difficulty_mode:
+                        category_idx = self._select_difficulty_category(value, weights_tree)
+                    else:
+                        category_idx = find_category(value * weights_tree.total)
+                    record_draw(category_idx)
+                    category_indices.append(category_idx)
+            self._advance_question_categories(category_indices)
+        if self._logging.isEnabledFor(logging.DEBUG):
+            self._logging.debug(f'Drew {len(category_indices)} questions at once.')
+
+        if len(category_indices) < n_questions:
+            if not self._is_game_over:
+                self._logging.info('We are out of questions, game is over!')
+            self._is_game_over = True
+            category_indices.extend([-1] * (n_questions - len(category_indices)))
+        return category_indices
+
+    @record_latency("seek")
+    def seek(self, question_number: int, weight_calculation_method='Weighted', weights_override=[]):
+        """Go to the given question, as if question_number questions were asked one by one.
+
+        The game state is restored from the closest random state checkpoint before the question,
+        after which at most _RNG_CHECKPOINT_INTERVAL category draws are repeated (and the questions
+        which were never reached in the current game are drawn for the first time). The questions
+        themselves are not retrieved except the last one, which is returned. The subsequent
+        get_next_question() calls continue the game exactly as if it was played until there.
+        The draws made before questions were last added or removed are repeated from the record.
+        In the "permutation" draw mode, seeking is a lookup in the order of the questions.
+        """
+        question_number = max(question_number, 0)
+        if self._draw_mode == "permutation":
+            self._check_permutation_weights(weight_calculation_method, weights_override)
+            self._question_position = min(question_number, len(self._question_order))
+            self._is_game_over = question_number > len(self._question_order)
+            return self.get_current_question()
+
+        checkpoint_idx = min(
+            question_number // _RNG_CHECKPOINT_INTERVAL,
+            len(self._rng_checkpoints) - 1
+        )
+        self._restore_rng_checkpoint(checkpoint_idx)
+        if self._logging.isEnabledFor(logging.DEBUG):
             self._logging.debug(
-                f"Probabilities for {self._question_categorys} categories are: {normalized_weights}"
+                f'Seeking to question {question_number} from question {self._question_position}'
             )
+        checkpoint_position = self._question_position
+
+        is_question_valid = True
+        while self._question_position < question_number:
+            question_position = self._question_position
+            category_idx = self._draw_question_category(
+                weight_calculation_method,
+                weights_override
+            )
+            if category_idx is None:
+                self._logging.info('We are out of questions, game is over!')
+                self._is_game_over = True
+                is_question_valid = False
+                break
+            elif self._question_position == question_position:
+                # An exhausted question category is selected by the weights override
+                is_question_valid = False
+                break
+        if self._metrics is not None:
+            self._metrics.increment(
+                "seek_replayed_draws",
+                self._question_position - checkpoint_position
+            )
+
+        # Move the cursor of each question category to the number of its asked questions
+        for category_idx, question_category in enumerate(self._ref_dict.values()):
+            question_category.set_num_of_asked_questions(
+                question_category.num_questions - self._remaining_questions_tree.get(category_idx)
+            )
+
+        if not is_question_valid:
+            return TriviaQuestion(is_question_valid=False)
+        return self.get_current_question()
+
+    def search_questions(
+        self,
+        query: str,
+        prefix: bool = True,
+        limit: int = 20
+    ) -> List[QuestionSearchResult]:
+        """Return the questions having all words of the query, see QuestionSearchIndex.search().
 
-            # Choose the next question's category
-            question_category = random.choices(
+        The index loaded by set_game_parameters() is used. Otherwise, the index is built from the
+        questions of the game at the first search after they change, which costs in proportion to
+        the number of questions. Go to a found question by find_question_number() and seek().
+        """
+        if self._search_index is None:
+            self._search_index = QuestionSearchIndex.build(
                 self._question_categorys,
-                weights=normalized_weights,
+                [question_category.get_searchable_texts()
+                 for question_category in self._ref_dict.values()]
+            )
+        return self._search_index.search(query, prefix, limit)
+
+    def get_question(self, question_category: str, row_position: int) -> TriviaQuestion:
+        """Return the question at the row of the category, e.g. one found by search_questions()."""
+        question_category_database = self._ref_dict[question_category]
+        return self._create_trivia_question(
+            question_category_database,
+            question_category_database.get_question_texts(row_position)
+        )
+
+    def find_question_number(
+        self,
+        question_category: str,
+        row_position: int,
+        weight_calculation_method='Weighted',
+        weights_override=[]
+    ) -> Optional[int]:
+        """Return the number of the question (see seek()) at the row of the category in the current
+        game, or None if the question is not asked in this game (e.g. it is removed).
+
+        In the "permutation" draw mode, the question is looked up in the order of the questions.
+        In the "category" draw mode, its draw index in its category is looked up, and the
+        categories are drawn until the category is drawn as many times, which costs about as much
+        as seeking to the question. The game state is not changed.
+        """
+        category_idx = self._question_categorys.index(question_category)
+        question_category_database = self._ref_dict[question_category]
+        if not 0 <= row_position < question_category_database.num_rows:
+            raise ValueError(
+                f"Row position must be in [0, {question_category_database.num_rows}), "
+                f"got {row_position}."
+            )
+        if self._draw_mode == "permutation":
+            question_idx = self._category_offsets[category_idx] + row_position
+            question_positions = np.flatnonzero(
+                np.frombuffer(self._question_order, dtype=np.uintc) == question_idx
+            )
+            return int(question_positions[0]) + 1 if len(question_positions) != 0 else None
+
+        draw_idx = question_category_database.get_draw_index(row_position)
+        if draw_idx is None:
+            return None
+        question_position, is_game_over = self._question_position, self._is_game_over
+        question_number = None
+        n_extra_draws = 1
+        while True:
+            category_positions = np.flatnonzero(
+                np.frombuffer(self._draw_history, dtype=np.intc) == category_idx
+            )
+            if len(category_positions) > draw_idx:
+                question_number = int(category_positions[draw_idx]) + 1
+                break
+            # Record the draws after the recorded ones, twice as many at each step
+            n_recorded_draws = len(self._draw_history)
+            n_extra_draws = max(2 * n_extra_draws, draw_idx + 1 - len(category_positions))
+            self.seek(n_recorded_draws + n_extra_draws, weight_calculation_method, weights_override)
+            if len(self._draw_history) == n_recorded_draws:
+                break
+        self.seek(question_position, weight_calculation_method, weights_override)
+        self._is_game_over = is_game_over
+        return question_number
+
+    def get_current_question(self) -> TriviaQuestion:
+        """Return the last asked question of the game, without changing the game state.
+
+        The question is invalid if no question is asked yet or if the game is over.
+        """
+        if self._question_position == 0 or self._is_game_over:
+            return TriviaQuestion(is_question_valid=False)
+        if self._draw_mode == "permutation":
+            return self._get_question_by_order_position(self._question_position - 1)
+        question_category_database = self._ref_dict[
+            self._question_categorys[self._draw_history[self._question_position - 1]]
+        ]
+        last_question_texts = question_category_database.get_question_texts_by_draw_index(
+            question_category_database.next_question_idx - 1
+        )
+        return self._create_trivia_question(question_category_database, last_question_texts)
+
+    def snapshot(self) -> dict:
+        """Return the state of the current game as a small JSON serializable dictionary.
+
+        The snapshot holds the seed, the number of asked questions of each question category, the
+        random state and the position of the game, and the category of each drawn question with
+        the random state checkpoints after the first one, so that seek() stays as fast after
+        restore(). The questions themselves are not included, which takes about 4 bytes per
+        drawn question (and a random state per _RNG_CHECKPOINT_INTERVAL questions), but a hash of
+        their texts is. The hash is computed by set_game_parameters(), or by the first snapshot
+        after the questions change, from the digests of the changed question categories.
+        """
+        if self._seed is None:
+            raise ValueError("Snapshots are only taken of the games with shuffled questions.")
+        return encode_value({
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "seed": self._seed,
+            "rng_backend": self._rng_backend,
+            "draw_mode": self._draw_mode,
+            "difficulty_curve": self._get_difficulty_curve_option(),
+            "question_category_sizes": self._get_question_category_sizes(),
+            # The snapshots after adding or removing questions are rejected by restore() anyway
+            "question_bank_hash":
+                self._get_question_bank_hash() if self._num_structural_patches == 0 else None,
+            "num_structural_patches": self._num_structural_patches,
+            "question_position": self._question_position,
+            "is_game_over": self._is_game_over,
+            "num_asked_questions": [
+                question_category.next_question_idx
+                for question_category in self._ref_dict.values()
+            ],
+            "rng_state": self._rng.get_compact_state(),
+            "draw_history": self._draw_history,
+            "rng_checkpoints": self._rng_checkpoints[1:],
+        })
+
+    def restore(self, snapshot: dict):
+        """Continue the game of a snapshot returned by snapshot(), as if it was played until there.
+
+        The game engine must have the same questions (compared by the hash of their texts), random
+        backend and draw mode as the one which took the snapshot, else ValueError is raised. The
+        game is initialized with the seed of the snapshot, after which the game state is set
+        without replaying any draw. Initializing the game shuffles the questions of every category
+        with the "python" random backend, hence restoring costs in proportion to the number of
+        questions, whereas the "numpy" backend shuffles each category at its first draw.
+        The snapshots taken after questions are added or removed by apply_question_changes() are
+        rejected, since the patched game can not be replayed from its seed.
+        """
+        snapshot = decode_value(snapshot)
+        if snapshot.get("version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Snapshot version must be {SNAPSHOT_FORMAT_VERSION}.")
+        if snapshot.get("num_structural_patches") != 0:
+            raise ValueError(
+                "Snapshot is taken after questions were added or removed during the game, "
+                "which can not be replayed from its seed."
+            )
+        for option_name, option_value in [
+            ("rng_backend", self._rng_backend),
+            ("draw_mode", self._draw_mode),
+            ("difficulty_curve", self._get_difficulty_curve_option()),
+            ("question_category_sizes", self._get_question_category_sizes()),
+            ("question_bank_hash", self._get_question_bank_hash()),
+        ]:
+            if snapshot.get(option_name) != option_value:
+                raise ValueError(
+                    f"Snapshot is taken with {option_name} {snapshot.get(option_name)!r}, "
+                    f"but the game has {option_value!r}."
+                )
+        self.initialize_game(seed=snapshot["seed"])
+        self._is_game_over = snapshot["is_game_over"]
+        if self._draw_mode == "permutation":
+            self._question_position = snapshot["question_position"]
+            return
+
+        for question_category, num_asked_questions in zip(
+            self._ref_dict.values(),
+            snapshot["num_asked_questions"]
+        ):
+            question_category.set_num_of_asked_questions(num_asked_questions)
+        self._set_category_weights([
+            question_category.get_num_of_remaining_questions()
+            for question_category in self._ref_dict.values()
+        ])
+        self._question_position = snapshot["question_position"]
+        self._draw_history = snapshot["draw_history"]
+        self._rng_checkpoints[1:] = snapshot["rng_checkpoints"]
+        self._rng.set_compact_state(snapshot["rng_state"])
+
+    def _create_data_loader(self) -> DataLoader:
+        """Create the DataLoader of the question bank given to set_game_parameters()."""
+        return DataLoader(
+            question_category_column_name=self._question_bank_parameters[
+                "question_category_column_name"
+            ],
+            data_info=self._question_bank_parameters["data_info"],
+            logging_level_str=self._logging_level_str,
+            metrics=self._metrics,
+        )
+
+    def _load_question_categories(
+        self,
+        dataloader: DataLoader,
+        progress_callback=None,
+        build_search_index=False
+    ) -> List[QuestionCategoryData]:
+        """Load the question categories of the question bank given to set_game_parameters()."""
+        question_bank_parameters = self._question_bank_parameters
+        return dataloader.load_data(
+            question_bank_parameters["data_path"],
+            cache_mode=question_bank_parameters["cache_mode"],
+            question_bank_format=question_bank_parameters["question_bank_format"],
+            progress_callback=progress_callback,
+            duplicate_mode=question_bank_parameters["duplicate_mode"],
+            build_search_index=build_search_index,
+        )
+
+    def _get_number_of_questions_total(self) -> int:
+        """Return the number of questions of the game, including the removed ones already asked."""
+        if self._draw_mode == "permutation":
+            return len(self._question_order)
+        return sum(question_category.num_questions for question_category in self._ref_dict.values())
+
+    def _update_question_order(
+        self,
+        question_changes_list: List[Optional[QuestionChanges]],
+        old_num_rows: List[int]
+    ):
+        """Renumber the question order after questions are added or removed ("permutation" mode).
+
+        The question indices are moved to the new offsets of their categories, the removed unasked
+        questions are dropped and the added questions are placed at random unasked positions.
+        """
+        question_categories = list(self._ref_dict.values())
+        old_category_offsets = np.array(self._category_offsets, dtype=np.int64)
+        self._category_offsets = list(itertools.accumulate(
+            [question_category.num_rows for question_category in question_categories],
+            initial=0
+        ))[:-1]
+        category_offsets = np.array(self._category_offsets, dtype=np.int64)
+        question_order = np.frombuffer(self._question_order, dtype=np.uintc).astype(np.int64)
+        category_indices = np.searchsorted(old_category_offsets, question_order, side='right') - 1
+        question_order += (category_offsets - old_category_offsets)[category_indices]
+
+        removed_question_indices = []
+        added_question_indices = []
+        for category_offset, question_changes, n_old_rows in zip(
+            self._category_offsets,
+            question_changes_list,
+            old_num_rows
+        ):
+            if question_changes is None:
+                continue
+            removed_question_indices.extend(
+                category_offset + row_position for row_position in question_changes.removed_rows
+            )
+            added_question_indices.extend(range(
+                category_offset + n_old_rows,
+                category_offset + n_old_rows + len(question_changes.added_questions)
+            ))
+        unasked_question_order = question_order[self._question_position:]
+        unasked_question_order = unasked_question_order[
+            ~np.isin(unasked_question_order, removed_question_indices)
+        ]
+        self._question_order = array(
+            'I',
+            np.concatenate([
+                question_order[:self._question_position],
+                unasked_question_order
+            ]).astype(np.uintc).tobytes()
+        )
+        rng = random.Random()
+        for question_idx in added_question_indices:
+            self._question_order.append(question_idx)
+            order_position = rng.randint(self._question_position, len(self._question_order) - 1)
+            self._question_order[order_position], self._question_order[-1] = \
+                self._question_order[-1], self._question_order[order_position]
+
+    def _get_difficulty_curve_option(self) -> Optional[dict]:
+        """Return the options of the difficulty curve, or None if not in the "difficulty" mode."""
+        if self._draw_mode != "difficulty":
+            return None
+        return {
+            "round_level_weights": self._round_level_weights,
+            "questions_per_round": self._questions_per_round,
+        }
+
+    def _get_question_bank_hash(self) -> str:
+        """Return the hash of the names and the question texts of the question categories."""
+        if self._question_bank_hash is None:
+            question_bank_hash = hashlib.blake2b(digest_size=16)
+            for name, question_category in self._ref_dict.items():
+                question_bank_hash.update(name.encode('utf-8') + b"\x00")
+                question_bank_hash.update(question_category.get_questions_digest())
+            self._question_bank_hash = question_bank_hash.hexdigest()
+        return self._question_bank_hash
+
+    def _get_question_category_sizes(self) -> dict:
+        """Return the number of questions of each question category, by the category names."""
+        return {
+            name: question_category.num_questions
+            for name, question_category in self._ref_dict.items()
+        }
+
+    @staticmethod
+    def _create_trivia_question(
+        question_category_database: QuestionCategoryData,
+        question_texts: Tuple[str, str, Tuple[str, ...]]
+    ) -> TriviaQuestion:
+        """Wrap the question texts retrieved from the question category in a TriviaQuestion."""
+        question_text, answer_text, question_options = question_texts
+        return TriviaQuestion(
+            is_question_valid=True,
+            question_text=question_text,
+            answer_text=answer_text,
+            question_options=question_options,
+            question_category=question_category_database.name)
+
+    def _count_category_draws(self, category_indices: array) -> np.ndarray:
+        """Return the number of valid draws of each question category."""
+        category_indices = np.frombuffer(category_indices, dtype=np.intc)
+        return np.bincount(
+            category_indices[category_indices >= 0],
+            minlength=len(self._question_categorys)
+        )
+
+    def _advance_question_categories(self, category_indices: array):
+        """Move the cursor of each question category past its questions drawn at once."""
+        for category_idx, n_category_draws in enumerate(
+            self._count_category_draws(category_indices)
+        ):
+            if n_category_draws > 0:
+                question_category = self._ref_dict[self._question_categorys[category_idx]]
+                question_category.set_num_of_asked_questions(
+                    question_category.next_question_idx + int(n_category_draws)
+                )
+
+    def _get_next_questions_by_order(self, n_questions: int) -> List[TriviaQuestion]:
+        """Get the next n_questions questions of the question order (draw mode "permutation")."""
+        first_position = self._question_position
+        self._question_position = min(
+            first_position + max(n_questions, 0),
+            len(self._question_order)
+        )
+        questions = [
+            self._get_question_by_order_position(question_position)
+            for question_position in range(first_position, self._question_position)
+        ]
+        if len(questions) < n_questions:
+            if not self._is_game_over:
+                self._logging.info('We are out of questions, game is over!')
+            self._is_game_over = True
+            questions.extend(
+                TriviaQuestion(is_question_valid=False)
+                for _ in range(n_questions - len(questions))
+            )
+        return questions
+
+    def _get_question_by_order_position(self, question_position: int) -> TriviaQuestion:
+        """Return the question at the position of the question order (draw mode "permutation")."""
+        question_idx = self._question_order[question_position]
+        category_idx = bisect.bisect_right(self._category_offsets, question_idx) - 1
+        question_category_database = self._ref_dict[self._question_categorys[category_idx]]
+        return self._create_trivia_question(
+            question_category_database,
+            question_category_database.get_question_texts(
+                question_idx - self._category_offsets[category_idx]
+            )
+        )
+
+    def _get_category_key(self, question_category: QuestionCategoryData) -> str:
+        """Return the name of the question category in the game, which is the name of the category
+        with its difficulty in the "difficulty" draw mode.
+        """
+        if self._draw_mode != "difficulty":
+            return question_category.name
+        return f"{question_category.name} / {question_category.difficulty_level.label}"
+
+    def _set_difficulty_levels(self, question_category_list: List[QuestionCategoryData]):
+        """Find the categories of each difficulty level, and check the difficulty curve against
+        the levels ("difficulty" draw mode). The categories are sorted by their difficulty ranks.
+        """
+        difficulty_ranks = [
+            question_category.difficulty_level.rank for question_category in question_category_list
+        ]
+        self._level_category_offsets = [
+            category_idx for category_idx, difficulty_rank in enumerate(difficulty_ranks)
+            if category_idx == 0 or difficulty_rank != difficulty_ranks[category_idx - 1]
+        ] + [len(difficulty_ranks)]
+        n_levels = len(self._level_category_offsets) - 1
+        if self._difficulty_curve is None:
+            self._round_level_weights = [
+                [1 if level_idx == round_idx else 0 for level_idx in range(n_levels)]
+                for round_idx in range(n_levels)
+            ]
+            return
+        if any(len(round_weights) != n_levels for round_weights in self._difficulty_curve):
+            raise ValueError(
+                f"Each round of the difficulty curve must have a weight for each of the {n_levels} "
+                "difficulty levels."
+            )
+        self._round_level_weights = self._difficulty_curve
+
+    def _get_level_weights_tree(self) -> FenwickTree:
+        """Return the tree holding the weight of each difficulty level in the current round, which
+        is zero for the levels without questions left ("difficulty" draw mode).
+        """
+        curve_round = min(
+            self._question_position // self._questions_per_round,
+            len(self._round_level_weights) - 1
+        )
+        if self._level_weights_tree is None or self._level_weights_round != curve_round:
+            level_first_remaining_questions = [
+                self._remaining_questions_tree.prefix_sum(category_offset)
+                for category_offset in self._level_category_offsets
+            ]
+            self._level_weights_tree = FenwickTree([
+                weight if n_remaining_before != n_remaining_after else 0
+                for weight, n_remaining_before, n_remaining_after in zip(
+                    self._round_level_weights[curve_round],
+                    level_first_remaining_questions,
+                    level_first_remaining_questions[1:]
+                )
+            ])
+            self._level_weights_round = curve_round
+        return self._level_weights_tree
+
+    def _select_difficulty_category(self, value: float, weights_tree: FenwickTree) -> int:
+        """Select the category of the given random value in [0, 1) ("difficulty" draw mode).
+
+        The value selects a difficulty level by the level weights of the round, and the position
+        of the value in the level selects a category of the level by the category weights, hence a
+        single random value is drawn per question. Both steps are lookups in Fenwick trees.
+        """
+        level_weights_tree = self._get_level_weights_tree()
+        if level_weights_tree.total == 0:
+            # The levels of the round are out of questions, draw from all levels
+            return weights_tree.find(value * weights_tree.total)
+        level_value = value * level_weights_tree.total
+        level_idx = level_weights_tree.find(level_value)
+        while level_weights_tree.get(level_idx) == 0:
+            # The rounding of the float weights may select a trailing level of zero weight
+            level_idx -= 1
+        level_start_value = level_weights_tree.prefix_sum(level_idx)
+        level_fraction = (level_value - level_start_value) / level_weights_tree.get(level_idx)
+        first_category_weight = weights_tree.prefix_sum(self._level_category_offsets[level_idx])
+        level_end_weight = weights_tree.prefix_sum(self._level_category_offsets[level_idx + 1])
+        level_total = level_end_weight - first_category_weight
+        return weights_tree.find(
+            first_category_weight + min(int(level_fraction * level_total), level_total - 1)
+        )
+
+    @staticmethod
+    def _check_permutation_weights(weight_calculation_method, weights_override):
+        """Raise ValueError if the weights are not supported by the "permutation" draw mode."""
+        if weight_calculation_method != 'Weighted' \
+                or (len(weights_override) != 0 and sum(weights_override) != 0):
+            raise ValueError(
+                'The "permutation" draw mode only supports the \'Weighted\' weight calculation '
+                'method without weights_override.'
+            )
+
+    def _draw_question_category(
+        self,
+        weight_calculation_method,
+        weights_override
+    ) -> Optional[int]:
+        """Randomly select the category of the next question and record the draw.
+
+        Returns None if we are out of questions. The returned category has no questions left
+        only if it is selected by weights_override, in which case nothing is recorded.
+        """
+        is_weights_overridden = len(weights_override) != 0 and sum(weights_override) != 0
+        if is_weights_overridden and self._draw_mode == "difficulty":
+            raise ValueError('The "difficulty" draw mode does not support weights_override.')
+        weights_tree = self._get_category_weights_tree(weight_calculation_method)
+        if weights_tree.total == 0:
+            return None
+
+        if self._question_position < self._num_frozen_draws:
+            return self._draw_frozen_question_category()
+        if self._question_position == len(self._rng_checkpoints) * _RNG_CHECKPOINT_INTERVAL:
+            self._rng_checkpoints.append(self._rng.get_compact_state())
+
+        # Choose the next question's category
+        is_debug_logged = self._logging.isEnabledFor(logging.DEBUG)
+        if is_weights_overridden:
+            if is_debug_logged:
+                self._logging.debug("Weights are overridden.")
+            category_idx = self._rng.choices(
+                range(len(self._question_categorys)),
+                weights=weights_override,
                 k=1
             )[0]
-            self._logging.debug(f'Selected Question Category is: {question_category}')
-            question_category_database = self._ref_dict[question_category]
+        else:
+            if len(weights_override) != 0 and is_debug_logged:
+                self._logging.debug(
+                    "Weights override invalid! Fall back to default normalization."
+                )
+            if self._draw_mode == "difficulty":
+                category_idx = self._select_difficulty_category(self._rng.random(), weights_tree)
+            else:
+                category_idx = weights_tree.find(self._rng.random() * weights_tree.total)
+        if is_debug_logged:
+            self._logging.debug(
+                f'Selected Question Category is: {self._question_categorys[category_idx]}'
+            )
 
-            # Return the next TriviaQuestion to be displayed.
-            next_question_df, is_question_valid = question_category_database.get_next_question()
-            question_column_str = question_category_database.question_column_title
-            answer_column_str = question_category_database.answer_column_title
-            question_options_list = question_category_database.question_option_columns_list
-
-            columns_to_get = [question_column_str, answer_column_str] + question_options_list
-            return TriviaQuestion(
-                is_question_valid=is_question_valid,
-                data=next_question_df.loc[:, columns_to_get],
-                question_column_str=question_column_str,
-                answer_column_str=answer_column_str,
-                question_options_list=question_options_list,
-                question_category=question_category)
-
-    def _calculate_weights_of_question_categories(
+        if self._remaining_questions_tree.get(category_idx) == 0:
+            # The random state no longer matches the recorded draws after this question
+            self._truncate_draw_history()
+            return category_idx
+
+        self._record_draw(category_idx)
+        return category_idx
+
+    def _draw_frozen_question_category(self) -> int:
+        """Repeat the recorded draw of the next question, which was made before questions were
+        added or removed."""
+        category_idx = self._draw_history[self._question_position]
+        self._record_draw(category_idx)
+        if self._question_position == self._num_frozen_draws:
+            # Go on with the random state the game had when the questions were patched
+            self._rng.set_compact_state(self._frozen_rng_state)
+        return category_idx
+
+    def _record_draw(self, category_idx: int):
+        """Record that a question of the category (which has questions left) is drawn."""
+        if self._question_position < len(self._draw_history) \
+                and self._draw_history[self._question_position] != category_idx:
+            self._truncate_draw_history()
+        if self._question_position == len(self._draw_history):
+            self._draw_history.append(category_idx)
+        self._question_position += 1
+        self._update_category_weights(category_idx)
+
+    def _get_category_weights_tree(
         self,
         weight_calculation_method: str = 'Weighted'
-    ) -> List[float]:
-        """Return a weight value for each question category.
+    ) -> FenwickTree:
+        """Return the tree holding a weight value for each question category.
 
         For now, either equal weights are given to each category or
         the weights are the number of questions left for each category.
         """
-        n_questions_left = [
+        if weight_calculation_method != 'Weighted':
+            # Equal weights, but if we are out of questions for a particular question
+            # category, the weight is 0 for that type
+            return self._available_categories_tree
+        return self._remaining_questions_tree
+
+    def _reset_category_weights(self):
+        """Rebuild the category weights from the number of questions left in each category."""
+        self._set_category_weights([
             question_category.get_num_of_remaining_questions()
             for question_category in self._ref_dict.values()
-        ]
-        self._logging.debug(f'n_questions_left = {n_questions_left}')
-        if weight_calculation_method != 'Weighted':
-            # Assign equal weights, but if we are out of questions for a particular question
-            # category, set the weight as 0 for that type
-            weights = [
-                1.0 if n_questions_left[i] != 0 else 0.0
-                for i in range(len(n_questions_left))
-            ]
-        else:
-            weights = n_questions_left
-        return weights
+        ])
+
+    @record_latency("weights")
+    def _set_category_weights(self, n_questions_left: List[int]):
+        """Set the category weights from the given number of questions left in each category."""
+        self._remaining_questions_tree = FenwickTree(n_questions_left)
+        self._available_categories_tree = FenwickTree(
+            [1 if n_questions != 0 else 0 for n_questions in n_questions_left]
+        )
+        self._level_weights_tree = None
+
+    def _update_category_weights(self, category_idx: int):
+        """Update the category weights after a question of the given category is asked."""
+        self._remaining_questions_tree.add(category_idx, -1)
+        if self._remaining_questions_tree.get(category_idx) == 0:
+            self._available_categories_tree.set(category_idx, 0)
+            # The difficulty level of the category may be out of questions
+            self._level_weights_tree = None
+
+    def _reset_draw_history(self):
+        """Forget the draws of the previous game and checkpoint the random state of the new one."""
+        self._question_position = 0
+        self._draw_history = array('i')
+        self._rng_checkpoints = [self._rng.get_compact_state()]
+        self._num_frozen_draws = 0
+        self._frozen_rng_state = None
+
+    def _truncate_draw_history(self):
+        """Forget the recorded draws (and the checkpoints) after the current question."""
+        del self._draw_history[self._question_position:]
+        del self._rng_checkpoints[self._question_position // _RNG_CHECKPOINT_INTERVAL + 1:]
+
+    def _restore_rng_checkpoint(self, checkpoint_idx: int):
+        """Restore the game state to the one at the given random state checkpoint."""
+        self._question_position = checkpoint_idx * _RNG_CHECKPOINT_INTERVAL
+        self._rng.set_compact_state(self._rng_checkpoints[checkpoint_idx])
+        n_asked_questions = np.bincount(
+            np.frombuffer(self._draw_history, dtype=np.intc)[:self._question_position],
+            minlength=len(self._question_categorys)
+        )
+        self._set_category_weights([
+            question_category.num_questions - int(n_asked)
+            for question_category, n_asked in zip(self._ref_dict.values(), n_asked_questions)
+        ])
+        self._is_game_over = False
 
 
 if __name__ == "__main__":
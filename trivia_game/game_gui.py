@@ -1,8 +1,9 @@
 from importlib.resources import path
+from typing import List, Optional
 
 from PyQt6 import uic
 from PyQt6.QtWidgets import QSizePolicy
-from PyQt6.QtWidgets import QMessageBox, QMainWindow
+from PyQt6.QtWidgets import QInputDialog, QMessageBox, QMainWindow, QProgressBar
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt
 
@@ -32,9 +33,16 @@ class GameGUI(QMainWindow):
         self.image_right.setPixmap(scaled_pixmap)
 
         # Disable the buttons until the game starts.
-        self.next_question_button.setEnabled(False)
-        self.show_answer_button.setEnabled(False)
-        self.goto_question_button.setEnabled(False)
+        self.set_game_buttons_enabled(False)
+
+        # Disable the start button until the questions are loaded, which is shown in the status bar
+        self.start_button.setEnabled(False)
+        self.loading_progress_bar = QProgressBar()
+        # The number of rows of the question bank is unknown, hence a busy indicator
+        self.loading_progress_bar.setRange(0, 0)
+        self.loading_progress_bar.setMaximumWidth(200)
+        self.statusbar.addPermanentWidget(self.loading_progress_bar)
+        self.statusbar.showMessage("Loading the questions...")
 
         # Hide Answer Blocks until the game starts
         self.fix_answer_label.setHidden(True)
@@ -73,11 +81,78 @@ class GameGUI(QMainWindow):
         self.show_question(question_text)
         self.show_question_options(question_options)
 
+    def show_loading_progress(self, n_rows_read: int):
+        """Show the number of rows of the question bank read so far."""
+        self.statusbar.showMessage(f"Loading the questions... {n_rows_read:,} rows read")
+
+    def update_after_loading(self, n_total_questions: int):
+        """Hide the loading progress and enable the start button."""
+        self.loading_progress_bar.hide()
+        self.statusbar.showMessage(f"{n_total_questions:,} questions are loaded.")
+        self.start_button.setEnabled(True)
+
+    def show_loading_error(self, error_text: str):
+        """Hide the loading progress and show why the questions could not be loaded."""
+        self.loading_progress_bar.hide()
+        self.statusbar.showMessage("The questions could not be loaded.")
+        QMessageBox.critical(self, "Loading the questions failed", error_text)
+
+    def show_reloaded_questions(self, n_changed_questions: int, n_total_questions: int):
+        """Show the number of the questions changed by reloading the question bank."""
+        self.statusbar.showMessage(
+            f"The question bank is reloaded: {n_changed_questions:,} questions changed, "
+            f"{n_total_questions:,} questions in the game."
+        )
+
+    def show_reload_error(self, error_text: str):
+        """Show why the question bank could not be reloaded, the game goes on with its questions."""
+        self.statusbar.showMessage(f"The question bank could not be reloaded: {error_text}")
+
+    def ask_to_resume_game(self, seed_num: int, question_number: int) -> bool:
+        """Ask whether to resume the saved game of the seed at the question."""
+        reply = QMessageBox.question(
+            self,
+            "Resume the game",
+            f"Resume the saved game of seed {seed_num} at question {question_number}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        return reply == QMessageBox.StandardButton.Yes
+
+    def ask_for_search_query(self) -> Optional[str]:
+        """Ask for the words of the question to find, return None if cancelled."""
+        query, ok = QInputDialog.getText(
+            self,
+            "Find a question",
+            "Words of the question, its answer or its options (or their beginnings):"
+        )
+        return query if ok else None
+
+    def choose_search_result(self, result_texts: List[str]) -> Optional[int]:
+        """Ask which of the found questions to go to, return its index or None if cancelled."""
+        if len(result_texts) == 0:
+            QMessageBox.information(self, "Find a question", "No question is found.")
+            return None
+        result_text, ok = QInputDialog.getItem(
+            self,
+            "Find a question",
+            f"{len(result_texts)} questions are found, go to:",
+            result_texts,
+            0,
+            False
+        )
+        return result_texts.index(result_text) if ok else None
+
+    def set_game_buttons_enabled(self, is_enabled: bool):
+        """Enable or disable the buttons playing the game, e.g. while going to a question."""
+        self.next_question_button.setEnabled(is_enabled)
+        self.show_answer_button.setEnabled(is_enabled)
+        self.goto_question_button.setEnabled(is_enabled)
+        self.find_question_button.setEnabled(is_enabled)
+
     def update_after_start_game(self, seed_num):
         """Enable the buttons and hide the start game button."""
-        self.next_question_button.setEnabled(True)
-        self.show_answer_button.setEnabled(True)
-        self.goto_question_button.setEnabled(True)
+        self.set_game_buttons_enabled(True)
         self.user_input_label.setText(f"Seed: {seed_num}")
         self.fix_answer_label.setHidden(False)
         self.start_button.hide()
@@ -19,6 +19,10 @@ def create_logger(name, logging_level_str='critical'):
     else:
         raise (KeyError('Check logging_level_str'))
 
+    if logger.handlers:
+        # The logger is already created, e.g. by another game engine of the same process
+        return logger
+
     # Give Output to Console (Standard Output)
     # Create a color formatter
     formatter = colorlog.ColoredFormatter(
@@ -0,0 +1,187 @@
+"""Opt-in counters and latency histograms of the game engine and the data loader.
+
+A GameMetrics object is given to the GameEngine (or the DataLoader) to collect the metrics, and
+it can be shared by many engines, e.g. all the sessions of the game server. Only the methods of
+the objects given metrics are timed, so without metrics, the only cost left is checking for them
+before incrementing a counter.
+"""
+import bisect
+import functools
+import json
+import math
+import time
+from typing import Dict, List
+
+# Ways of formatting the metrics, see format_metrics()
+METRICS_FORMATS = ["json", "prometheus"]
+# Upper bounds of the latency histogram buckets in seconds, 1-2.5-5 steps from 1µs to 10s
+LATENCY_BUCKET_BOUNDS = [
+    float(f"{mantissa}e{exponent}") for exponent in range(-6, 1) for mantissa in [1, 2.5, 5]
+] + [10.0]
+_METRIC_NAME_PREFIX = "trivia_game"
+
+
+class LatencyHistogram:
+    """Number of the observed latencies in each bucket of LATENCY_BUCKET_BOUNDS."""
+    __slots__ = ('bucket_counts', 'count', 'sum_seconds', 'max_seconds')
+
+    def __init__(self):
+        # The last bucket holds the latencies above the largest bound
+        self.bucket_counts = [0] * (len(LATENCY_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds: float):
+        """Add an observed latency."""
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def get_quantile(self, quantile: float) -> float:
+        """Return the upper bound of the bucket holding the quantile of the latencies.
+
+        The latencies above the largest bound are bounded by the maximum latency instead.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(math.ceil(quantile * self.count), 1)
+        for bucket_idx, cumulative_count in enumerate(self._get_cumulative_counts()):
+            if cumulative_count >= rank:
+                break
+        if bucket_idx == len(LATENCY_BUCKET_BOUNDS):
+            return self.max_seconds
+        return min(LATENCY_BUCKET_BOUNDS[bucket_idx], self.max_seconds)
+
+    def to_dict(self) -> dict:
+        """Return the number, the sum and the mean, median, 99th percentile and maximum."""
+        return {
+            "count": self.count,
+            "sum_seconds": self.sum_seconds,
+            "mean_seconds": self.sum_seconds / self.count if self.count else 0.0,
+            "p50_seconds": self.get_quantile(0.5),
+            "p99_seconds": self.get_quantile(0.99),
+            "max_seconds": self.max_seconds,
+        }
+
+    def _get_cumulative_counts(self) -> List[int]:
+        cumulative_counts = []
+        cumulative_count = 0
+        for bucket_count in self.bucket_counts:
+            cumulative_count += bucket_count
+            cumulative_counts.append(cumulative_count)
+        return cumulative_counts
+
+
+class GameMetrics:
+    """Counters and latency histograms, both identified by their names.
+
+    The latency histograms are:
+    - "load": loading the question bank (DataLoader.load_data()), either from the question bank
+      cache or by parsing the question bank ("parse", DataLoader.parse_data()).
+    - "reset": starting a new game (GameEngine.initialize_game()).
+    - "draw": drawing a question (GameEngine.get_next_question()), or a batch of questions
+      (GameEngine.get_next_questions(), as "draw_batch").
+    - "weights": computing the weights of the question categories, at reset and at seek.
+    - "seek": going to a question (GameEngine.seek()).
+    - "patch": patching the game with the changes of a reloaded question bank
+      (GameEngine.apply_question_changes()).
+    """
+    def __init__(self):
+        self.counters: Dict[str, int] = dict()
+        self.latency_histograms: Dict[str, LatencyHistogram] = dict()
+
+    def increment(self, name: str, value: int = 1):
+        """Increment the counter of the given name."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe_latency(self, name: str, seconds: float):
+        """Add an observed latency to the histogram of the given name."""
+        latency_histogram = self.latency_histograms.get(name)
+        if latency_histogram is None:
+            latency_histogram = self.latency_histograms[name] = LatencyHistogram()
+        latency_histogram.observe(seconds)
+
+    def to_dict(self) -> dict:
+        """Return the counters and the summaries of the latency histograms."""
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "latencies": {
+                name: latency_histogram.to_dict()
+                for name, latency_histogram in sorted(self.latency_histograms.items())
+            },
+        }
+
+    def to_prometheus_text(self) -> str:
+        """Return the counters and the latency histograms in the Prometheus text format."""
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            metric_name = f"{_METRIC_NAME_PREFIX}_{name}_total"
+            lines += [f"# TYPE {metric_name} counter", f"{metric_name} {value}"]
+        for name, latency_histogram in sorted(self.latency_histograms.items()):
+            metric_name = f"{_METRIC_NAME_PREFIX}_{name}_seconds"
+            lines.append(f"# TYPE {metric_name} histogram")
+            bucket_bounds = [repr(bound) for bound in LATENCY_BUCKET_BOUNDS] + ["+Inf"]
+            for bucket_bound, cumulative_count in zip(
+                bucket_bounds,
+                latency_histogram._get_cumulative_counts()
+            ):
+                lines.append(f'{metric_name}_bucket{{le="{bucket_bound}"}} {cumulative_count}')
+            lines += [
+                f"{metric_name}_sum {latency_histogram.sum_seconds!r}",
+                f"{metric_name}_count {latency_histogram.count}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def format_metrics(metrics: GameMetrics, metrics_format: str = "json") -> str:
+    """Format the metrics as JSON or as Prometheus text, one of METRICS_FORMATS."""
+    if metrics_format not in METRICS_FORMATS:
+        raise ValueError(
+            f"metrics_format must be one of {METRICS_FORMATS}, got '{metrics_format}'."
+        )
+    if metrics_format == "prometheus":
+        return metrics.to_prometheus_text()
+    return json.dumps(metrics.to_dict(), indent=2) + "\n"
+
+
+def record_latency(name: str):
+    """Mark a method to record its latency in the histogram of the given name.
+
+    The method is left unchanged, and only the objects given to instrument() record the latencies
+    of their marked methods, so the objects without metrics pay nothing for them.
+    """
+    def decorator(method):
+        method._latency_histogram_name = name
+        return method
+    return decorator
+
+
+def instrument(obj, metrics: GameMetrics):
+    """Record the latencies of the methods of the object marked by record_latency() in metrics.
+
+    Each marked method is replaced by a timed one in the object's attributes, so the calls from
+    the object itself are timed as well.
+    """
+    for attribute_name in dir(type(obj)):
+        method = getattr(type(obj), attribute_name)
+        latency_histogram_name = getattr(method, '_latency_histogram_name', None)
+        if latency_histogram_name is not None:
+            setattr(
+                obj,
+                attribute_name,
+                _create_timed_method(getattr(obj, attribute_name), metrics, latency_histogram_name)
+            )
+
+
+def _create_timed_method(bound_method, metrics: GameMetrics, latency_histogram_name: str):
+    @functools.wraps(bound_method)
+    def timed_method(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return bound_method(*args, **kwargs)
+        finally:
+            metrics.observe_latency(latency_histogram_name, time.perf_counter() - start_time)
+    return timed_method
@@ -0,0 +1,17 @@
+"""Names of the choices of the game options.
+
+Kept free of imports, so that the command line arguments can be parsed (and the help printed)
+without importing the game engine and its dependencies.
+"""
+# Ways of drawing the questions, see GameEngine
+DRAW_MODES = ["category", "permutation", "difficulty"]
+# Random number generators shuffling the questions, see create_random_generator()
+RNG_BACKENDS = ["python", "numpy"]
+# Usages of the compiled question bank cache, see QuestionBankCache
+CACHE_MODES = ["use", "rebuild", "off"]
+# Handlings of the duplicate questions of the question bank, see DataLoader.load_data()
+DUPLICATE_MODES = ["off", "report", "drop"]
+# Formats of the question bank files, see QUESTION_BANK_READERS
+QUESTION_BANK_FORMATS = ["excel", "csv", "parquet", "jsonl"]
+# Formats of the game packets, see generate_game_packets()
+PACKET_FORMATS = ["csv", "jsonl"]
@@ -0,0 +1,209 @@
+"""Generate the question order of many games (one per seed) in parallel, as printable packets.
+
+Each worker process loads the question bank once and plays the games of the seeds it is given.
+The packets are formatted by the workers and written in the order of the seeds, either as CSV
+(one row per question) or as JSON Lines (one JSON object per game).
+"""
+import csv
+import io
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from trivia_game.data_processing import DataLoader
+from trivia_game.game_engine import GameEngine
+from trivia_game.game_options import PACKET_FORMATS
+
+_SEED_RANGE_PATTERN = re.compile(r"^\s*(-?\d+)\s*-\s*(-?\d+)\s*$")
+# Game engine of the worker process, created once by _initialize_worker()
+_worker_game_engine = None
+_worker_packet_options = dict()
+
+
+def parse_seeds(seeds_str: str) -> List[int]:
+    """Parse a comma separated list of seeds and inclusive seed ranges, e.g. "1-10,42"."""
+    seeds = []
+    for seeds_item in seeds_str.split(','):
+        seed_range_match = _SEED_RANGE_PATTERN.match(seeds_item)
+        try:
+            if seed_range_match:
+                first_seed, last_seed = map(int, seed_range_match.groups())
+                if first_seed > last_seed:
+                    raise ValueError
+                seeds.extend(range(first_seed, last_seed + 1))
+            else:
+                seeds.append(int(seeds_item))
+        except ValueError:
+            raise ValueError(
+                f"Invalid seed '{seeds_item.strip()}', seeds must be integers or ranges such as "
+                "'1-10' separated by commas."
+            )
+    return seeds
+
+
+def generate_game_packets(
+    seeds: Iterable[int],
+    question_category_column_name: str,
+    data_info: dict,
+    data_path: str,
+    output_file: TextIO,
+    packet_format: str = "csv",
+    n_workers: int = 1,
+    cache_mode: str = "use",
+    question_bank_format=None,
+    duplicate_mode: str = "off",
+    rng_backend: str = "python",
+    draw_mode: str = "category",
+    weight_calculation_method: str = "Weighted",
+    chunk_size: int = 16,
+    difficulty_curve: Optional[List[List[float]]] = None,
+    questions_per_round: int = 10,
+):
+    """Write the packet of the game of each seed to the output file.
+
+    With more than one worker, the games are played in a pool of n_workers processes. The
+    question bank is loaded here first, so that the workers load it from the compiled cache
+    (unless cache_mode is "off").
+    """
+    if packet_format not in PACKET_FORMATS:
+        raise ValueError(f"packet_format must be one of {PACKET_FORMATS}, got '{packet_format}'.")
+
+    def get_worker_arguments(worker_cache_mode):
+        return (
+            question_category_column_name,
+            data_info,
+            data_path,
+            worker_cache_mode,
+            question_bank_format,
+            duplicate_mode,
+            rng_backend,
+            draw_mode,
+            weight_calculation_method,
+            packet_format,
+            difficulty_curve,
+            questions_per_round,
+        )
+
+    # Load the question bank once, which writes the cache read by the workers
+    _initialize_worker(*get_worker_arguments(cache_mode))
+    if packet_format == "csv":
+        output_file.write(_format_csv_header(_worker_packet_options['n_options']))
+
+    if n_workers <= 1:
+        for packet in map(_create_game_packet, seeds):
+            output_file.write(packet)
+        return
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_initialize_worker,
+        initargs=get_worker_arguments("off" if cache_mode == "off" else "use"),
+    ) as executor:
+        for packet in executor.map(_create_game_packet, seeds, chunksize=chunk_size):
+            output_file.write(packet)
+
+
+def _initialize_worker(
+    question_category_column_name,
+    data_info,
+    data_path,
+    cache_mode,
+    question_bank_format,
+    duplicate_mode,
+    rng_backend,
+    draw_mode,
+    weight_calculation_method,
+    packet_format,
+    difficulty_curve,
+    questions_per_round,
+):
+    """Load the question bank into the game engine of this process."""
+    global _worker_game_engine
+    data_loader = DataLoader(
+        question_category_column_name=question_category_column_name,
+        data_info=data_info,
+        logging_level_str='none',
+    )
+    question_category_list = data_loader.load_data(
+        data_path,
+        cache_mode=cache_mode,
+        question_bank_format=question_bank_format,
+        duplicate_mode=duplicate_mode,
+    )
+    _worker_game_engine = GameEngine(
+        logging_level_str='none',
+        rng_backend=rng_backend,
+        draw_mode=draw_mode,
+        difficulty_curve=difficulty_curve,
+        questions_per_round=questions_per_round,
+    )
+    n_total_questions = _worker_game_engine.set_question_categories(question_category_list)
+    _worker_packet_options.update({
+        'n_total_questions': n_total_questions,
+        'n_options': max(
+            [len(category.question_option_columns_list) for category in question_category_list],
+            default=0
+        ),
+        'weight_calculation_method': weight_calculation_method,
+        'packet_format': packet_format,
+    })
+
+
+def _create_game_packet(seed: int) -> str:
+    """Play the game of the seed in this process and return its formatted packet."""
+    _worker_game_engine.initialize_game(seed=seed)
+    questions = _worker_game_engine.get_next_questions(
+        _worker_packet_options['n_total_questions'],
+        _worker_packet_options['weight_calculation_method'],
+    )
+    rows = (
+        (
+            question_number,
+            question.get_question_category_text(),
+            question.get_question_text(),
+            question.get_answer_text(),
+            question.get_question_options(),
+        )
+        for question_number, question in enumerate(questions, start=1)
+    )
+    if _worker_packet_options['packet_format'] == "csv":
+        return _format_csv_rows(seed, rows, _worker_packet_options['n_options'])
+    return _format_json_packet(seed, rows)
+
+
+def _format_csv_header(n_options: int) -> str:
+    option_columns = [f"option_{option_idx}" for option_idx in range(1, n_options + 1)]
+    return _format_csv_lines([
+        ["seed", "question_number", "category", "question", "answer", *option_columns]
+    ])
+
+
+def _format_csv_rows(seed: int, rows: Iterator[tuple], n_options: int) -> str:
+    # The option columns of the questions with fewer options are left empty
+    return _format_csv_lines(
+        [seed, question_number, category, question, answer, *options, *empty_options]
+        for question_number, category, question, answer, options in rows
+        for empty_options in [[""] * (n_options - len(options))]
+    )
+
+
+def _format_csv_lines(lines) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(lines)
+    return buffer.getvalue()
+
+
+def _format_json_packet(seed: int, rows: Iterator[tuple]) -> str:
+    return json.dumps({
+        "seed": seed,
+        "questions": [
+            {
+                "question_number": question_number,
+                "category": category,
+                "question": question,
+                "answer": answer,
+                "options": options,
+            }
+            for question_number, category, question, answer, options in rows
+        ],
+    }, ensure_ascii=False) + "\n"
@@ -0,0 +1,206 @@
+"""Random number generators owned by a single game, so that games do not share a random state.
+
+Each generator provides seed(), random(), shuffle() and choices() as the random module does,
+random_batch() to draw many random() values at once, and get_compact_state()/set_compact_state()
+to checkpoint the state of the random() draws. fill_permutation() shuffles the question indices
+into an array in place, and create_deferred_permutation() returns a shuffle which can be done
+later (or never), if the generator supports it.
+"""
+import bisect
+import functools
+import itertools
+import random
+from array import array
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from trivia_game.game_options import RNG_BACKENDS
+
+# Number of random() draws the NumPy backend generates at once
+_NUMPY_DRAW_BUFFER_SIZE = 256
+
+
+class PythonRandomGenerator(random.Random):
+    """Mersenne Twister generator, giving the same sequences as the random module for a seed."""
+    def random_batch(self, n: int) -> List[float]:
+        """Return the next n random() values."""
+        random = self.random
+        return [random() for _ in range(n)]
+
+    def fill_permutation(self, order: array):
+        """Fill the array with 0, 1, ..., len(order) - 1 in a random order, as shuffle() does."""
+        order[:] = array(order.typecode, generate_random_permutation(len(order), self))
+
+    def create_deferred_permutation(self, stream_idx: int) -> Optional[Callable[[array], None]]:
+        """Return None, since the shuffles consume the random() draws, so they cannot be deferred.
+
+        Hence the shuffles must be done in order when the game starts, which keeps the games of
+        the seeds the same as the ones of the random module.
+        """
+        return None
+
+    def get_compact_state(self) -> tuple:
+        """Return the state with the Mersenne Twister words packed in an array."""
+        version, internal_state, gauss_next = self.getstate()
+        return version, array('I', internal_state), gauss_next
+
+    def set_compact_state(self, state: tuple):
+        """Set the state from a state returned by get_compact_state()."""
+        version, internal_state, gauss_next = state
+        self.setstate((version, tuple(internal_state), gauss_next))
+
+
+class NumpyRandomGenerator:
+    """PCG64 generator of NumPy, which shuffles large question categories much faster.
+
+    The seed is split into two independent streams, one for the random() draws and one for the
+    shuffles, so the compact state only needs to hold the former. The shuffle stream is further
+    split into a stream per question category, so that each category can be shuffled lazily, i.e.
+    when its first question is drawn (see create_deferred_permutation()). The random() draws are
+    generated in batches of _NUMPY_DRAW_BUFFER_SIZE to avoid the NumPy call overhead per draw.
+    Note that the sequences are different from the ones of the random module for the same seed.
+    """
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Initialize the random streams from the seed (any integer), or from OS entropy."""
+        seed_sequence = np.random.SeedSequence(None if seed is None else seed % (1 << 64))
+        draw_seed_sequence, shuffle_seed_sequence = seed_sequence.spawn(2)
+        self._shuffle_seed_sequence = shuffle_seed_sequence
+        self._draw_generator = np.random.Generator(np.random.PCG64(draw_seed_sequence))
+        self._shuffle_generator = np.random.Generator(np.random.PCG64(shuffle_seed_sequence))
+        self._draw_buffer = []
+        self._draw_buffer_idx = 0
+        self._draw_buffer_state = self._draw_generator.bit_generator.state
+
+    def random(self) -> float:
+        """Return the next random float in [0, 1)."""
+        if self._draw_buffer_idx == len(self._draw_buffer):
+            self._fill_draw_buffer()
+        value = self._draw_buffer[self._draw_buffer_idx]
+        self._draw_buffer_idx += 1
+        return value
+
+    def random_batch(self, n: int) -> List[float]:
+        """Return the next n random() values, the same as n random() calls would."""
+        values = []
+        while len(values) < n:
+            if self._draw_buffer_idx == len(self._draw_buffer):
+                self._fill_draw_buffer()
+            end_idx = min(self._draw_buffer_idx + n - len(values), len(self._draw_buffer))
+            values.extend(self._draw_buffer[self._draw_buffer_idx:end_idx])
+            self._draw_buffer_idx = end_idx
+        return values
+
+    def shuffle(self, x: list):
+        """Shuffle the list in place."""
+        order = self._shuffle_generator.permutation(len(x))
+        x[:] = [x[idx] for idx in order]
+
+    def fill_permutation(self, order: array):
+        """Fill the array ('I' type code) with 0, 1, ..., len(order) - 1 in a random order.
+
+        The array is shuffled in place as a NumPy view, without creating a list.
+        """
+        _fill_permutation_in_place(self._shuffle_generator, order)
+
+    def create_deferred_permutation(self, stream_idx: int) -> Callable[[array], None]:
+        """Return a function filling an array as fill_permutation() does, by the stream_idx'th
+        shuffle stream of the seed.
+
+        The permutation depends only on the seed and stream_idx, so it can be done any time later,
+        or never if no question is drawn from the array. Creating the function is cheap, while
+        creating the random generator of the stream is left to the function.
+        """
+        return functools.partial(
+            _fill_deferred_permutation,
+            self._shuffle_seed_sequence.entropy,
+            self._shuffle_seed_sequence.spawn_key + (stream_idx,),
+        )
+
+    def choices(self, population, weights, k=1) -> list:
+        """Return k elements of the population, chosen with probabilities proportional to weights.
+
+        Consumes a single random() draw per element, as random.choices() does.
+        """
+        cumulative_weights = list(itertools.accumulate(weights))
+        total = cumulative_weights[-1] + 0.0
+        hi = len(cumulative_weights) - 1
+        return [
+            population[bisect.bisect(cumulative_weights, self.random() * total, 0, hi)]
+            for _ in range(k)
+        ]
+
+    def get_compact_state(self) -> tuple:
+        """Return the state of the random() draws."""
+        if self._draw_buffer_idx < len(self._draw_buffer):
+            return self._draw_buffer_state, self._draw_buffer_idx
+        return self._draw_generator.bit_generator.state, 0
+
+    def set_compact_state(self, state: tuple):
+        """Set the state of the random() draws from a state returned by get_compact_state()."""
+        draw_generator_state, draw_buffer_idx = state
+        self._draw_generator.bit_generator.state = draw_generator_state
+        self._draw_buffer = []
+        self._draw_buffer_idx = 0
+        if draw_buffer_idx > 0:
+            self._fill_draw_buffer()
+            self._draw_buffer_idx = draw_buffer_idx
+
+    def _fill_draw_buffer(self):
+        """Generate the next batch of random() draws."""
+        self._draw_buffer_state = self._draw_generator.bit_generator.state
+        self._draw_buffer = self._draw_generator.random(_NUMPY_DRAW_BUFFER_SIZE).tolist()
+        self._draw_buffer_idx = 0
+
+
+def generate_random_permutation(n: int, rng: random.Random) -> List[int]:
+    """Return 0, 1, ..., n - 1 in a random order, the same as rng.shuffle(list(range(n))) gives.
+
+    random.Random.shuffle() draws each swap position j < i + 1 by rejection sampling of
+    (i + 1).bit_length() random bits. The same draws are made here, but the bit length is
+    computed once for all i + 1 between two powers of 2, which saves a method call per question.
+    """
+    if not (isinstance(rng, random.Random) and type(rng).random is random.Random.random):
+        # Shuffled differently if random() is overridden, see random.Random._randbelow()
+        positions = list(range(n))
+        rng.shuffle(positions)
+        return positions
+    getrandbits = rng.getrandbits
+    positions = list(range(n))
+    i = n - 1
+    while i > 0:
+        n_bits = (i + 1).bit_length()
+        # Positions i whose i + 1 has n_bits bits, i.e. i + 1 >= 2 ** (n_bits - 1)
+        last_i = (1 << (n_bits - 1)) - 1
+        for i in range(i, last_i - 1, -1):
+            j = getrandbits(n_bits)
+            while j > i:
+                j = getrandbits(n_bits)
+            positions[i], positions[j] = positions[j], positions[i]
+        i = last_i - 1
+    return positions
+
+
+def _fill_deferred_permutation(entropy, spawn_key: tuple, order: array):
+    """Fill the array with a random permutation, by the generator of the given seed sequence."""
+    seed_sequence = np.random.SeedSequence(entropy, spawn_key=spawn_key)
+    _fill_permutation_in_place(np.random.Generator(np.random.PCG64(seed_sequence)), order)
+
+
+def _fill_permutation_in_place(generator: np.random.Generator, order: array):
+    """Fill the array ('I' type code) with a random permutation, through a NumPy view."""
+    order_view = np.frombuffer(order, dtype=np.uintc)
+    order_view[:] = np.arange(len(order_view), dtype=np.uintc)
+    generator.shuffle(order_view)
+
+
+def create_random_generator(rng_backend: str = "python", seed=None):
+    """Create a random number generator of the given backend, one of RNG_BACKENDS."""
+    if rng_backend == "python":
+        return PythonRandomGenerator(seed)
+    elif rng_backend == "numpy":
+        return NumpyRandomGenerator(seed)
+    raise ValueError(f"rng_backend must be one of {RNG_BACKENDS}, got '{rng_backend}'.")
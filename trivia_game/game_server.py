@@ -0,0 +1,406 @@
+"""Headless asyncio HTTP server hosting many trivia game sessions with a single question bank.
+
+The server speaks HTTP/1.1 with JSON bodies (and keep-alive connections):
+    POST   /sessions                      {"seed": 5} -> creates and starts a game session
+    POST   /sessions/<id>/start           {"seed": 5} -> restarts the game with the given seed
+    POST   /sessions/<id>/next            -> the next question
+    GET    /sessions/<id>/answer          -> the answer of the current question
+    POST   /sessions/<id>/goto            {"question_number": 9} -> goes to the given question
+    GET    /sessions/<id>                 -> the current question
+    DELETE /sessions/<id>                 -> ends the session
+    GET    /metrics                       -> the metrics of the games, if they are collected
+"""
+import asyncio
+import itertools
+import json
+import time
+from http import HTTPStatus
+from typing import List, Optional
+
+from trivia_game.data_processing import (
+    QuestionCategoryData,
+    split_question_categories_by_difficulty,
+)
+from trivia_game.game_engine import GameEngine, TriviaQuestion
+from trivia_game.game_logger import create_logger
+from trivia_game.game_metrics import GameMetrics
+
+_MAX_REQUEST_BODY_SIZE = 1 << 16
+_IDLE_SESSION_CHECK_PERIOD_SECONDS = 60.0
+
+
+class GameSessionError(Exception):
+    """Error of a request to a game session, which is reported to the client with the status."""
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class GameSession:
+    """A single game, played through a GameEngine as the TriviaGame GUI does."""
+    def __init__(self, session_id: str, game_engine: GameEngine, n_total_questions: int):
+        self.session_id = session_id
+        self.game_engine = game_engine
+        self.n_total_questions = n_total_questions
+        self.seed = None
+        self.question_counter = 0
+        self.is_game_over = False
+        self.current_question = TriviaQuestion()
+        self.last_access_time = time.monotonic()
+
+    def start(self, seed: int) -> dict:
+        """Start the game with the given seed."""
+        self.seed = seed
+        self.question_counter = 0
+        self.is_game_over = False
+        self.current_question = TriviaQuestion()
+        self.game_engine.initialize_game(seed=seed)
+        return self.to_dict()
+
+    def next_question(self) -> dict:
+        """Get the next question from the game engine."""
+        self._ensure_started()
+        self.current_question = self.game_engine.get_next_question()
+        if self.current_question.is_question_valid():
+            self.question_counter += 1
+            self.is_game_over = False
+        else:
+            self.is_game_over = True
+        return self.to_dict()
+
+    def go_to_question(self, question_number: int) -> dict:
+        """Go to the given question of the game played with the same seed."""
+        self._ensure_started()
+        self.current_question = self.game_engine.seek(question_number)
+        self.question_counter = min(max(question_number, 0), self.n_total_questions)
+        self.is_game_over = question_number > self.n_total_questions
+        return self.to_dict()
+
+    def show_answer(self) -> dict:
+        """Return the answer of the current question."""
+        self._ensure_started()
+        return {
+            'session_id': self.session_id,
+            'question_number': self.question_counter,
+            'answer': self.current_question.get_answer_text(),
+            'is_game_over': self.is_game_over,
+        }
+
+    def to_dict(self) -> dict:
+        """Return the state of the session and the current question."""
+        return {
+            'session_id': self.session_id,
+            'seed': self.seed,
+            'question_number': self.question_counter,
+            'n_total_questions': self.n_total_questions,
+            'is_game_over': self.is_game_over,
+            'category': self.current_question.get_question_category_text(),
+            'question': self.current_question.get_question_text(),
+            'options': self.current_question.get_question_options(),
+        }
+
+    def _ensure_started(self):
+        if self.seed is None:
+            raise GameSessionError(HTTPStatus.CONFLICT, "The game is not started yet.")
+
+
+class GameSessionManager:
+    """Create and keep the game sessions, which share the question categories loaded once.
+
+    The sessions are created on the event loop of the server, hence the "numpy" random backend
+    is the default: it shuffles the questions of each category at its first draw, whereas the
+    "python" backend shuffles all questions when a session is created.
+    """
+    def __init__(
+        self,
+        question_category_list: List[QuestionCategoryData],
+        max_sessions: int,
+        rng_backend: str = "numpy",
+        draw_mode: str = "category",
+        metrics: Optional[GameMetrics] = None,
+        difficulty_curve: Optional[List[List[float]]] = None,
+        questions_per_round: int = 10
+    ):
+        if draw_mode == "difficulty":
+            # Split once, rather than by the game engine of each session
+            question_category_list = split_question_categories_by_difficulty(
+                question_category_list
+            )
+        self._question_category_list = question_category_list
+        self.rng_backend = rng_backend
+        self.draw_mode = draw_mode
+        self.difficulty_curve = difficulty_curve
+        self.questions_per_round = questions_per_round
+        # Metrics shared by the game engines of all sessions
+        self.metrics = metrics
+        self.n_total_questions = sum(category.num_questions for category in question_category_list)
+        self.max_sessions = max_sessions
+        self._sessions: dict[str, GameSession] = dict()
+        self._session_ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create_session(self, seed: int) -> GameSession:
+        """Create a game session and start its game with the given seed."""
+        if len(self._sessions) >= self.max_sessions:
+            raise GameSessionError(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                f"Maximum number of sessions ({self.max_sessions}) is reached."
+            )
+        game_engine = GameEngine(
+            logging_level_str='none',
+            rng_backend=self.rng_backend,
+            draw_mode=self.draw_mode,
+            metrics=self.metrics,
+            difficulty_curve=self.difficulty_curve,
+            questions_per_round=self.questions_per_round,
+        )
+        game_engine.set_question_categories([
+            question_category.copy_for_new_game()
+            for question_category in self._question_category_list
+        ])
+        session = GameSession(str(next(self._session_ids)), game_engine, self.n_total_questions)
+        session.start(seed)
+        self._sessions[session.session_id] = session
+        return session
+
+    def get_session(self, session_id: str) -> GameSession:
+        """Return the session with the given id."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise GameSessionError(HTTPStatus.NOT_FOUND, f"Session {session_id} is not found.")
+        session.last_access_time = time.monotonic()
+        return session
+
+    def remove_session(self, session_id: str):
+        """End the session with the given id."""
+        if self._sessions.pop(session_id, None) is None:
+            raise GameSessionError(HTTPStatus.NOT_FOUND, f"Session {session_id} is not found.")
+
+    def remove_idle_sessions(self, max_idle_seconds: float) -> int:
+        """End the sessions which are not accessed for max_idle_seconds, return their number."""
+        oldest_access_time = time.monotonic() - max_idle_seconds
+        idle_session_ids = [
+            session_id for session_id, session in self._sessions.items()
+            if session.last_access_time < oldest_access_time
+        ]
+        for session_id in idle_session_ids:
+            del self._sessions[session_id]
+        return len(idle_session_ids)
+
+
+class GameServer:
+    """asyncio HTTP server exposing the sessions of a GameSessionManager."""
+    def __init__(
+        self,
+        session_manager: GameSessionManager,
+        max_idle_seconds: float = 6 * 3600.0,
+        logging_level_str: str = "none"
+    ):
+        self.session_manager = session_manager
+        self.max_idle_seconds = max_idle_seconds
+        self.logger = create_logger(name="GameServer", logging_level_str=logging_level_str)
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._idle_session_task: Optional[asyncio.Task] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> int:
+        """Start listening for connections, return the port (useful if the given port is 0)."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._idle_session_task = asyncio.create_task(self._remove_idle_sessions_periodically())
+        port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"Game server is listening on {host}:{port}.")
+        return port
+
+    async def serve_forever(self):
+        """Serve the connections until the server is closed."""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop the server."""
+        self._idle_session_task.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def handle_request(self, method: str, path: str, body: dict) -> tuple[HTTPStatus, dict]:
+        """Dispatch a request to the sessions, return the response status and the body."""
+        parts = [part for part in path.split('?', 1)[0].split('/') if part]
+        if parts == ['metrics'] and self.session_manager.metrics is not None:
+            if method != 'GET':
+                raise GameSessionError(
+                    HTTPStatus.METHOD_NOT_ALLOWED,
+                    f"{method} {path} is not allowed."
+                )
+            return HTTPStatus.OK, self.session_manager.metrics.to_dict()
+        if not parts or parts[0] != 'sessions' or len(parts) > 3:
+            raise GameSessionError(HTTPStatus.NOT_FOUND, f"Unknown path {path}.")
+        if len(parts) == 1:
+            if method == 'POST':
+                session = self.session_manager.create_session(_get_int(body, 'seed', 1))
+                return HTTPStatus.CREATED, session.to_dict()
+            elif method == 'GET':
+                return HTTPStatus.OK, {'n_sessions': len(self.session_manager)}
+        elif len(parts) == 2:
+            if method == 'GET':
+                return HTTPStatus.OK, self.session_manager.get_session(parts[1]).to_dict()
+            elif method == 'DELETE':
+                self.session_manager.remove_session(parts[1])
+                return HTTPStatus.OK, {'session_id': parts[1]}
+        else:
+            session = self.session_manager.get_session(parts[1])
+            action = parts[2]
+            if action == 'start' and method == 'POST':
+                return HTTPStatus.OK, session.start(_get_int(body, 'seed', 1))
+            elif action == 'next' and method == 'POST':
+                return HTTPStatus.OK, session.next_question()
+            elif action == 'answer' and method == 'GET':
+                return HTTPStatus.OK, session.show_answer()
+            elif action == 'goto' and method == 'POST':
+                return HTTPStatus.OK, session.go_to_question(_get_int(body, 'question_number'))
+            elif action not in ['start', 'next', 'answer', 'goto']:
+                raise GameSessionError(HTTPStatus.NOT_FOUND, f"Unknown path {path}.")
+        raise GameSessionError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} {path} is not allowed.")
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ):
+        """Serve the requests of a (keep-alive) connection until it is closed."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, keep_alive, body_bytes = await self._read_request(
+                        request_line,
+                        reader
+                    )
+                except _BadRequestError as err:
+                    # The rest of the request can not be skipped, hence the connection is closed
+                    writer.write(_format_response(
+                        HTTPStatus.BAD_REQUEST,
+                        {'error': str(err)},
+                        keep_alive=False
+                    ))
+                    await writer.drain()
+                    raise
+                try:
+                    body = json.loads(body_bytes) if body_bytes else dict()
+                    if not isinstance(body, dict):
+                        raise ValueError("Request body must be a JSON object.")
+                    status, response = self.handle_request(method, path, body)
+                except GameSessionError as err:
+                    status, response = err.status, {'error': str(err)}
+                except ValueError as err:
+                    status, response = HTTPStatus.BAD_REQUEST, {'error': str(err)}
+                except Exception:
+                    self.logger.exception(f"Request {method} {path} failed.")
+                    status, response = HTTPStatus.INTERNAL_SERVER_ERROR, {
+                        'error': "Internal server error."
+                    }
+                writer.write(_format_response(status, response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, _BadRequestError) as err:
+            self.logger.debug(f"Connection is closed: {err}")
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(request_line: bytes, reader: asyncio.StreamReader):
+        """Read the headers and the body of the request, given its first line."""
+        try:
+            method, path, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise _BadRequestError("Malformed request line.")
+        headers = dict()
+        while True:
+            header_line = await reader.readline()
+            if header_line in [b'\r\n', b'\n', b'']:
+                break
+            name, _, value = header_line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        content_length_text = headers.get('content-length', '') or '0'
+        if not (content_length_text.isascii() and content_length_text.isdigit()):
+            raise _BadRequestError("Content-Length must be a non-negative integer.")
+        content_length = int(content_length_text)
+        if content_length > _MAX_REQUEST_BODY_SIZE:
+            raise _BadRequestError("Request body is too large.")
+        body_bytes = await reader.readexactly(content_length) if content_length else b''
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method.upper(), path, keep_alive, body_bytes
+
+    async def _remove_idle_sessions_periodically(self):
+        while True:
+            await asyncio.sleep(_IDLE_SESSION_CHECK_PERIOD_SECONDS)
+            n_removed_sessions = self.session_manager.remove_idle_sessions(self.max_idle_seconds)
+            if n_removed_sessions:
+                self.logger.info(f"{n_removed_sessions} idle sessions are removed.")
+
+
+class _BadRequestError(Exception):
+    """Request which can not be parsed, which is answered by 400 before closing the connection."""
+
+
+def _get_int(body: dict, key: str, default: Optional[int] = None) -> int:
+    """Return the integer value of the key in the request body."""
+    value = body.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"'{key}' must be an integer.")
+    return value
+
+
+def _format_response(status: HTTPStatus, response: dict, keep_alive: bool) -> bytes:
+    """Format the HTTP response with the JSON body."""
+    body = json.dumps(response, ensure_ascii=False).encode('utf-8')
+    headers = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return headers.encode('latin-1') + body
+
+
+def run_game_server(
+    question_category_list: List[QuestionCategoryData],
+    host: str,
+    port: int,
+    max_sessions: int,
+    rng_backend: str = "numpy",
+    draw_mode: str = "category",
+    logging_level_str: str = "none",
+    metrics: Optional[GameMetrics] = None,
+    difficulty_curve: Optional[List[List[float]]] = None,
+    questions_per_round: int = 10
+):
+    """Serve the games of the given question categories until interrupted.
+
+    If metrics are given, the metrics of the games are collected and served at GET /metrics.
+    """
+    async def serve():
+        game_server = GameServer(
+            GameSessionManager(
+                question_category_list,
+                max_sessions=max_sessions,
+                rng_backend=rng_backend,
+                draw_mode=draw_mode,
+                metrics=metrics,
+                difficulty_curve=difficulty_curve,
+                questions_per_round=questions_per_round,
+            ),
+            logging_level_str=logging_level_str,
+        )
+        port_listened = await game_server.start(host, port)
+        print(f"Serving trivia games on http://{host}:{port_listened}")
+        await game_server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,186 @@
+"""Monte Carlo simulation of the question categories asked in many games.
+
+The games are played by the categories-only draws of GameEngine (see
+GameEngine.draw_question_categories()), so the categories follow exactly the selection logic of
+the real games, without retrieving (or shuffling) the questions themselves. The games are split
+into chunks of seeds, which are played in a pool of processes and counted with NumPy.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trivia_game.data_processing import QuestionCategoryData
+from trivia_game.game_engine import GameEngine
+
+# Game engine of the worker process and the options of its games, set by _initialize_worker()
+_worker_game_engine = None
+_worker_simulation_options = dict()
+
+
+def simulate_games(
+    question_category_sizes: Dict[str, int],
+    n_games: int,
+    n_questions_per_game: int = 40,
+    weight_calculation_method: str = "Weighted",
+    weights_override: Sequence[float] = (),
+    n_workers: int = 1,
+    first_seed: int = 0,
+    rng_backend: str = "python",
+    draw_mode: str = "category",
+    chunk_size: int = 10000,
+) -> dict:
+    """Play the first n_questions_per_game questions of n_games games, return their statistics.
+
+    The games are played with the seeds first_seed, first_seed + 1, ... by question categories of
+    the given sizes (i.e. number of questions). The weights_override are given in the order of
+    question_category_sizes. The returned dictionary holds:
+    - "category_distribution_by_position": for each question number, the fraction of the games
+      asking a question of each category at that question number.
+    - "invalid_question_rate_by_position": for each question number, the fraction of the games
+      without a valid question at that question number (e.g. once the game is over).
+    - "category_run_out_rate": for each category, the fraction of the games in which all of its
+      questions are asked.
+    - "mean_questions_per_game": for each category, the average number of its questions asked.
+    - "draws_per_second": the number of questions drawn per second.
+    """
+    if n_games < 1 or n_questions_per_game < 1:
+        raise ValueError("At least one game with at least one question must be simulated.")
+    question_category_names = list(question_category_sizes)
+    worker_arguments = (
+        question_category_sizes,
+        n_questions_per_game,
+        weight_calculation_method,
+        list(weights_override),
+        rng_backend,
+        draw_mode,
+    )
+    seed_chunks = [
+        (chunk_first_seed, min(chunk_size, first_seed + n_games - chunk_first_seed))
+        for chunk_first_seed in range(first_seed, first_seed + n_games, chunk_size)
+    ]
+
+    start_time = time.perf_counter()
+    if n_workers <= 1:
+        _initialize_worker(*worker_arguments)
+        chunk_counts = map(_simulate_game_chunk, seed_chunks)
+        position_counts, run_out_counts = _sum_chunk_counts(chunk_counts)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_initialize_worker,
+            initargs=worker_arguments,
+        ) as executor:
+            position_counts, run_out_counts = _sum_chunk_counts(
+                executor.map(_simulate_game_chunk, seed_chunks)
+            )
+    elapsed_seconds = time.perf_counter() - start_time
+
+    return {
+        "games": n_games,
+        "questions_per_game": n_questions_per_game,
+        "weight_calculation_method": weight_calculation_method,
+        "weights_override": list(weights_override),
+        "question_categories": question_category_names,
+        "category_distribution_by_position": (
+            position_counts[:, :-1] / n_games
+        ).round(6).tolist(),
+        "invalid_question_rate_by_position": (
+            position_counts[:, -1] / n_games
+        ).round(6).tolist(),
+        "category_run_out_rate": dict(zip(
+            question_category_names,
+            (run_out_counts / n_games).round(6).tolist()
+        )),
+        "mean_questions_per_game": dict(zip(
+            question_category_names,
+            (position_counts[:, :-1].sum(axis=0) / n_games).round(6).tolist()
+        )),
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "draws_per_second": round(n_games * n_questions_per_game / elapsed_seconds, 1),
+    }
+
+
+def _initialize_worker(
+    question_category_sizes,
+    n_questions_per_game,
+    weight_calculation_method,
+    weights_override,
+    rng_backend,
+    draw_mode,
+):
+    """Create the game engine of this process, with question categories of the given sizes."""
+    global _worker_game_engine
+    _worker_game_engine = GameEngine(
+        logging_level_str='none',
+        rng_backend=rng_backend,
+        draw_mode=draw_mode,
+    )
+    _worker_game_engine.set_question_categories(
+        _create_question_category_stubs(question_category_sizes)
+    )
+    _worker_simulation_options.update({
+        'n_questions_per_game': n_questions_per_game,
+        'weight_calculation_method': weight_calculation_method,
+        'weights_override': weights_override,
+        'question_category_sizes': np.array(list(question_category_sizes.values())),
+    })
+
+
+def _simulate_game_chunk(seed_chunk: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Play the games of the seed chunk, return the category counts of each question number and
+    the number of games each category runs out of questions."""
+    chunk_first_seed, n_chunk_games = seed_chunk
+    n_questions_per_game = _worker_simulation_options['n_questions_per_game']
+    category_indices = np.empty((n_chunk_games, n_questions_per_game), dtype=np.intc)
+    for game_idx in range(n_chunk_games):
+        _worker_game_engine.initialize_game(
+            seed=chunk_first_seed + game_idx,
+            shuffle_questions=False
+        )
+        category_indices[game_idx] = np.frombuffer(
+            _worker_game_engine.draw_question_categories(
+                n_questions_per_game,
+                _worker_simulation_options['weight_calculation_method'],
+                _worker_simulation_options['weights_override']
+            ),
+            dtype=np.intc
+        )
+
+    # Invalid questions (-1) are counted in the last column
+    question_category_sizes = _worker_simulation_options['question_category_sizes']
+    n_categories = len(question_category_sizes)
+    category_indices[category_indices < 0] = n_categories
+    position_counts = np.zeros((n_questions_per_game, n_categories + 1), dtype=np.int64)
+    np.add.at(position_counts, (np.arange(n_questions_per_game), category_indices), 1)
+    game_counts = np.zeros((n_chunk_games, n_categories + 1), dtype=np.int64)
+    np.add.at(game_counts, (np.arange(n_chunk_games)[:, None], category_indices), 1)
+    run_out_counts = (game_counts[:, :-1] >= question_category_sizes).sum(axis=0)
+    return position_counts, run_out_counts
+
+
+def _sum_chunk_counts(chunk_counts) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum the counts of the chunks returned by _simulate_game_chunk()."""
+    position_counts, run_out_counts = next(chunk_counts)
+    for chunk_position_counts, chunk_run_out_counts in chunk_counts:
+        position_counts += chunk_position_counts
+        run_out_counts += chunk_run_out_counts
+    return position_counts, run_out_counts
+
+
+def _create_question_category_stubs(
+    question_category_sizes: Dict[str, int]
+) -> List[QuestionCategoryData]:
+    """Create question categories of the given sizes, whose questions are empty strings."""
+    return [
+        QuestionCategoryData(
+            name=question_category_name,
+            df=pd.DataFrame({"Question": [""] * n_questions, "Answer": [""] * n_questions}),
+            question_column_title="Question",
+            answer_column_title="Answer",
+            question_option_columns_list=[],
+        )
+        for question_category_name, n_questions in question_category_sizes.items()
+    ]
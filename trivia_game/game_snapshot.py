@@ -0,0 +1,95 @@
+"""Game state snapshots saved next to the question bank file, to resume a game after a crash.
+
+A snapshot (see GameEngine.snapshot()) is a small JSON object: the seed, the cursor of each question
+category, the random state and the counters of the game, but none of the questions. The arrays of
+the snapshot are stored as base64 strings, which are encoded and decoded by encode_value() and
+decode_value().
+"""
+import base64
+import json
+import os
+from array import array
+from typing import Optional
+
+from trivia_game.game_logger import create_logger
+
+# Increase when the content of the snapshot changes, so that old snapshots are not restored
+SNAPSHOT_FORMAT_VERSION = 2
+_SNAPSHOT_FILE_SUFFIX = ".tgsave"
+
+
+def encode_value(value):
+    """Return the value with its arrays as base64 strings and its tuples as lists, as JSON."""
+    if isinstance(value, array):
+        return {
+            "typecode": value.typecode,
+            "base64": base64.b64encode(value.tobytes()).decode('ascii'),
+        }
+    elif isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    elif isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+    return value
+
+
+def decode_value(value):
+    """Return the value encoded by encode_value(), where the tuples are returned as lists."""
+    if isinstance(value, dict):
+        if value.keys() == {"typecode", "base64"}:
+            decoded_array = array(value["typecode"])
+            decoded_array.frombytes(base64.b64decode(value["base64"]))
+            return decoded_array
+        return {key: decode_value(item) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
+
+
+class GameSnapshotFile:
+    """Read & write the snapshot of the game of a question bank file, stored next to the file.
+
+    The snapshot is written atomically and synced to the disk, so that the file holds either the
+    previous or the new snapshot whenever the game crashes or the computer loses power.
+    """
+    def __init__(self, data_path: str, logging_level_str: str = "none"):
+        self.snapshot_path = data_path + _SNAPSHOT_FILE_SUFFIX
+        self.logger = create_logger(name="GameSnapshotFile", logging_level_str=logging_level_str)
+
+    def load(self) -> Optional[dict]:
+        """Return the saved snapshot, or None if there is no readable snapshot."""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            self.logger.info("No game snapshot is found at " + self.snapshot_path + ".")
+            return None
+        except (OSError, ValueError) as err:
+            self.logger.warning(f"Game snapshot could not be read: {err}")
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_FORMAT_VERSION:
+            self.logger.info("Game snapshot is created by another version of the game.")
+            return None
+        return snapshot
+
+    def save(self, snapshot: dict):
+        """Write the snapshot atomically, such that a failed write never leaves a corrupt file."""
+        temporary_path = self.snapshot_path + ".tmp"
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                json.dump(snapshot, file, separators=(',', ':'))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.snapshot_path)
+        except OSError as err:
+            self.logger.warning(f"Game snapshot could not be written: {err}")
+            return
+        self.logger.debug("Game snapshot is written to " + self.snapshot_path + ".")
+
+    def delete(self):
+        """Delete the saved snapshot, if any."""
+        try:
+            os.remove(self.snapshot_path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            self.logger.warning(f"Game snapshot could not be deleted: {err}")
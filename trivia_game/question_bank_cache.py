@@ -0,0 +1,130 @@
+"""Compiled cache of the parsed question bank, stored next to the question bank file."""
+import hashlib
+import json
+import os
+import pickle
+from typing import Optional
+
+import pandas as pd
+
+from trivia_game.game_logger import create_logger
+from trivia_game.game_options import CACHE_MODES  # noqa: F401, re-exported
+from trivia_game.question_search import QuestionSearchIndex
+
+_CACHE_FILE_SUFFIX = ".tgcache"
+# Increase when the content of the cache file changes, so that old caches are re-built
+_CACHE_FORMAT_VERSION = 3
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+class QuestionBankCache:
+    """Read & write the question category dataframes parsed from a question bank file, the
+    digests of their questions (see QuestionCategoryData.get_questions_digest()), and the search
+    index of their questions if it is built.
+
+    The cache is valid as long as the content of the question bank file and the game metadata are
+    the same as the ones it was created from. The content hash is only computed when the size or
+    the modification time of the file changes, so loading an up-to-date cache costs a single
+    unpickling. Note that the cache is a pickle file, so it must only be loaded if it is
+    created on the same machine.
+    """
+    def __init__(
+        self,
+        data_path: str,
+        question_category_column_name: str,
+        data_info: dict,
+        question_bank_format: str = "excel",
+        logging_level_str: str = "none"
+    ):
+        self.data_path = data_path
+        self.cache_path = data_path + _CACHE_FILE_SUFFIX
+        self.logger = create_logger(name="QuestionBankCache", logging_level_str=logging_level_str)
+        # Question digests and search index of the last loaded cache, see load_questions_digests()
+        # and load_search_index()
+        self._questions_digests = {}
+        self._search_index = None
+        self._metadata_key = json.dumps(
+            [_CACHE_FORMAT_VERSION, question_category_column_name, data_info, question_bank_format],
+            sort_keys=True
+        )
+
+    def load(self) -> Optional[dict[str, pd.DataFrame]]:
+        """Return the question category dataframes, or None if there is no valid cache."""
+        try:
+            with open(self.cache_path, 'rb') as file:
+                cache_content = pickle.load(file)
+        except FileNotFoundError:
+            self.logger.info("No question bank cache is found at " + self.cache_path + ".")
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as err:
+            self.logger.warning(f"Question bank cache could not be read: {err}")
+            return None
+
+        if not isinstance(cache_content, dict) \
+                or cache_content.get('metadata_key') != self._metadata_key:
+            self.logger.info("Question bank cache is created with another game metadata.")
+            return None
+        file_signature = self._get_file_signature()
+        if cache_content['file_signature'] != file_signature:
+            if cache_content['content_hash'] != self._get_content_hash():
+                self.logger.info("Question bank is modified after the cache is created.")
+                return None
+            # Same content with a different modification time, e.g. the file is copied
+            cache_content['file_signature'] = file_signature
+            self._write(cache_content)
+
+        self.logger.info("Question bank is loaded from the cache " + self.cache_path + ".")
+        self._questions_digests = cache_content['questions_digests']
+        self._search_index = cache_content['search_index']
+        return cache_content['question_categories']
+
+    def load_questions_digests(self) -> dict[str, bytes]:
+        """Return the question digests of the question categories of the cache loaded by load()."""
+        return self._questions_digests
+
+    def load_search_index(self) -> Optional[QuestionSearchIndex]:
+        """Return the search index of the cache loaded by load(), or None if it is not stored."""
+        return self._search_index
+
+    def save(
+        self,
+        question_category_dfs: dict[str, pd.DataFrame],
+        questions_digests: dict[str, bytes],
+        search_index: Optional[QuestionSearchIndex] = None
+    ):
+        """Write the question category dataframes, the digests of their questions (and their search
+        index, if any) to the cache.
+        """
+        self._write({
+            'metadata_key': self._metadata_key,
+            'file_signature': self._get_file_signature(),
+            'content_hash': self._get_content_hash(),
+            'question_categories': question_category_dfs,
+            'questions_digests': questions_digests,
+            'search_index': search_index,
+        })
+
+    def _write(self, cache_content: dict):
+        """Write the cache atomically, such that a failed write never leaves a corrupt cache."""
+        temporary_path = self.cache_path + ".tmp"
+        try:
+            with open(temporary_path, 'wb') as file:
+                pickle.dump(cache_content, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.cache_path)
+        except OSError as err:
+            self.logger.warning(f"Question bank cache could not be written: {err}")
+            return
+        self.logger.info("Question bank cache is written to " + self.cache_path + ".")
+
+    def _get_file_signature(self) -> tuple[int, int]:
+        """Return the size and the modification time of the question bank file."""
+        file_stat = os.stat(self.data_path)
+        return file_stat.st_size, file_stat.st_mtime_ns
+
+    def _get_content_hash(self) -> str:
+        """Return the SHA-256 hash of the question bank file."""
+        content_hash = hashlib.sha256()
+        with open(self.data_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b''):
+                content_hash.update(chunk)
+        return content_hash.hexdigest()
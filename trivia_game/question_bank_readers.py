@@ -0,0 +1,185 @@
+"""Readers streaming the rows of the question bank files in the supported formats.
+
+Each reader yields the values of the requested columns of each row as a tuple of strings, and skips
+the rows where all of the requested columns are empty. Values are converted to strings the same way
+for every format, so the same question bank gives the same questions whatever its format is.
+"""
+import csv
+import json
+import math
+import os
+from typing import Callable, Iterator, List, Optional
+
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+# Values of the error cells of Excel, as in openpyxl.cell.cell.ERROR_CODES, which is not imported
+# since importing openpyxl is slow and only needed to read Excel files
+_EXCEL_ERROR_CODES = frozenset(('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'))
+
+
+def iter_excel_rows(database_path: str, columns: List[str]) -> Iterator[tuple]:
+    """Stream the values of the given columns from the first sheet of the Excel file.
+
+    The first row of the sheet holds the column names.
+    """
+    import openpyxl
+    workbook = openpyxl.load_workbook(
+        database_path,
+        read_only=True,
+        data_only=True,
+        keep_links=False
+    )
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = _get_unique_column_names(next(rows, ()))
+        yield from _iter_header_table_rows(database_path, header, rows, columns)
+    finally:
+        workbook.close()
+
+
+def iter_csv_rows(database_path: str, columns: List[str]) -> Iterator[tuple]:
+    """Stream the values of the given columns from the CSV file.
+
+    The first row of the file holds the column names.
+    """
+    with open(database_path, 'r', encoding='utf-8-sig', newline='') as file:
+        rows = csv.reader(file)
+        header = _get_unique_column_names(next(rows, ()))
+        yield from _iter_header_table_rows(database_path, header, rows, columns)
+
+
+def iter_parquet_rows(database_path: str, columns: List[str]) -> Iterator[tuple]:
+    """Read the given columns from the Parquet file and yield them row by row.
+
+    Reading Parquet files requires pyarrow or fastparquet to be installed.
+    """
+    try:
+        df = pd.read_parquet(database_path, columns=columns)
+    except ValueError as err:
+        # Missing columns are reported differently by each Parquet engine
+        raise KeyError(f"Columns of {database_path} could not be read: {err}") from err
+    column_values = [
+        [convert_cell_value(value) for value in df[column].tolist()]
+        for column in columns
+    ]
+    del df
+    for values in zip(*column_values):
+        if any(values):
+            yield values
+
+
+def iter_jsonl_rows(database_path: str, columns: List[str]) -> Iterator[tuple]:
+    """Stream the values of the given columns from the JSON Lines file.
+
+    Each non-empty line holds a JSON object mapping the column names to the values of a row,
+    where the missing columns are treated as empty cells.
+    """
+    missing_columns = set(columns)
+    with open(database_path, 'r', encoding='utf-8-sig') as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(
+                    f"Line {line_number} of {database_path} is not a JSON object."
+                )
+            if missing_columns:
+                missing_columns.difference_update(record.keys())
+            values = tuple(convert_cell_value(record.get(column)) for column in columns)
+            if any(values):
+                yield values
+    if missing_columns:
+        raise KeyError(f"Columns {sorted(missing_columns)} are not found in {database_path}.")
+
+
+# Readers of the supported question bank formats, and the file extensions of each format
+QUESTION_BANK_READERS: dict[str, Callable[[str, List[str]], Iterator[tuple]]] = {
+    "excel": iter_excel_rows,
+    "csv": iter_csv_rows,
+    "parquet": iter_parquet_rows,
+    "jsonl": iter_jsonl_rows,
+}
+QUESTION_BANK_FORMATS_BY_EXTENSION = {
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def get_question_bank_format(database_path: str, question_bank_format: Optional[str] = None) -> str:
+    """Return the given question bank format, or the one deduced from the file extension."""
+    if question_bank_format is None:
+        extension = os.path.splitext(database_path)[1].lower()
+        if extension not in QUESTION_BANK_FORMATS_BY_EXTENSION:
+            raise ValueError(
+                f"Format of the question bank {database_path} can not be deduced from its "
+                f"extension, supported extensions are {list(QUESTION_BANK_FORMATS_BY_EXTENSION)}."
+            )
+        question_bank_format = QUESTION_BANK_FORMATS_BY_EXTENSION[extension]
+    if question_bank_format not in QUESTION_BANK_READERS:
+        raise ValueError(
+            f"Question bank format must be one of {list(QUESTION_BANK_READERS)}, "
+            f"got '{question_bank_format}'."
+        )
+    return question_bank_format
+
+
+def convert_cell_value(value) -> str:
+    """Convert the value of a cell to a string.
+
+    This is the same conversion pandas.read_excel(dtype=str).fillna("") does, i.e. empty cells,
+    error cells and the strings pandas treats as missing values become "", and integral numbers
+    are written without decimals.
+    """
+    if isinstance(value, str):
+        return "" if value in STR_NA_VALUES or value in _EXCEL_ERROR_CODES else value
+    elif value is None or value is pd.NA or value is pd.NaT:
+        return ""
+    elif isinstance(value, float):
+        if math.isnan(value):
+            return ""
+        return str(int(value)) if value.is_integer() else str(value)
+    return str(value)
+
+
+def _iter_header_table_rows(
+    database_path: str,
+    header: List[str],
+    rows: Iterator,
+    columns: List[str]
+) -> Iterator[tuple]:
+    """Yield the values of the given columns from the rows of a table with the given header."""
+    missing_columns = [column for column in columns if column not in header]
+    if missing_columns:
+        raise KeyError(f"Columns {missing_columns} are not found in {database_path}.")
+    column_indices = [header.index(column) for column in columns]
+    for row in rows:
+        values = tuple(
+            convert_cell_value(row[idx]) if idx < len(row) else ""
+            for idx in column_indices
+        )
+        if any(values):
+            yield values
+
+
+def _get_unique_column_names(header) -> List[str]:
+    """Name the columns of the header row as pandas does, i.e. 'Unnamed: i' for empty cells and
+    'name.k' for the k'th duplicate of a name."""
+    column_names = []
+    for idx, value in enumerate(header):
+        column_name = value if isinstance(value, str) else convert_cell_value(value)
+        if not column_name:
+            column_name = f"Unnamed: {idx}"
+        unique_column_name = column_name
+        n_duplicates = 0
+        while unique_column_name in column_names:
+            n_duplicates += 1
+            unique_column_name = f"{column_name}.{n_duplicates}"
+        column_names.append(unique_column_name)
+    return column_names
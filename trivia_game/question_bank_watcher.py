@@ -0,0 +1,58 @@
+"""Watch the question bank file of the GUI, to reload the questions whenever the file is saved."""
+import os
+from typing import Optional, Tuple
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+# Milliseconds without any change of the file before it is reloaded, since editors may write the
+# file in several steps (or write a new file and replace the old one by it)
+_SETTLE_INTERVAL_MS = 500
+
+
+def get_file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Return the modification time (ns) and the size of the file, or None if it is missing."""
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+class QuestionBankWatcher(QObject):
+    """Emit the changed signal once the question bank file is changed and the writes settle.
+
+    The directory of the file is watched too, since the watch of a file ends when the file is
+    replaced, as many editors save the files. The events which change neither the modification
+    time nor the size of the file (e.g. the ones of the other files of the directory) are ignored.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, path: str, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.path = os.path.abspath(path)
+        self._file_signature = get_file_signature(self.path)
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(_SETTLE_INTERVAL_MS)
+        self._settle_timer.timeout.connect(self._check_file_signature)
+        self._file_system_watcher = QFileSystemWatcher(self)
+        self._file_system_watcher.fileChanged.connect(self._settle_timer.start)
+        self._file_system_watcher.directoryChanged.connect(self._settle_timer.start)
+        self._watch()
+
+    def _watch(self):
+        """Watch the file (again, if it is replaced) and its directory."""
+        directory = os.path.dirname(self.path)
+        if directory not in self._file_system_watcher.directories():
+            self._file_system_watcher.addPath(directory)
+        if os.path.exists(self.path) and self.path not in self._file_system_watcher.files():
+            self._file_system_watcher.addPath(self.path)
+
+    def _check_file_signature(self):
+        """Emit the changed signal if the file is changed since the last check."""
+        self._watch()
+        file_signature = get_file_signature(self.path)
+        if file_signature is None or file_signature == self._file_signature:
+            return
+        self._file_signature = file_signature
+        self.changed.emit()
@@ -0,0 +1,268 @@
+"""Find the duplicate and the near-duplicate questions of a question bank in linear time.
+
+The questions are compared by their normalized texts: case-folded, without punctuation and without
+the stopwords in _STOPWORDS. Each question is represented by the set of its shingles, which are the
+pairs of its consecutive words (or its only word) and the words of its answer, so that the same
+question with another answer is not a duplicate.
+
+The questions with the same shingles are the duplicates, which are found by hashing. Among the
+remaining ones, the near-duplicates are the questions whose shingle sets have a Jaccard similarity
+of at least the similarity threshold. Instead of comparing every pair of questions, the candidate
+pairs are found by MinHash signatures and locality-sensitive hashing (LSH): the signature of each
+question is split into _N_LSH_BANDS bands, and the questions with the same values in any band are
+the candidates, whose similarities are checked exactly. A pair of similarity s is a candidate with
+probability 1 - (1 - s^_LSH_BAND_SIZE)^_N_LSH_BANDS, e.g. 91% for 0.6 and 99.97% for 0.9.
+
+All steps except checking the candidates run on NumPy arrays, and the hashes are deterministic,
+thus the same question bank always gives the same duplicates.
+"""
+import string
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Words ignored when comparing the questions
+_STOPWORDS = (
+    "a an the of is are was were be to in on at by for with from and or as it its this that "
+    "what which who whom whose"
+).split()
+# Jaccard similarity of the shingle sets from which two questions are near-duplicates
+DEFAULT_SIMILARITY_THRESHOLD = 0.6
+_N_LSH_BANDS = 10
+_LSH_BAND_SIZE = 3
+# Seed of the MinHash functions, fixed so that the duplicates do not depend on the run
+_MINHASH_SEED = 20240601
+# Word separating the texts joined to be normalized at once, which is kept by the normalization
+# (unlike the ASCII separator characters, which are whitespace to str.split())
+_TEXT_SEPARATOR = "\x00"
+# Replaces the punctuation by spaces before splitting the words, also used by QuestionSearchIndex
+PUNCTUATION_TABLE = str.maketrans({
+    character: " " for character in string.punctuation + "“”‘’«»¿¡…–—"
+})
+# Odd 64-bit constants mixing the hashes of the shingles
+_BIGRAM_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_ANSWER_MULTIPLIER = np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+def normalize_question_text(text: str) -> List[str]:
+    """Return the words of the text compared by find_duplicate_questions(), e.g.
+    "What's the capital of France?" -> ["s", "capital", "france"].
+    """
+    return [
+        word for word in text.casefold().translate(PUNCTUATION_TABLE).split()
+        if word not in _STOPWORDS
+    ]
+
+
+def find_duplicate_questions(
+    question_texts: Sequence[str],
+    answer_texts: Sequence[str],
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+) -> List[List[int]]:
+    """Return the groups of the duplicate and the near-duplicate questions with their answers.
+
+    Each group holds the indices of its questions in increasing order, and the groups are sorted
+    by their first indices. The questions without any word are never duplicates. A question joins
+    a group if it is similar to any question of the group, thus the questions of a group may be
+    less similar to each other than the threshold.
+    """
+    shingles, shingle_starts = _get_shingles(question_texts, answer_texts)
+    n_shingles = np.diff(shingle_starts)
+    question_indices = np.flatnonzero(n_shingles)
+    if len(question_indices) == 0:
+        return []
+    mixed_shingles = _mix_hashes(shingles)
+
+    # Duplicates: the same shingles give the same sum of the mixed shingle hashes
+    first_positions = _get_first_positions_of_equal_keys(
+        np.add.reduceat(mixed_shingles, shingle_starts[question_indices])
+    )
+    parents = dict()
+    is_duplicate = first_positions != np.arange(len(first_positions))
+    for first_question_idx, question_idx in zip(
+        question_indices[first_positions[is_duplicate]].tolist(),
+        question_indices[is_duplicate].tolist()
+    ):
+        _union(parents, first_question_idx, question_idx)
+
+    # Near-duplicates: the candidate pairs of LSH whose similarities reach the threshold, where
+    # only the first question of the duplicates is compared
+    unique_question_indices = question_indices[~is_duplicate]
+    is_unique_question = np.zeros(len(n_shingles), dtype=bool)
+    is_unique_question[unique_question_indices] = True
+    signatures = _compute_minhash_signatures(
+        mixed_shingles[np.repeat(is_unique_question, n_shingles)].astype(np.uint32),
+        n_shingles[unique_question_indices]
+    )
+    shingle_sets = dict()
+    for first_idx, second_idx in _find_candidate_pairs(signatures).tolist():
+        first_question_idx = int(unique_question_indices[first_idx])
+        second_question_idx = int(unique_question_indices[second_idx])
+        if _find(parents, first_question_idx) == _find(parents, second_question_idx):
+            continue
+        first_shingles, second_shingles = [
+            _get_shingle_set(shingle_sets, shingles, shingle_starts, question_idx)
+            for question_idx in (first_question_idx, second_question_idx)
+        ]
+        n_common_shingles = len(first_shingles & second_shingles)
+        similarity = n_common_shingles / (
+            len(first_shingles) + len(second_shingles) - n_common_shingles
+        )
+        if similarity >= similarity_threshold:
+            _union(parents, first_question_idx, second_question_idx)
+
+    groups = dict()
+    for question_idx in parents:
+        groups.setdefault(_find(parents, question_idx), []).append(question_idx)
+    return sorted(sorted(group) for group in groups.values() if len(group) > 1)
+
+
+def _get_shingles(
+    question_texts: Sequence[str],
+    answer_texts: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the shingle hashes of all questions, and the start of each question's shingles.
+
+    The shingles of the i'th question are shingles[shingle_starts[i]:shingle_starts[i + 1]].
+    The texts are normalized and split all at once, and the words are hashed by pandas.
+    """
+    n_questions = len(question_texts)
+    texts = [""] * (2 * n_questions)
+    texts[0::2] = question_texts
+    texts[1::2] = answer_texts
+    words = np.array(
+        f" {_TEXT_SEPARATOR} ".join(texts).casefold().translate(PUNCTUATION_TABLE).split(),
+        dtype=object
+    )
+    word_hashes = pd.util.hash_array(words)
+    ignored_word_hashes = pd.util.hash_array(
+        np.array([_TEXT_SEPARATOR] + _STOPWORDS, dtype=object)
+    )
+    # The texts are the question and the answer of each question in turn
+    word_text_indices = np.cumsum(word_hashes == ignored_word_hashes[0])
+    sorted_ignored_word_hashes = np.sort(ignored_word_hashes)
+    is_kept = sorted_ignored_word_hashes[
+        np.minimum(
+            np.searchsorted(sorted_ignored_word_hashes, word_hashes),
+            len(sorted_ignored_word_hashes) - 1
+        )
+    ] != word_hashes
+    word_hashes = word_hashes[is_kept]
+    word_text_indices = word_text_indices[is_kept]
+
+    # The shingle of each word, which is the pair of the word and the next one of the question,
+    # the word itself if it is the only one of the question, or the word of the answer
+    is_answer_word = (word_text_indices & 1) == 1
+    has_next_word = np.zeros(len(word_hashes), dtype=bool)
+    has_next_word[:-1] = word_text_indices[1:] == word_text_indices[:-1]
+    next_word_hashes = np.zeros(len(word_hashes), dtype=np.uint64)
+    next_word_hashes[:-1] = word_hashes[1:]
+    is_only_word = np.bincount(word_text_indices, minlength=2 * n_questions)[word_text_indices] == 1
+    shingles = np.where(
+        is_answer_word,
+        word_hashes * _ANSWER_MULTIPLIER,
+        np.where(has_next_word, word_hashes * _BIGRAM_MULTIPLIER + next_word_hashes, word_hashes)
+    )
+    is_shingle = is_answer_word | has_next_word | is_only_word
+    shingle_starts = np.zeros(n_questions + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(word_text_indices[is_shingle] >> 1, minlength=n_questions),
+        out=shingle_starts[1:]
+    )
+    return shingles[is_shingle], shingle_starts
+
+
+def _mix_hashes(hashes: np.ndarray) -> np.ndarray:
+    """Return the 64-bit hashes with their bits mixed (the finalizer of MurmurHash3)."""
+    hashes = hashes ^ (hashes >> np.uint64(33))
+    hashes = hashes * np.uint64(0xFF51AFD7ED558CCD)
+    hashes = hashes ^ (hashes >> np.uint64(33))
+    hashes = hashes * np.uint64(0xC4CEB9FE1A85EC53)
+    return hashes ^ (hashes >> np.uint64(33))
+
+
+def _get_first_positions_of_equal_keys(keys: np.ndarray) -> np.ndarray:
+    """Return the position of the first key equal to each key, by hashing the keys."""
+    # The codes are numbered in the order of their first positions
+    codes, _ = pd.factorize(keys)
+    max_codes = np.maximum.accumulate(codes)
+    is_first_position = np.ones(len(codes), dtype=bool)
+    is_first_position[1:] = max_codes[1:] > max_codes[:-1]
+    return np.flatnonzero(is_first_position)[codes]
+
+
+def _compute_minhash_signatures(shingle_hashes: np.ndarray, n_shingles: np.ndarray) -> np.ndarray:
+    """Return the MinHash signatures of the questions with the given numbers of shingles (> 0).
+
+    Each of the _N_LSH_BANDS * _LSH_BAND_SIZE values of a signature is the minimum of a random
+    permutation of the 32-bit integers (multiply-add modulo 2^32 by an odd multiplier) over the
+    32-bit hashes of the question's shingles.
+    """
+    shingle_starts = np.zeros(len(n_shingles), dtype=np.int64)
+    np.cumsum(n_shingles[:-1], out=shingle_starts[1:])
+    n_hashes = _N_LSH_BANDS * _LSH_BAND_SIZE
+    generator = np.random.Generator(np.random.PCG64(_MINHASH_SEED))
+    multipliers = generator.integers(0, 2 ** 32, n_hashes, dtype=np.uint32) | np.uint32(1)
+    increments = generator.integers(0, 2 ** 32, n_hashes, dtype=np.uint32)
+    signatures = np.empty((len(n_shingles), n_hashes), dtype=np.uint32)
+    for hash_idx in range(n_hashes):
+        signatures[:, hash_idx] = np.minimum.reduceat(
+            shingle_hashes * multipliers[hash_idx] + increments[hash_idx],
+            shingle_starts
+        )
+    return signatures
+
+
+def _find_candidate_pairs(signatures: np.ndarray) -> np.ndarray:
+    """Return the (first row, row) pairs of the signatures with the same values in any band.
+
+    In each band, every signature is paired with the first signature having the same values,
+    which links all signatures of a bucket by len(bucket) - 1 pairs.
+    """
+    candidate_pair_keys = []
+    rows = np.arange(len(signatures))
+    for band_idx in range(_N_LSH_BANDS):
+        band = signatures[:, band_idx * _LSH_BAND_SIZE:(band_idx + 1) * _LSH_BAND_SIZE]
+        band_keys = np.zeros(len(signatures), dtype=np.uint64)
+        for column_idx in range(_LSH_BAND_SIZE):
+            band_keys = _mix_hashes(band_keys ^ band[:, column_idx].astype(np.uint64))
+        first_rows = _get_first_positions_of_equal_keys(band_keys)
+        is_paired = first_rows != rows
+        candidate_pair_keys.append(first_rows[is_paired] * len(signatures) + rows[is_paired])
+    pair_keys = np.unique(np.concatenate(candidate_pair_keys))
+    return np.stack([pair_keys // len(signatures), pair_keys % len(signatures)], axis=1)
+
+
+def _get_shingle_set(
+    shingle_sets: Dict[int, frozenset],
+    shingles: np.ndarray,
+    shingle_starts: np.ndarray,
+    question_idx: int
+) -> frozenset:
+    """Return the shingles of the question as a set, which is created once."""
+    shingle_set = shingle_sets.get(question_idx)
+    if shingle_set is None:
+        shingle_set = shingle_sets[question_idx] = frozenset(
+            shingles[shingle_starts[question_idx]:shingle_starts[question_idx + 1]].tolist()
+        )
+    return shingle_set
+
+
+def _find(parents: Dict[int, int], question_idx: int) -> int:
+    """Return the first question of the group of the question (of the union-find forest)."""
+    root = question_idx
+    while parents.get(root, root) != root:
+        root = parents[root]
+    while question_idx != root:
+        parents[question_idx], question_idx = root, parents[question_idx]
+    parents.setdefault(root, root)
+    return root
+
+
+def _union(parents: Dict[int, int], first_question_idx: int, second_question_idx: int):
+    """Merge the groups of the questions, whose first question is the smallest index."""
+    first_root = _find(parents, first_question_idx)
+    second_root = _find(parents, second_question_idx)
+    if first_root != second_root:
+        parents[max(first_root, second_root)] = min(first_root, second_root)
@@ -0,0 +1,165 @@
+"""Inverted full-text index of the questions, to find a question by the words of its texts.
+
+The words of the question, the answer and the options of each question are case-folded and split
+at the punctuation and the whitespace. For each word (term) of the question bank, the index holds
+the ids of the questions having it (the postings), where the id of a question is its row position
+in its question category, after the rows of the previous categories. The terms are sorted, thus
+the terms starting with a prefix are consecutive and so are their postings, which are found by a
+binary search. A query is answered by marking the postings of each query word in a boolean array
+of the questions, which costs in proportion to the matching postings, not to the terms.
+"""
+import bisect
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trivia_game.question_dedup import PUNCTUATION_TABLE
+
+# Word separating the texts of the questions joined to be split at once, which is kept by the
+# punctuation table (unlike the ASCII separator characters, which are whitespace to str.split()),
+# and unlike "\x00", it is not stripped when NumPy compares it with the words
+_QUESTION_SEPARATOR = "\x01"
+# Larger than every character, so that prefix + _MAX_CHARACTER bounds the terms with the prefix
+_MAX_CHARACTER = "\U0010FFFF"
+
+
+def split_search_words(text: str) -> List[str]:
+    """Return the words of the text as they are indexed, e.g. "Who's Magellan?" -> ["who", "s",
+    "magellan"].
+    """
+    return text.casefold().translate(PUNCTUATION_TABLE).split()
+
+
+class QuestionSearchResult(NamedTuple):
+    """Question found by QuestionSearchIndex.search()."""
+    question_category: str
+    row_position: int
+
+
+class QuestionSearchIndex:
+    """Inverted index of the words of the questions of the question categories.
+
+    Build it by QuestionSearchIndex.build(). The postings of the i'th term (terms[i]) are
+    postings[posting_starts[i]:posting_starts[i + 1]], in increasing order of the question ids.
+    The index holds only lists and NumPy arrays, so it is pickled with the question bank cache.
+    """
+    def __init__(
+        self,
+        question_category_names: List[str],
+        category_offsets: np.ndarray,
+        terms: List[str],
+        posting_starts: np.ndarray,
+        postings: np.ndarray
+    ):
+        self.question_category_names = question_category_names
+        # The first question id of each question category, and the number of questions at the end
+        self.category_offsets = category_offsets
+        self.terms = terms
+        self.posting_starts = posting_starts
+        self.postings = postings
+
+    @property
+    def num_questions(self) -> int:
+        return int(self.category_offsets[-1])
+
+    @classmethod
+    def build(
+        cls,
+        question_category_names: List[str],
+        searchable_texts_by_category: Sequence[Sequence[str]]
+    ) -> "QuestionSearchIndex":
+        """Index the searchable text of each question (all of its texts), of each category.
+
+        All texts are split at once, and the terms are sorted once by the unique terms.
+        """
+        category_offsets = np.zeros(len(searchable_texts_by_category) + 1, dtype=np.int64)
+        np.cumsum([len(texts) for texts in searchable_texts_by_category], out=category_offsets[1:])
+        words = np.array(
+            f" {_QUESTION_SEPARATOR} ".join(
+                text for texts in searchable_texts_by_category for text in texts
+            ).casefold().translate(PUNCTUATION_TABLE).split(),
+            dtype=object
+        )
+        is_separator = words == _QUESTION_SEPARATOR
+        question_ids = np.cumsum(is_separator)[~is_separator]
+        word_codes, unique_words = pd.factorize(words[~is_separator])
+        term_order = np.argsort(unique_words)
+        term_ids = np.empty(len(unique_words), dtype=np.int64)
+        term_ids[term_order] = np.arange(len(unique_words))
+
+        # Each (term, question) pair once, sorted by the terms and then by the questions
+        n_questions = max(int(category_offsets[-1]), 1)
+        posting_keys = np.unique(term_ids[word_codes] * n_questions + question_ids)
+        posting_starts = np.searchsorted(
+            posting_keys // n_questions,
+            np.arange(len(unique_words) + 1)
+        )
+        return cls(
+            question_category_names=list(question_category_names),
+            category_offsets=category_offsets,
+            terms=unique_words[term_order].tolist(),
+            posting_starts=posting_starts,
+            postings=(posting_keys % n_questions).astype(np.int32),
+        )
+
+    def search(
+        self,
+        query: str,
+        prefix: bool = True,
+        limit: int = 20
+    ) -> List[QuestionSearchResult]:
+        """Return the first limit questions having all words of the query, in the order of the rows.
+
+        With prefix, the words of the query match the terms starting with them (e.g. "magel"
+        matches "magellan"), else only the same terms. An empty query matches nothing.
+        """
+        query_words = split_search_words(query)
+        if len(query_words) == 0:
+            return []
+        is_found = None
+        for query_word in query_words:
+            first_term_idx, end_term_idx = self._get_term_range(query_word, prefix)
+            word_postings = self.postings[
+                self.posting_starts[first_term_idx]:self.posting_starts[end_term_idx]
+            ]
+            is_word_found = np.zeros(self.num_questions, dtype=bool)
+            is_word_found[word_postings] = True
+            is_found = is_word_found if is_found is None else is_found & is_word_found
+        question_ids = np.flatnonzero(is_found)[:max(limit, 0)]
+        category_indices = np.searchsorted(self.category_offsets, question_ids, side='right') - 1
+        return [
+            QuestionSearchResult(
+                self.question_category_names[category_idx],
+                question_id - int(self.category_offsets[category_idx])
+            )
+            for category_idx, question_id in zip(category_indices.tolist(), question_ids.tolist())
+        ]
+
+    def drop_questions(self, is_dropped: np.ndarray) -> "QuestionSearchIndex":
+        """Return the index without the dropped questions, whose later questions are renumbered.
+
+        is_dropped holds a flag for each question id.
+        """
+        new_question_ids = np.cumsum(~is_dropped) - 1
+        is_posting_kept = ~is_dropped[self.postings]
+        n_kept_postings = np.zeros(len(self.postings) + 1, dtype=np.int64)
+        np.cumsum(is_posting_kept, out=n_kept_postings[1:])
+        n_kept_questions = np.zeros(len(is_dropped) + 1, dtype=np.int64)
+        np.cumsum(~is_dropped, out=n_kept_questions[1:])
+        return QuestionSearchIndex(
+            question_category_names=self.question_category_names,
+            category_offsets=n_kept_questions[self.category_offsets],
+            terms=self.terms,
+            posting_starts=n_kept_postings[self.posting_starts],
+            postings=new_question_ids[self.postings[is_posting_kept]].astype(np.int32),
+        )
+
+    def _get_term_range(self, query_word: str, prefix: bool) -> Tuple[int, int]:
+        """Return the first and the end index of the terms matching the query word."""
+        first_term_idx = bisect.bisect_left(self.terms, query_word)
+        if prefix:
+            return first_term_idx, bisect.bisect_left(self.terms, query_word + _MAX_CHARACTER)
+        if first_term_idx < len(self.terms) and self.terms[first_term_idx] == query_word:
+            return first_term_idx, first_term_idx + 1
+        return first_term_idx, first_term_idx
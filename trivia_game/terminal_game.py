@@ -0,0 +1,170 @@
+"""Trivia Game played in the terminal, without the GUI (and without importing PyQt).
+
+The game is played by typing the commands below, with the same game engine and the same games for
+the same seeds as the GUI:
+
+    start <seed>    Start a new game with the seed
+    next            Show the next question (also an empty line)
+    answer          Show the answer of the current question
+    goto <number>   Go to the given question of the game
+    help            Show the commands
+    quit            Quit the game (also the end of the input)
+"""
+import sys
+from typing import TextIO
+
+from trivia_game.game_engine import GameEngine, TriviaQuestion
+
+_COMMANDS_HELP_TEXT = __doc__[__doc__.index("    start"):].rstrip()
+
+
+class TerminalTriviaGame():
+    """Trivia Game, which is the combination of the game engine and a text interface."""
+    def __init__(
+        self,
+        logging_level_str,
+        question_category_column_name,
+        data_info,
+        data_path,
+        cache_mode="off",
+        question_bank_format=None,
+        duplicate_mode="off",
+        rng_backend="python",
+        draw_mode="category",
+        metrics=None,
+        difficulty_curve=None,
+        questions_per_round=10,
+        input_file: TextIO = sys.stdin,
+        output_file: TextIO = sys.stdout,
+    ):
+        # Create a game
+        self.game_engine = GameEngine(
+            logging_level_str=logging_level_str,
+            rng_backend=rng_backend,
+            draw_mode=draw_mode,
+            metrics=metrics,
+            difficulty_curve=difficulty_curve,
+            questions_per_round=questions_per_round,
+        )
+        self.n_total_questions = self.game_engine.set_game_parameters(
+            question_category_column_name=question_category_column_name,
+            data_info=data_info,
+            data_path=data_path,
+            cache_mode=cache_mode,
+            question_bank_format=question_bank_format,
+            duplicate_mode=duplicate_mode,
+        )
+        self.is_game_over: bool = False
+        self.input_file = input_file
+        self.output_file = output_file
+
+        # Init a question number counter
+        self.current_question = TriviaQuestion()
+        self.question_counter = 0
+
+        self.seed = None
+
+    def start_game(self):
+        """Play the trivia game until the quit command or the end of the input."""
+        self._print(f"Trivia game with {self.n_total_questions} questions. Commands:")
+        self._print(_COMMANDS_HELP_TEXT)
+        while True:
+            self.output_file.write("> ")
+            self.output_file.flush()
+            line = self.input_file.readline()
+            if not line:
+                self._print()
+                break
+            command, _, argument = line.strip().partition(" ")
+            command = command.lower()
+            if command in ("quit", "q", "exit"):
+                break
+            self._run_command(command, argument.strip())
+
+    def _run_command(self, command: str, argument: str):
+        """Run a command other than quit."""
+        if command in ("help", "h", "?"):
+            self._print(_COMMANDS_HELP_TEXT)
+        elif command in ("start", "s"):
+            seed = self._parse_int_argument(command, argument)
+            if seed is not None:
+                self._start_game_with_seed(seed)
+        elif command not in ("next", "n", "", "answer", "a", "goto", "g"):
+            self._print(f"Unknown command '{command}', type 'help' to see the commands.")
+        elif self.seed is None:
+            self._print("Start a game first, e.g. 'start 5' plays the game of the seed 5.")
+        elif command in ("next", "n", ""):
+            self._show_next_question()
+        elif command in ("answer", "a"):
+            self._show_answer()
+        else:
+            question_number = self._parse_int_argument(command, argument)
+            if question_number is not None:
+                self._go_to_question(question_number)
+
+    def _show_next_question(self):
+        self.current_question = self._get_next_question()
+        if self.is_game_over:
+            self._print("Game is over, thanks for playing!")
+        else:
+            self._display_question()
+
+    def _show_answer(self):
+        if self.is_game_over:
+            answer_text = "Thanks for playing, the game is over!"
+        else:
+            answer_text = self.current_question.get_answer_text()
+        self._print(f"Answer: {answer_text}")
+
+    def _go_to_question(self, question_number: int):
+        """Goes to the desired question of the game played with the same seed."""
+        self.current_question = self.game_engine.seek(question_number)
+        self.question_counter = min(max(question_number, 0), self.n_total_questions)
+        self.is_game_over = question_number > self.n_total_questions
+        if self.is_game_over:
+            self._print("Game is over, thanks for playing!")
+        else:
+            self._display_question()
+
+    def _get_next_question(self) -> TriviaQuestion:
+        """Get a question from the game engine."""
+        current_question = self.game_engine.get_next_question()
+        if current_question.is_question_valid():
+            self.question_counter += 1
+            self.is_game_over = False
+        else:
+            self.is_game_over = True
+        return current_question
+
+    def _start_game_with_seed(self, seed: int):
+        """Reset state."""
+        self.seed = seed
+        self.question_counter = 0
+        self.is_game_over = False
+        self.current_question = TriviaQuestion()
+        self.game_engine.initialize_game(seed=seed)
+        self._print(f"Seed: {seed}")
+
+    def _display_question(self):
+        """Print the current question with its number, category and options."""
+        self._print(
+            f"[{self._return_question_number_txt()}] "
+            f"{self.current_question.get_question_category_text()}"
+        )
+        self._print(self.current_question.get_question_text())
+        for option_text in self.current_question.get_question_options():
+            self._print(f"  - {option_text}")
+
+    def _parse_int_argument(self, command: str, argument: str):
+        """Return the integer argument of the command, or None after printing the usage."""
+        try:
+            return int(argument)
+        except ValueError:
+            self._print(f"'{command}' needs an integer, e.g. '{command} 5'.")
+            return None
+
+    def _return_question_number_txt(self) -> str:
+        return f"{self.question_counter}/{self.n_total_questions}"
+
+    def _print(self, text: str = ""):
+        self.output_file.write(text + "\n")
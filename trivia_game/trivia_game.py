@@ -1,25 +1,72 @@
+from typing import List, Optional, Tuple
+
 from PyQt6.QtWidgets import QInputDialog
 
+from trivia_game.background_task import BackgroundTask, wait_for_background_tasks
 from trivia_game.game_gui import GameGUI
 from trivia_game.game_engine import GameEngine, TriviaQuestion
+from trivia_game.game_snapshot import GameSnapshotFile
+from trivia_game.question_bank_watcher import QuestionBankWatcher
+from trivia_game.question_search import QuestionSearchResult
+
+# Number of the found questions shown by the question search
+_MAX_SEARCH_RESULTS = 50
 
 
 class TriviaGame():
-    """Trivia Game, which is the combination of the game engine and the GUI."""
+    """Trivia Game, which is the combination of the game engine and the GUI.
+
+    The question bank is loaded, and the questions are gone to, in a background thread, so the
+    window is shown at once and stays responsive. The buttons using the game engine are disabled
+    while a background task uses it.
+
+    A snapshot of the game is saved next to the question bank after every question, and resuming
+    the saved game is offered once the questions are loaded. The game is resumed in a background
+    thread too, since shuffling the questions again takes time for large question banks.
+
+    Once the questions are loaded, the question bank file is watched and reloaded in a background
+    thread whenever it is saved. The game goes on with the changed questions, keeping the asked
+    questions and the current question (see GameEngine.apply_question_changes()).
+
+    The questions are found by their words in a background thread, with the full-text index built
+    with the questions, and the game goes to the chosen one as to a question number.
+    """
     def __init__(
         self,
         logging_level_str,
         question_category_column_name,
         data_info,
         data_path,
+        cache_mode="off",
+        question_bank_format=None,
+        duplicate_mode="off",
+        rng_backend="python",
+        draw_mode="category",
+        metrics=None,
+        difficulty_curve=None,
+        questions_per_round=10,
     ):
         # Create a game
-        self.game_engine = GameEngine(logging_level_str=logging_level_str)
-        self.n_total_questions = self.game_engine.set_game_parameters(
+        self.game_engine = GameEngine(
+            logging_level_str=logging_level_str,
+            rng_backend=rng_backend,
+            draw_mode=draw_mode,
+            metrics=metrics,
+            difficulty_curve=difficulty_curve,
+            questions_per_round=questions_per_round,
+        )
+        self._game_parameters = dict(
             question_category_column_name=question_category_column_name,
             data_info=data_info,
             data_path=data_path,
+            cache_mode=cache_mode,
+            question_bank_format=question_bank_format,
+            duplicate_mode=duplicate_mode,
+            build_search_index=True,
         )
+        # Known once the questions are loaded
+        self.n_total_questions = 0
+        self._snapshot_file = GameSnapshotFile(data_path, logging_level_str)
         self.is_game_over: bool = False
         # Create a GUI
         self.gui = GameGUI()
@@ -32,10 +79,35 @@ class TriviaGame():
         self.question_counter = 0
 
         self.seed = -1
+        self._background_task = None
+        # Reloading the question bank, which runs besides the other background tasks since it
+        # does not change the game until its changes are applied in the GUI thread
+        self._question_bank_watcher = None
+        self._reload_task = None
+        self._is_reload_requested = False
+        self._pending_question_changes = None
 
     def start_game(self):
-        """Start the trivia game."""
+        """Start the trivia game, the start button is enabled once the questions are loaded."""
         self.gui.show()
+        self._background_task = self._run_in_background(
+            lambda progress_callback: self.game_engine.set_game_parameters(
+                progress_callback=progress_callback,
+                **self._game_parameters
+            ),
+            self._on_questions_loaded,
+            self.gui.show_loading_error,
+            self.gui.show_loading_progress,
+        )
+
+    def stop_game(self):
+        """Cancel the background tasks, e.g. loading the questions, and wait for them to stop."""
+        for background_task in (self._background_task, self._reload_task):
+            if background_task is not None:
+                background_task.cancel()
+        self._background_task = None
+        self._reload_task = None
+        wait_for_background_tasks()
 
     def _connect_buttons(self):
         """Assign buttons of GUI to the functionality of the game."""
@@ -43,6 +115,7 @@ class TriviaGame():
         self.gui.next_question_button.clicked.connect(self._show_next_question)
         self.gui.show_answer_button.clicked.connect(self._show_answer)
         self.gui.goto_question_button.clicked.connect(self._go_to_question)
+        self.gui.find_question_button.clicked.connect(self._find_question)
 
     def _click_start_game(self):
         self.seed, ok = QInputDialog.getInt(self.gui, "Enter the game seed", "Game Seed:")
@@ -51,6 +124,7 @@ class TriviaGame():
 
     def _show_next_question(self):
         self.current_question = self._get_next_question()
+        self._save_snapshot()
         if self.is_game_over:
             self.gui.show_question("Game is over, thanks for playing!")
             self.gui.show_question_options([])
@@ -68,21 +142,229 @@ class TriviaGame():
         self.gui.show_answer(answer_text)
 
     def _go_to_question(self):
-        """Goes to the desired question by replaying the game with the same seed"""
+        """Goes to the desired question of the game played with the same seed."""
         question_number, ok = QInputDialog.getInt(
             self.gui,
             "Enter the question to go to", f"Question, max is {self.n_total_questions}:"
         )
         if ok:
-            # Replay the game until that question number with the same seed (Hacky solution)
-            self._start_game_with_seed(self.seed)
-            for i in range(question_number):
-                self.current_question = self._get_next_question()
+            self._seek_in_background(question_number)
+
+    def _find_question(self):
+        """Finds the questions by their words, and goes to the chosen one in the current game.
+
+        The questions are searched in the background, since the search index is built at the first
+        search after the questions change.
+        """
+        query = self.gui.ask_for_search_query()
+        if query is None:
+            return
+        self.gui.set_game_buttons_enabled(False)
+        self._background_task = self._run_in_background(
+            lambda progress_callback: self._search_questions(query),
+            self._on_searched_questions,
+            self._on_search_failed,
+        )
+
+    def _search_questions(
+        self,
+        query: str
+    ) -> Tuple[List[QuestionSearchResult], List[TriviaQuestion]]:
+        """Return the search results of the query, and their questions."""
+        search_results = self.game_engine.search_questions(query, limit=_MAX_SEARCH_RESULTS)
+        found_questions = [
+            self.game_engine.get_question(question_category, row_position)
+            for question_category, row_position in search_results
+        ]
+        return search_results, found_questions
+
+    def _on_searched_questions(
+        self,
+        search_output: Tuple[List[QuestionSearchResult], List[TriviaQuestion]]
+    ):
+        search_results, found_questions = search_output
+        # The search task is kept until a result is chosen, so that the reloaded questions are not
+        # applied, which would renumber the rows of the results
+        result_idx = self.gui.choose_search_result([
+            f"{result_idx + 1}. {question.get_question_category_text()}: "
+            f"{question.get_question_text()}"
+            for result_idx, question in enumerate(found_questions)
+        ])
+        if result_idx is None:
+            self._background_task = None
+            self.gui.set_game_buttons_enabled(True)
+            self._apply_pending_question_changes()
+            return
+        self._background_task = self._run_in_background(
+            lambda progress_callback: self.game_engine.find_question_number(
+                *search_results[result_idx]
+            ),
+            self._on_found_question,
+            self._on_go_to_question_failed,
+        )
+
+    def _on_search_failed(self, error_text: str):
+        self._background_task = None
+        self.gui.set_game_buttons_enabled(True)
+        self.gui.show_question(f"Searching the questions failed: {error_text}")
+        self._apply_pending_question_changes()
+
+    def _on_found_question(self, question_number: Optional[int]):
+        if question_number is None:
+            self._background_task = None
+            self.gui.set_game_buttons_enabled(True)
+            self.gui.show_question("The question is not asked in this game.")
+            self._apply_pending_question_changes()
+            return
+        self._seek_in_background(question_number)
+
+    def _seek_in_background(self, question_number: int):
+        """Go to the question of the game in the background, the game buttons are disabled."""
+        self.gui.set_game_buttons_enabled(False)
+        self._background_task = self._run_in_background(
+            lambda progress_callback: self.game_engine.seek(question_number),
+            lambda question: self._on_gone_to_question(question_number, question),
+            self._on_go_to_question_failed,
+        )
+
+    def _on_questions_loaded(self, n_total_questions: int):
+        self._background_task = None
+        self.n_total_questions = n_total_questions
+        self.gui.update_after_loading(n_total_questions)
+        self._question_bank_watcher = QuestionBankWatcher(
+            self._game_parameters["data_path"],
+            self.gui
+        )
+        self._question_bank_watcher.changed.connect(self._reload_question_bank)
+        self._offer_to_resume_game()
 
+    def _offer_to_resume_game(self):
+        """Resume the saved game of the question bank in the background, if any and if the user
+        wants to. The start button is disabled until the game is resumed.
+        """
+        snapshot = self._snapshot_file.load()
+        if snapshot is None or not self.gui.ask_to_resume_game(
+            snapshot.get("seed"),
+            snapshot.get("question_position")
+        ):
+            return
+        self.gui.start_button.setEnabled(False)
+        self._background_task = self._run_in_background(
+            lambda progress_callback: self.game_engine.restore(snapshot),
+            lambda _: self._on_game_resumed(snapshot),
+            self._on_resume_failed,
+        )
+
+    def _on_game_resumed(self, snapshot: dict):
+        self._background_task = None
+        self.seed = snapshot["seed"]
+        self.question_counter = min(snapshot["question_position"], self.n_total_questions)
+        self.is_game_over = snapshot["is_game_over"]
+        self.current_question = self.game_engine.get_current_question()
+        self.gui.update_after_start_game(seed_num=self.seed)
+        if self.is_game_over:
+            self.gui.show_question("Game is over, thanks for playing!")
+        elif self.current_question.is_question_valid():
+            self.gui.display_next_question(
+                trivia_question=self.current_question,
+                question_number_txt=self._return_question_number_txt()
+            )
+        self._apply_pending_question_changes()
+
+    def _on_resume_failed(self, error_text: str):
+        self._background_task = None
+        self.gui.start_button.setEnabled(True)
+        self.gui.show_question(f"The saved game could not be resumed: {error_text}")
+        self._apply_pending_question_changes()
+
+    def _on_gone_to_question(self, question_number: int, question: TriviaQuestion):
+        self._background_task = None
+        self.current_question = question
+        self.question_counter = min(max(question_number, 0), self.n_total_questions)
+        self.is_game_over = question_number > self.n_total_questions
+        self._save_snapshot()
+        self.gui.set_game_buttons_enabled(True)
+
+        self.gui.display_next_question(
+            trivia_question=self.current_question,
+            question_number_txt=self._return_question_number_txt()
+        )
+        self._apply_pending_question_changes()
+
+    def _on_go_to_question_failed(self, error_text: str):
+        self._background_task = None
+        self.gui.set_game_buttons_enabled(True)
+        self.gui.show_question(f"Going to the question failed: {error_text}")
+        self._apply_pending_question_changes()
+
+    def _reload_question_bank(self):
+        """Find the changes of the question bank in the background, once at a time."""
+        if self._reload_task is not None or self._pending_question_changes is not None:
+            self._is_reload_requested = True
+            return
+        self._reload_task = self._run_in_background(
+            lambda progress_callback: self.game_engine.diff_question_bank(progress_callback),
+            self._on_question_bank_reloaded,
+            self._on_reload_failed,
+        )
+
+    def _on_question_bank_reloaded(self, question_changes_by_category: dict):
+        self._reload_task = None
+        # The changes are applied once going to a question, which uses the game engine, is done
+        self._pending_question_changes = question_changes_by_category
+        if self._background_task is None:
+            self._apply_pending_question_changes()
+
+    def _on_reload_failed(self, error_text: str):
+        self._reload_task = None
+        self.gui.show_reload_error(error_text)
+        self._reload_requested_question_bank()
+
+    def _apply_pending_question_changes(self):
+        """Patch the game with the changes of the reloaded question bank, if any."""
+        if self._pending_question_changes is None:
+            return
+        question_changes_by_category = self._pending_question_changes
+        self._pending_question_changes = None
+        self.n_total_questions = self.game_engine.apply_question_changes(
+            question_changes_by_category
+        )
+        self.gui.show_reloaded_questions(
+            sum(question_changes.num_changes
+                for question_changes in question_changes_by_category.values()),
+            self.n_total_questions
+        )
+        # The current question is shown again, as it may be modified
+        current_question = self.game_engine.get_current_question()
+        if current_question.is_question_valid():
+            self.current_question = current_question
             self.gui.display_next_question(
                 trivia_question=self.current_question,
                 question_number_txt=self._return_question_number_txt()
             )
+        self._reload_requested_question_bank()
+
+    def _reload_requested_question_bank(self):
+        """Reload the question bank again if it is changed while it was being reloaded."""
+        if self._is_reload_requested:
+            self._is_reload_requested = False
+            self._reload_question_bank()
+
+    @staticmethod
+    def _run_in_background(
+        function,
+        on_succeeded,
+        on_failed,
+        on_progress=None
+    ) -> BackgroundTask:
+        """Run the function in a background task, calling the callbacks in the GUI thread."""
+        background_task = BackgroundTask(function)
+        background_task.signals.succeeded.connect(on_succeeded)
+        background_task.signals.failed.connect(on_failed)
+        if on_progress is not None:
+            background_task.signals.progress.connect(on_progress)
+        background_task.start()
+        return background_task
 
     def _get_next_question(self) -> TriviaQuestion:
         """Get a question from the game engine."""
@@ -99,7 +381,24 @@ class TriviaGame():
         self.question_counter = 0
         self.current_question = TriviaQuestion()
         self.game_engine.initialize_game(seed=seed)
+        if self._reload_task is not None or self._pending_question_changes is not None:
+            # The new game drops the removed questions, which renumbers the rows of the changes
+            if self._reload_task is not None:
+                self._reload_task.cancel()
+            self._reload_task = None
+            self._pending_question_changes = None
+            self._reload_question_bank()
+        self._save_snapshot()
         self.gui.update_after_start_game(seed_num=seed)
 
+    def _save_snapshot(self):
+        """Save the snapshot of the game, to resume it if the game is closed unexpectedly."""
+        snapshot = self.game_engine.snapshot()
+        if snapshot["num_structural_patches"] != 0:
+            # The game can not be resumed once questions are added or removed by a reload
+            self._snapshot_file.delete()
+            return
+        self._snapshot_file.save(snapshot)
+
     def _return_question_number_txt(self) -> str:
         return f"{self.question_counter}/{self.n_total_questions}"
@@ -1,5 +1,6 @@
 """Contains the functions that is used to convert the user input to the required data format."""
 import json
+from typing import Optional
 
 
 def parse_game_metadata_from_json(game_metadata_path: str) -> tuple[str, dict]:
@@ -25,6 +26,10 @@ def parse_game_metadata_from_json(game_metadata_path: str) -> tuple[str, dict]:
             This flexibility might be needed for some custom question types,
             such as a Multiple-Choice question type, where one would not only show the question,
             but also the choices, where one of which is the right answer.
+        4) The "difficulty" key is optional, and is the column name in the Excel file storing the
+        difficulty of each question of that 'question category'. The difficulties are numbers
+        (the larger the harder), unless the optional "difficulty levels" key lists them from the
+        easiest to the hardest. The questions without a valid difficulty are skipped.
     """
     with open(game_metadata_path, 'r', encoding='utf-8') as file:
         json_content = file.read()
@@ -55,6 +60,8 @@ def parse_game_metadata_from_json(game_metadata_path: str) -> tuple[str, dict]:
             question_column_name=dict_with_lowercase_keys["question"],
             answer_column_name=dict_with_lowercase_keys["answer"],
             question_extra_text_columns=additional_columns_list,
+            difficulty_column_name=dict_with_lowercase_keys.get("difficulty"),
+            difficulty_levels=dict_with_lowercase_keys.get("difficulty levels"),
         )
     return question_category_column_name, game_metadata
 
@@ -62,14 +69,48 @@ def parse_game_metadata_from_json(game_metadata_path: str) -> tuple[str, dict]:
 def _create_qa_dict(
     question_column_name: str,
     answer_column_name: str,
-    question_extra_text_columns: list[str]
+    question_extra_text_columns: list[str],
+    difficulty_column_name: Optional[str] = None,
+    difficulty_levels: Optional[list[str]] = None
 ) -> dict:
     """Help create metadata for the trivia game dataloader"""
-    return {
+    qa_dict = {
         'Question_column': question_column_name,
         'Answer_column': answer_column_name,
         'Question_option_columns': question_extra_text_columns,
     }
+    if difficulty_column_name is not None:
+        qa_dict['Difficulty_column'] = difficulty_column_name
+        if difficulty_levels is not None:
+            qa_dict['Difficulty_levels'] = [str(level) for level in difficulty_levels]
+    elif difficulty_levels is not None:
+        raise ValueError("'difficulty levels' key is given without the 'difficulty' key!")
+    return qa_dict
+
+
+def parse_difficulty_curve(difficulty_curve_text: str) -> list[list[float]]:
+    """Parse the difficulty curve of the game, e.g. "1,0,0; 1,1,0; 0,1,1; 0,0,1".
+
+    The curve holds the weights of the difficulty levels (from the easiest, separated by commas)
+    for each round (separated by semicolons), and the last round is repeated until the game ends.
+    """
+    difficulty_curve = [
+        [float(weight) for weight in round_text.split(",")]
+        for round_text in difficulty_curve_text.split(";")
+        if round_text.strip()
+    ]
+    if not difficulty_curve:
+        raise ValueError("Difficulty curve must contain at least 1 round!")
+    n_levels = len(difficulty_curve[0])
+    for round_weights in difficulty_curve:
+        if len(round_weights) != n_levels:
+            raise ValueError("Each round of the difficulty curve must have the same weight count!")
+        if any(weight < 0 for weight in round_weights) or sum(round_weights) <= 0:
+            raise ValueError(
+                "The weights of the difficulty curve must be non-negative, "
+                "with a positive sum in each round!"
+            )
+    return difficulty_curve
 
 
 def _convert_dict_keys_to_lowercase(input_dict: dict):